@@ -3,8 +3,9 @@
 # Flask app initialization, blueprint registration
 # ============================================================================
 
-from flask import Flask, render_template, send_from_directory, request
+from flask import Flask, render_template, send_from_directory
 from flask_cors import CORS
+import click
 import logging
 import os
 
@@ -12,7 +13,7 @@ import os
 from config import config
 
 # Import database
-from database.db import init_db
+from database.db import init_db, get_db
 
 # Import blueprints
 from backend.auth import auth_bp
@@ -20,13 +21,20 @@ from backend.api_events import events_bp
 from backend.api_feedback import feedback_bp
 from backend.api_registrations import registration_bp
 from backend.api_attendance import attendance_bp
-from backend.api_ml import ml_bp
+from backend.api_ml import ml_bp, training_jobs
 from backend.api_venues import venues_bp
 from backend.api_users import users_bp
 from backend.api_notifications import notifications_bp
 from backend.api_analytics import analytics_bp
 from backend.api_inventory import inventory_bp
 from backend.api_equipment import equipment_bp
+from backend.status_scheduler import StatusScheduler, start_scheduler, get_scheduler
+from backend.venue_index import venue_index
+from backend.ml_training_data import training_set
+from backend.ml_prediction_cache import prediction_cache
+from backend.response_cache import response_cache
+from backend.event_details import event_details
+from backend.json_provider import FastJSONProvider
 
 
 # ============================================================================
@@ -42,12 +50,17 @@ def create_app(config_name='development'):
     
     # Load configuration
     app.config.from_object(config[config_name])
+
+    # JSON responses: datetimes as ISO 8601, Decimals as floats (orjson when installed)
+    app.json = FastJSONProvider(app)
     
     # Initialize extensions
     CORS(app, origins=app.config['CORS_ORIGINS'], supports_credentials=True)
     
     # Initialize database
-    init_db(app.config['DB_CONFIG'])
+    init_db(app.config['DB_CONFIG']).init_app(app)
+    # Committed writes bump the table versions the response cache checks
+    get_db().add_write_listener(response_cache.on_write)
 
     # Configure logging
     logging.basicConfig(
@@ -160,7 +173,15 @@ def create_app(config_name='development'):
     @app.route('/health')
     def health_check():
         """Health check endpoint"""
-        return {'status': 'healthy', 'message': 'Server is running'}, 200
+        scheduler = get_scheduler()
+        return {
+            'status': 'healthy',
+            'message': 'Server is running',
+            'scheduler': scheduler.stats() if scheduler else None,
+            'venue_index': venue_index.stats(),
+            'response_cache': response_cache.stats(),
+            'event_details': event_details.stats()
+        }, 200
 
     @app.route('/user-guide')
     def user_guide():
@@ -181,62 +202,60 @@ def create_app(config_name='development'):
     
 
     # ========================================================================
-    # SCHEDULED TASKS (Lazy Execution)
+    # SCHEDULED TASKS (Background thread / CLI worker)
     # ========================================================================
     
-    @app.before_request
-    def check_event_completion():
-        """
-        Lazily check for past events and mark them as Completed.
-        Only runs on relevant routes (admin/api) to save performance.
-        """
-        # Only run on API or Admin routes
-        # Only run on API or Admin routes
-        if not request.path or not (request.path.startswith('/api/') or request.path.startswith('/admin')):
-            return
+    # Past events are auto-completed off the request path. Disable with
+    # STATUS_SCHEDULER_ENABLED=0 when running `python -m backend.status_scheduler`
+    # (or `flask complete-events` from cron) as a separate worker instead.
+    if app.config.get('STATUS_SCHEDULER_ENABLED', True):
+        start_scheduler(app.config.get('STATUS_SCHEDULER_INTERVAL', 60))
 
-        try:
-            from database.db import get_db
-            
-            db = get_db()
-            
-            # 1. Check for events and get IDs
-            check_query = """
-                SELECT id, name, status 
-                FROM events 
-                WHERE status IN ('Approved', 'Ongoing') 
-                AND end_datetime < NOW()
-                AND deleted_at IS NULL
-            """
-            
-            events = db.execute_query(check_query)
-            
-            if events:
-                 # 2. Update Status (Auto-commit handled by helper)
-                 update_query = """
-                    UPDATE events 
-                    SET status = 'Completed', updated_at = NOW()
-                    WHERE status IN ('Approved', 'Ongoing') 
-                    AND end_datetime < NOW()
-                    AND deleted_at IS NULL
-                 """
-                 db.execute_update(update_query)
-                 
-                 # 3. Log history (Best effort, okay if slightly desynced from update in rare crash)
-                 for e in events:
-                    db.execute_insert("""
-                        INSERT INTO event_status_history (id, event_id, old_status, new_status, changed_by, reason)
-                        VALUES (DEFAULT, %s, %s, 'Completed', NULL, 'Auto-completed (system)')
-                    """, (e['id'], e['status']))
-                            
-                 app.logger.info(f"Lazily auto-completed {len(events)} events")
-        except Exception as e:
-            # Print error to stdout so it shows in terminal
-            print(f"ERROR in lazy_check: {e}")
-            import traceback
-            traceback.print_exc()
-            import sys
-            sys.stdout.flush()
+    # Venue conflict index: loaded and kept fresh in the background, SQL answers until it is warm
+    venue_index.configure(
+        enabled=app.config.get('VENUE_INDEX_ENABLED', True),
+        sync_interval=app.config.get('VENUE_INDEX_SYNC_INTERVAL', 2),
+        reload_interval=app.config.get('VENUE_INDEX_RELOAD_INTERVAL', 300)
+    )
+    venue_index.warm_async(get_db())
+
+    # ML training set: loaded on first prediction, then refreshed from updated_at watermarks
+    training_set.configure(
+        sync_interval=app.config.get('ML_TRAINING_SYNC_INTERVAL', 5),
+        reload_interval=app.config.get('ML_TRAINING_RELOAD_INTERVAL', 600)
+    )
+
+    # Prediction results: reused until the TTL, a retrain or a training-data change
+    prediction_cache.configure(
+        max_entries=app.config.get('ML_PREDICTION_CACHE_SIZE', 2048),
+        ttl=app.config.get('ML_PREDICTION_CACHE_TTL', 300)
+    )
+
+    # Event listings: reused until a write to one of the tables they read
+    response_cache.configure(max_entries=app.config.get('RESPONSE_CACHE_SIZE', 1024))
+
+    # Model training: stages fitted in a process pool sized by CPUs and free memory
+    training_jobs.configure(
+        max_workers=app.config.get('ML_TRAINING_WORKERS', 0),
+        n_estimators=app.config.get('ML_FOREST_ESTIMATORS', 10),
+        max_depth=app.config.get('ML_FOREST_MAX_DEPTH', 5)
+    )
+
+    @app.cli.command('complete-events')
+    def complete_events_command():
+        """Run one auto-completion pass for past events"""
+        scheduler = StatusScheduler()
+        count = scheduler.run_once()
+        if scheduler.stats()['errors']:
+            raise click.ClickException(f"Auto-completion failed: {scheduler.stats()['last_error']}")
+        print(f"Completed {count or 0} events")
+
+    @app.cli.command('backfill-event-details')
+    @click.option('--all', 'resync', is_flag=True, help='Resync every event, not only unsynced ones')
+    def backfill_event_details_command(resync):
+        """Copy events JSON columns into the side tables for events not synced yet"""
+        count = event_details.backfill(get_db(), resync=resync)
+        print(f"Synced details for {count} events")
 
     return app
 
@@ -245,8 +264,16 @@ def create_app(config_name='development'):
 # RUN APPLICATION
 # ============================================================================
 
-# Create app instance for production (gunicorn)
-app = create_app(os.environ.get('FLASK_ENV') or 'production')
+# The production instance lives in wsgi.py (gunicorn wsgi:app). Importing this
+# module must not build an app: spawned ML training workers re-import __main__,
+# and create_app opens the DB pool and starts the scheduler and venue index.
+def __getattr__(name):
+    # Keeps `gunicorn app:app` working; built on first access only
+    if name == 'app':
+        from wsgi import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == '__main__':
     # Create app with development config for local development
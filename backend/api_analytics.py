@@ -5,7 +5,7 @@
 
 from flask import Blueprint, jsonify, session
 from backend.auth import require_role
-from database.db import get_db
+from database.db import get_db, request_scoped
 from datetime import datetime, timedelta
 import logging
 
@@ -16,6 +16,7 @@ analytics_bp = Blueprint('analytics', __name__, url_prefix='/api/analytics')
 
 @analytics_bp.route('/dashboard', methods=['GET'])
 @require_role(['Super Admin', 'Admin'])
+@request_scoped
 def get_dashboard_analytics():
     """
     Get comprehensive analytics for admin dashboard
@@ -213,7 +214,7 @@ def get_dashboard_analytics():
                 e.id,
                 e.name,
                 e.start_datetime,
-                AVG(ef.overall_rating) as avg_rating,
+                COALESCE(AVG(ef.overall_rating), 0) as avg_rating,
                 COUNT(ef.id) as response_count
             FROM events e
             JOIN event_feedback ef ON e.id = ef.event_id
@@ -224,13 +225,6 @@ def get_dashboard_analytics():
             LIMIT 10
         """.format(dept_condition)
         feedback_events = get_db().execute_query(feedback_events_query, tuple(params) if params else ())
-        
-        # Format per_event ratings
-        for event in feedback_events:
-            if event.get('avg_rating'):
-                event['avg_rating'] = float(event['avg_rating'])
-            else:
-                event['avg_rating'] = 0.0
 
         # 12. DEPARTMENT BUDGET COMPARISON (All departments)
         dept_budget_query = """
@@ -283,11 +277,6 @@ def get_dashboard_analytics():
         """.format(dept_condition)
         low_rated_events = get_db().execute_query(low_rated_query, tuple(params) if params else ())
         
-        # Format low-rated events
-        for event in low_rated_events:
-            if event.get('avg_rating'):
-                event['avg_rating'] = float(event['avg_rating'])
-        
         # 15. ATTENDANCE BY EVENT TYPE
         attendance_by_type_query = """
             SELECT 
@@ -314,10 +303,10 @@ def get_dashboard_analytics():
         feedback_trend_query = """
             SELECT 
                 DATE_FORMAT(e.start_datetime, '%Y-%m') as month,
-                AVG(ef.overall_rating) as avg_overall,
-                AVG(ef.venue_rating) as avg_venue,
-                AVG(ef.activities_rating) as avg_activities,
-                AVG(ef.organization_rating) as avg_organization,
+                ROUND(AVG(ef.overall_rating), 1) as avg_overall,
+                ROUND(AVG(ef.venue_rating), 1) as avg_venue,
+                ROUND(AVG(ef.activities_rating), 1) as avg_activities,
+                ROUND(AVG(ef.organization_rating), 1) as avg_organization,
                 COUNT(ef.id) as response_count
             FROM events e
             JOIN event_feedback ef ON e.id = ef.event_id
@@ -326,12 +315,6 @@ def get_dashboard_analytics():
         """.format(dept_condition)
         feedback_trend = get_db().execute_query(feedback_trend_query, tuple(params) if params else ())
         
-        # Format feedback trend
-        for month_data in feedback_trend:
-            for key in ['avg_overall', 'avg_venue', 'avg_activities', 'avg_organization']:
-                if month_data.get(key):
-                    month_data[key] = round(float(month_data[key]), 1)
-        
 
         return jsonify({
             'success': True,
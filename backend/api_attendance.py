@@ -3,9 +3,11 @@
 # QR code scanning, attendance tracking, and check-in management
 # ============================================================================
 
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, Response, stream_with_context, current_app
 from backend.auth import require_role
+from backend.event_details import event_details
 from database.db import get_db
+import itertools
 import logging
 import qrcode
 import io
@@ -443,6 +445,38 @@ def get_full_attendance_report(event_id):
         return jsonify({'error': 'Failed to generate attendance report'}), 500
 
 
+def _stream_attendee_json(event_info, mode, rows, format_row, chunk_size=200):
+    """
+    Yield the detailed-list JSON document in chunks while rows stream from the DB.
+    Stats are only known at the end, so they are emitted after the attendees array.
+    """
+    dumps = current_app.json.dumps
+    yield '{"success": true, "mode": %s, "event": %s, "attendees": [' % (
+        dumps(mode), dumps(event_info))
+
+    total = 0
+    present = 0
+    buffer = []
+    for row in rows:
+        item = format_row(row)
+        if item['status'] == 'Present':
+            present += 1
+        buffer.append(dumps(item))
+        total += 1
+        if len(buffer) >= chunk_size:
+            yield (',' if total > len(buffer) else '') + ','.join(buffer)
+            buffer = []
+    if buffer:
+        yield (',' if total > len(buffer) else '') + ','.join(buffer)
+
+    stats = {
+        'total': total,
+        'present': present,
+        'absent': total - present if mode == 'attendance' else 0
+    }
+    yield '], "stats": %s}' % dumps(stats)
+
+
 @attendance_bp.route('/event/<int:event_id>/detailed-list', methods=['GET'])
 @require_role(['Super Admin', 'Admin', 'Staff', 'Department Head'])
 def get_detailed_attendance_list(event_id):
@@ -466,25 +500,27 @@ def get_detailed_attendance_list(event_id):
         # Check event status to determine what to show
         is_approved_only = event['status'] == 'Approved'
 
+        event_info = {
+            'name': event['name'],
+            'date': event['start_datetime'].strftime('%Y-%m-%d'),
+            'status': event['status']
+        }
+
         if is_approved_only:
             # For Approved events: Show registrants only (no attendance tracking)
             query = """
                 SELECT 
-                    u.id, u.first_name, u.last_name, u.username, u.email,
-                    s.course, s.section,
-                    r.registration_status
+                    u.id, u.first_name, u.last_name, u.username,
+                    s.course, s.section
                 FROM event_registrations r
                 JOIN users u ON r.user_id = u.id
                 LEFT JOIN students s ON u.id = s.user_id
                 WHERE r.event_id = %s AND r.registration_status = 'Registered'
                 ORDER BY s.section, u.last_name, u.first_name
             """
-            
-            registrants = db.execute_query(query, (event_id,))
 
-            formatted_list = []
-            for p in registrants:
-                formatted_list.append({
+            def format_row(p):
+                return {
                     'id': p['id'],
                     'name': f"{p['first_name']} {p['last_name']}",
                     'username': p['username'],
@@ -493,31 +529,16 @@ def get_detailed_attendance_list(event_id):
                     'status': 'Registered',  # All are registered
                     'check_in_time': None,
                     'check_in_method': None
-                })
+                }
 
-            return jsonify({
-                'success': True,
-                'event': {
-                    'name': event['name'],
-                    'date': event['start_datetime'].strftime('%Y-%m-%d'),
-                    'status': event['status']
-                },
-                'stats': {
-                    'total': len(formatted_list),
-                    'present': 0,  # No attendance tracking yet
-                    'absent': 0
-                },
-                'attendees': formatted_list,
-                'mode': 'registrants'  # Flag for frontend
-            }), 200
+            mode = 'registrants'  # Flag for frontend
 
         else:
             # For Ongoing/Completed: Show attendance tracking
             query = """
                 SELECT 
-                    u.id, u.first_name, u.last_name, u.username, u.email,
+                    u.id, u.first_name, u.last_name, u.username,
                     s.course, s.section,
-                    r.registration_status,
                     a.check_in_datetime, a.check_in_method
                 FROM event_registrations r
                 JOIN users u ON r.user_id = u.id
@@ -526,18 +547,10 @@ def get_detailed_attendance_list(event_id):
                 WHERE r.event_id = %s AND r.registration_status = 'Registered'
                 ORDER BY s.section, u.last_name, u.first_name
             """
-            
-            attendees = db.execute_query(query, (event_id,))
 
-            formatted_list = []
-            checked_in_count = 0
-            
-            for p in attendees:
+            def format_row(p):
                 is_present = p['check_in_datetime'] is not None
-                if is_present:
-                    checked_in_count += 1
-                    
-                formatted_list.append({
+                return {
                     'id': p['id'],
                     'name': f"{p['first_name']} {p['last_name']}",
                     'username': p['username'],
@@ -546,23 +559,21 @@ def get_detailed_attendance_list(event_id):
                     'status': 'Present' if is_present else 'Absent',
                     'check_in_time': p['check_in_datetime'].strftime('%I:%M %p') if p['check_in_datetime'] else None,
                     'check_in_method': p['check_in_method']
-                })
-
-            return jsonify({
-                'success': True,
-                'event': {
-                    'name': event['name'],
-                    'date': event['start_datetime'].strftime('%Y-%m-%d'),
-                    'status': event['status']
-                },
-                'stats': {
-                    'total': len(formatted_list),
-                    'present': checked_in_count,
-                    'absent': len(formatted_list) - checked_in_count
-                },
-                'attendees': formatted_list,
-                'mode': 'attendance'  # Flag for frontend
-            }), 200
+                }
+
+            mode = 'attendance'  # Flag for frontend
+
+        # Streamed so memory stays flat. Pulling the first row runs the query and
+        # fetches its first batch before the 200 goes out, so SQL/connection
+        # errors still become a 500; an empty list releases the connection here
+        rows = db.execute_stream(query, (event_id,))
+        first = next(rows, None)
+        rows = itertools.chain([first], rows) if first is not None else iter(())
+        return Response(
+            stream_with_context(_stream_attendee_json(event_info, mode, rows, format_row)),
+            status=200,
+            mimetype='application/json'
+        )
 
     except Exception as e:
         logger.error(f"Get detailed attendance list error: {e}")
@@ -589,15 +600,15 @@ def get_dashboard_stats():
         if user_role != 'Super Admin':
             # Admins and Department Heads can only see their department's events or shared events
             if user_department:
-                # MySQL JSON operator: department = organizing_department OR JSON_CONTAINS(shared_with_departments, "DEPT")
-                # We assume shared_with_departments is stored as a JSON array ["Dept A", "Dept B"]
-                department_filter = """
+                # Organizing department, or shared with it (event_shared_departments / JSON fallback)
+                shared_sql, shared_params = event_details.shared_with_condition(db, user_department)
+                department_filter = f"""
                     AND (
                         e.organizing_department = %s 
-                        OR JSON_CONTAINS(e.shared_with_departments, JSON_QUOTE(%s))
+                        OR {shared_sql}
                     )
                 """
-                params = [user_department, user_department]
+                params = [user_department, *shared_params]
             else:
                 # If no department assigned, show no events (safety measure)
                 department_filter = "AND 1=0"
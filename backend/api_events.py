@@ -11,10 +11,16 @@ from backend.event_helpers import (
 )
 from backend.property_custodian_connector import connector
 from backend.api_venues import get_venue_conflicts
-from database.db import get_db
+from backend.venue_index import find_overlapping_events, venue_index
+from backend.event_details import event_details
+from backend.response_cache import (
+    response_cache, student_course, version_etag, not_modified, conditional_json
+)
+from database.db import get_db, request_scoped
 from datetime import datetime
 import logging
 import traceback
+import base64
 import json
 
 logger = logging.getLogger(__name__)
@@ -78,73 +84,67 @@ def _auto_reject_soft_conflicts(db, approved_event_id):
         return 0
     
     # Find soft conflicts (pending events at same venue/time)
-    start_str = event['start_datetime'].strftime('%Y-%m-%d %H:%M:%S')
-    end_str = event['end_datetime'].strftime('%Y-%m-%d %H:%M:%S')
+    soft_conflicts = find_overlapping_events(
+        db, event['venue'], event['start_datetime'], event['end_datetime'],
+        ('Pending', 'Under Review'), approved_event_id
+    )
     
-    soft_conflicts = db.execute_query("""
-        SELECT id, name, requestor_id, start_datetime, end_datetime, status
-        FROM events 
-        WHERE venue = %s 
-        AND status IN ('Pending', 'Under Review')
-        AND id != %s
-        AND (
-            (start_datetime < %s AND end_datetime > %s) OR
-            (start_datetime < %s AND end_datetime >= %s) OR
-            (start_datetime >= %s AND start_datetime < %s)
-        )
-        AND deleted_at IS NULL
-    """, (event['venue'], approved_event_id, end_str, start_str, end_str, end_str, start_str, end_str))
+    if not soft_conflicts:
+        return 0
     
-    for conflict in soft_conflicts:
-        # Get current status for history logging
-        current_status = conflict.get('status', 'Under Review')
-        
-        # Update to Conflict_Rejected status AND set venue/equipment approvals to Rejected
-        db.execute_update("""
-            UPDATE events 
-            SET status = 'Conflict_Rejected',
-                venue_approval_status = 'Rejected',
-                equipment_approval_status = 'Rejected',
-                conflict_resolution_note = %s,
-                conflicted_with_event_id = %s,
-                updated_at = NOW()
-            WHERE id = %s
-        """, (
-            f"Another event was approved for {event['venue']} at this time slot.",
-            approved_event_id,
-            conflict['id']
-        ))
-        
-        
-        # Create notification for affected student
-        # Note: Suggested dates removed from notification for simplicity
-        # Users will see comprehensive AI suggestions on the reschedule page
-        db.execute_insert("""
-            INSERT INTO notifications (user_id, type, title, message, event_id, is_read, created_at)
-            VALUES (%s, %s, %s, %s, %s, FALSE, NOW())
-        """, (
-            conflict['requestor_id'],
-            'conflict_rejection',
-            f'⚠️ Action Required: "{conflict["name"]}" Needs Rescheduling',
-            f'Your event could not be approved due to a scheduling conflict.\n\n'
-            f'Another event ("{event["name"]}") was approved for:\n'
-            f'• Venue: {event["venue"]}\n'
-            f'• Time: {event["start_datetime"]}\n\n'
-            f'Please click "Reschedule" to choose a new date.',
-            conflict['id']
-        ))
-        
-        # Log history (use safe session access)
-        db.execute_insert("""
-            INSERT INTO event_status_history (event_id, old_status, new_status, changed_by, reason)
-            VALUES (%s, %s, 'Conflict_Rejected', %s, %s)
-        """, (
+    conflict_ids = [c['id'] for c in soft_conflicts]
+    
+    # Update to Conflict_Rejected status AND set venue/equipment approvals to Rejected
+    # (single statement for all conflicting events)
+    db.execute_update("""
+        UPDATE events 
+        SET status = 'Conflict_Rejected',
+            venue_approval_status = 'Rejected',
+            equipment_approval_status = 'Rejected',
+            conflict_resolution_note = %s,
+            conflicted_with_event_id = %s,
+            updated_at = NOW()
+        WHERE id IN ({})
+    """.format(', '.join(['%s'] * len(conflict_ids))), (
+        f"Another event was approved for {event['venue']} at this time slot.",
+        approved_event_id,
+        *conflict_ids
+    ))
+    
+    # Create notification for affected students
+    # Note: Suggested dates removed from notification for simplicity
+    # Users will see comprehensive AI suggestions on the reschedule page
+    db.execute_many("""
+        INSERT INTO notifications (user_id, type, title, message, event_id, is_read, created_at)
+        VALUES (%s, %s, %s, %s, %s, FALSE, NOW())
+    """, [(
+        conflict['requestor_id'],
+        'conflict_rejection',
+        f'⚠️ Action Required: "{conflict["name"]}" Needs Rescheduling',
+        f'Your event could not be approved due to a scheduling conflict.\n\n'
+        f'Another event ("{event["name"]}") was approved for:\n'
+        f'• Venue: {event["venue"]}\n'
+        f'• Time: {event["start_datetime"]}\n\n'
+        f'Please click "Reschedule" to choose a new date.',
+        conflict['id']
+    ) for conflict in soft_conflicts])
+    
+    # Log history (use safe session access)
+    changed_by = session.get('user_id') if session else None
+    db.execute_insert_many(
+        'event_status_history',
+        ('event_id', 'old_status', 'new_status', 'changed_by', 'reason'),
+        [(
             conflict['id'],
-            current_status,
-            session.get('user_id') if session else None,  # Safe session access
+            conflict.get('status', 'Under Review'),
+            'Conflict_Rejected',
+            changed_by,
             f'Auto-rejected: conflicted with approved event #{approved_event_id}'
-        ))
-        
+        ) for conflict in soft_conflicts]
+    )
+    
+    for conflict in soft_conflicts:
+        venue_index.refresh_event(db, conflict['id'])
         logger.info(f"Event {conflict['id']} auto-rejected due to conflict with {approved_event_id}")
     
     return len(soft_conflicts)
@@ -244,6 +244,7 @@ def _change_event_status(event_id, action, reason=None, action_on_conflict=None)
         "UPDATE events SET status = %s, updated_at = NOW() WHERE id = %s",
         (new_status, event_id)
     )
+    venue_index.refresh_event(db, event_id)
 
     # RELEASE EQUIPMENT if Event is Rejected, Completed or Archived
     # This removes the "Reservation" lock.
@@ -367,48 +368,162 @@ def check_availability():
         }), 500
 
 
+# ============================================================================
+# EVENT LISTING (projection + keyset pagination for GET /api/events)
+# ============================================================================
+
+# Response field -> SELECT expression, in response order
+EVENT_LIST_FIELDS = {
+    'id': 'e.id',
+    'name': 'e.name',
+    'type': 'e.event_type as type',
+    'date': "DATE_FORMAT(e.start_datetime, '%Y-%m-%d') as date",
+    'endDate': 'DATE_FORMAT(e.end_datetime, \'%Y-%m-%d\') as "endDate"',
+    'startTime': 'DATE_FORMAT(e.start_datetime, \'%H:%i\') as "startTime"',
+    'endTime': 'DATE_FORMAT(e.end_datetime, \'%H:%i\') as "endTime"',
+    'attendees': 'e.expected_attendees as attendees',
+    'status': 'e.status',
+    'venue_approval_status': 'e.venue_approval_status',
+    'equipment_approval_status': 'e.equipment_approval_status',
+    'description': 'e.description',
+    'venue': 'e.venue',
+    'budget': 'e.budget',
+    'equipment': 'e.equipment',
+    'activities': 'e.timeline',
+    'budget_breakdown': 'e.budget_breakdown',
+    'additional_resources': 'e.additional_resources',
+    'organizing_department': 'e.organizing_department',
+    'shared_with_departments': 'e.shared_with_departments',
+    'organizer': "COALESCE(NULLIF(e.organizer, ''), CONCAT(u.first_name, ' ', u.last_name)) as organizer",
+    'requestor_username': 'u.username as requestor_username',
+    'requestor_id': 'e.requestor_id',
+}
+
+# Large JSON blobs only the detail view needs
+EVENT_DETAIL_FIELDS = ('equipment', 'activities', 'budget_breakdown', 'additional_resources')
+
+# fields=summary: everything a list/calendar row shows
+EVENT_SUMMARY_FIELDS = [f for f in EVENT_LIST_FIELDS if f not in EVENT_DETAIL_FIELDS]
+
+EVENT_PAGE_DEFAULT = 50   # page size when only a cursor is given
+EVENT_PAGE_MAX = 500
+
+
+def _requested_event_fields(raw):
+    """Response fields for fields=...; 'summary' expands to EVENT_SUMMARY_FIELDS"""
+    if not raw:
+        return list(EVENT_LIST_FIELDS)
+    fields = []
+    for name in (f.strip() for f in raw.split(',')):
+        for field in (EVENT_SUMMARY_FIELDS if name == 'summary' else [name] if name else []):
+            if field not in EVENT_LIST_FIELDS:
+                raise ValueError(f"Unknown field: {field}")
+            if field not in fields:
+                fields.append(field)
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return fields
+
+
+def _encode_event_cursor(start_datetime, event_id):
+    if isinstance(start_datetime, datetime):
+        start_datetime = start_datetime.strftime('%Y-%m-%d %H:%M:%S')
+    raw = json.dumps([str(start_datetime), int(event_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode_event_cursor(cursor):
+    """(start_datetime, id) of the last row of the previous page"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        start_datetime, event_id = json.loads(raw)
+        datetime.strptime(start_datetime, '%Y-%m-%d %H:%M:%S')
+        return start_datetime, int(event_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+def _json_column(value, empty, invalid):
+    """Decoded JSON column: empty for NULL/'', invalid if it doesn't parse"""
+    if value is None or value == '':
+        return empty
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return invalid
+
+
+def _format_event_row(e):
+    """JSON columns decoded, for whichever fields the row has (budget is encoded by the JSON provider)"""
+    if 'equipment' in e:
+        e['equipment'] = _json_column(e['equipment'], [], [])
+    if 'timeline' in e:
+        # Map timeline to activities for frontend
+        e['activities'] = _json_column(e.pop('timeline'), [], [])
+    if 'budget_breakdown' in e:
+        e['budget_breakdown'] = _json_column(e['budget_breakdown'], {}, [])
+    if 'additional_resources' in e:
+        e['additional_resources'] = _json_column(e['additional_resources'], [], [])
+
+    if 'shared_with_departments' in e:
+        # PostgreSQL array type - already returned as list
+        shared_val = e['shared_with_departments']
+        if shared_val is None:
+            e['shared_with_departments'] = []
+        elif not isinstance(shared_val, list):
+            # Fallback: if somehow it's a string, try to parse
+            try:
+                e['shared_with_departments'] = json.loads(shared_val) if shared_val else []
+            except Exception:
+                e['shared_with_departments'] = []
+    return e
+
+
 # ============================================================================
 # EVENT CRUD OPERATIONS
 # ============================================================================
 
 @events_bp.route('', methods=['GET'])
 @require_role(['Super Admin', 'Admin', 'Staff', 'Requestor', 'Participant', 'Student Organization Officer'])
+@request_scoped
 def get_events():
     """
     Get all events (with optional filters)
     GET /api/events?status=Planning&type=Academic&requestor_id=5
+
+    Optional:
+      fields=summary | fields=id,name,date,...   column projection (see EVENT_LIST_FIELDS);
+                                                 heavy JSON columns are only read when listed
+      limit=50&cursor=<next_cursor>              keyset pagination on (start_datetime, id)
     """
-    print("\n=== GET /api/events called ===")
-    print(f"User role: {session.get('role_name')}")
+    logger.debug(f"GET /api/events for role {session.get('role_name')}")
+    try:
+        fields = _requested_event_fields(request.args.get('fields'))
+        limit = request.args.get('limit')
+        cursor = request.args.get('cursor')
+        if limit is not None:
+            if not limit.isdigit() or int(limit) < 1:
+                raise ValueError('limit must be a positive integer')
+            limit = int(limit)
+        if cursor and limit is None:
+            limit = EVENT_PAGE_DEFAULT
+        if limit is not None:
+            limit = min(limit, EVENT_PAGE_MAX)
+        after = _decode_event_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     try:
         db = get_db()
-        print("Database connection obtained")
-        
+
         # Build query with filters - use aliases to match frontend expectations
-        query = """
-            SELECT e.id, 
-                   e.name,
-                   e.event_type as type,
-                   DATE_FORMAT(e.start_datetime, '%Y-%m-%d') as date,
-                   DATE_FORMAT(e.end_datetime, '%Y-%m-%d') as "endDate",
-                   DATE_FORMAT(e.start_datetime, '%H:%i') as "startTime",
-                   DATE_FORMAT(e.end_datetime, '%H:%i') as "endTime",
-                   e.expected_attendees as attendees,
-                   e.status,
-                   e.venue_approval_status,
-                   e.equipment_approval_status,
-                   e.description,
-                   e.venue,
-                   e.budget,
-                   e.equipment,
-                   e.timeline,
-                   e.budget_breakdown,
-                   e.additional_resources,
-                   e.organizing_department,
-                   e.shared_with_departments,
-                   COALESCE(NULLIF(e.organizer, ''), CONCAT(u.first_name, ' ', u.last_name)) as organizer,
-                   u.username as requestor_username,
-                   e.requestor_id
+        columns = [EVENT_LIST_FIELDS[f] for f in fields]
+        if limit is not None:
+            columns.append('e.start_datetime as _cursor_start')
+        query = f"""
+            SELECT {', '.join(columns)}
             FROM events e
             JOIN users u ON e.requestor_id = u.id
             WHERE e.deleted_at IS NULL
@@ -435,13 +550,14 @@ def get_events():
             # If no department assigned, treat as 'Unassigned' to strictly filter (show nothing/little)
             # rather than falling through to 'view all'
             dept_filter = user_department if user_department else 'Unassigned'
+            shared_sql, shared_params = event_details.shared_with_condition(db, dept_filter)
             
-            query += """ AND (
+            query += f""" AND (
                 e.organizing_department = %s 
-                OR JSON_CONTAINS(e.shared_with_departments, JSON_QUOTE(%s))
+                OR {shared_sql}
                 OR e.status IN ('Approved', 'Ongoing', 'Completed')
             )"""
-            params.extend([dept_filter, dept_filter])
+            params.extend([dept_filter, *shared_params])
             logger.info(f"Filtering events for Admin department: {dept_filter} (strict mode)")
 
         elif user_role == 'Requestor':
@@ -454,14 +570,11 @@ def get_events():
             # STRICT DEPARTMENT FILTERING with cross-department sharing support
             # Students/Participants see: (1) Their department's events OR (2) Events shared with their department
             # Get student's course from students table
-            student = db.execute_one(
-                "SELECT course FROM students WHERE user_id = %s",
-                (user_id,)
-            )
-            if student and student.get('course'):
-                student_dept = student['course']
-                query += " AND (e.organizing_department = %s OR JSON_CONTAINS(e.shared_with_departments, JSON_QUOTE(%s)))"
-                params.extend([student_dept, student_dept])
+            student_dept = student_course(db, user_id)
+            if student_dept:
+                shared_sql, shared_params = event_details.shared_with_condition(db, student_dept)
+                query += f" AND (e.organizing_department = %s OR {shared_sql})"
+                params.extend([student_dept, *shared_params])
                 logger.info(f"Filtering events for Participant department: {student_dept} (strict + shared)")
             else:
                 # If student record not found, show only approved events as fallback
@@ -483,110 +596,57 @@ def get_events():
             query += " AND e.requestor_id = %s"
             params.append(request.args.get('requestor_id'))
         
-        # Order by date
-        query += " ORDER BY e.start_datetime DESC"
-        
-        events = db.execute_query(query, tuple(params))
-        
-        # Convert Decimal types to float and parse JSON columns
-        for e in events:
-            try:
-                if e.get('budget') is not None:
-                    e['budget'] = float(e['budget'])
-            except Exception as conversion_err:
-                logger.error(f"Error converting budget for event {e.get('id')}: {conversion_err}")
-                e['budget'] = 0.0
-            
-            # Parse JSON columns
-            try:
-                equipment_val = e.get('equipment')
-                if equipment_val is not None and equipment_val != '':
-                    try:
-                        e['equipment'] = json.loads(equipment_val) if isinstance(equipment_val, str) else equipment_val
-                    except (json.JSONDecodeError, TypeError):
-                        e['equipment'] = []
-                else:
-                    e['equipment'] = []
-            except Exception as ex:
-                logger.error(f"Error parsing equipment for event {e.get('id')}: {ex}")
-                e['equipment'] = []
-            
-            try:
-                timeline_val = e.get('timeline')
-                if timeline_val is not None and timeline_val != '':
-                    try:
-                        timeline_data = json.loads(timeline_val) if isinstance(timeline_val, str) else timeline_val
-                    except (json.JSONDecodeError, TypeError):
-                        timeline_data = []
-                    e['activities'] = timeline_data  # Map timeline to activities for frontend
-                    if 'timeline' in e:
-                        del e['timeline']  # Remove timeline key
-                else:
-                    e['activities'] = []
-            except Exception as ex:
-                logger.error(f"Error parsing timeline for event {e.get('id')}: {ex}")
-                e['activities'] = []
-            
-            try:
-                breakdown_val = e.get('budget_breakdown')
-                if breakdown_val is not None and breakdown_val != '':
-                    try:
-                        e['budget_breakdown'] = json.loads(breakdown_val) if isinstance(breakdown_val, str) else breakdown_val
-                    except (json.JSONDecodeError, TypeError):
-                        e['budget_breakdown'] = []
-                else:
-                    e['budget_breakdown'] = {}
-            except Exception as ex:
-                logger.error(f"Error parsing budget_breakdown for event {e.get('id')}: {ex}")
-                e['budget_breakdown'] = {}
-            
-            try:
-                resources_val = e.get('additional_resources')
-                if resources_val is not None and resources_val != '':
-                    try:
-                        e['additional_resources'] = json.loads(resources_val) if isinstance(resources_val, str) else resources_val
-                    except (json.JSONDecodeError, TypeError):
-                        e['additional_resources'] = []
-                else:
-                    e['additional_resources'] = []
-            except Exception as ex:
-                logger.error(f"Error parsing additional_resources for event {e.get('id')}: {ex}")
-                e['additional_resources'] = []
-                
-            try:
-                # PostgreSQL array type - already returned as list
-                shared_val = e.get('shared_with_departments')
-                if shared_val is None:
-                    e['shared_with_departments'] = []
-                elif not isinstance(shared_val, list):
-                    # Fallback: if somehow it's a string, try to parse
-                    try:
-                        e['shared_with_departments'] = json.loads(shared_val) if shared_val else []
-                    except:
-                        e['shared_with_departments'] = []
-            except Exception as ex:
-                logger.error(f"Error parsing shared_with_departments for event {e.get('id')}: {ex}")
-                e['shared_with_departments'] = []
-        
-        # DEBUG: Log what we're returning for event 12
-        for e in events:
-            if e.get('id') == 12:
-                logger.info(f"DEBUG Event 12 data being returned:")
-                logger.info(f"  equipment: {e.get('equipment')}")
-                logger.info(f"  activities: {e.get('activities')}")
-                logger.info(f"  budget_breakdown: {e.get('budget_breakdown')}")
-        
-        return jsonify({
-            'success': True,
-            'events': events,
-            'count': len(events)
-        }), 200
+        # Keyset: rows strictly after the cursor in (start_datetime DESC, id DESC) order
+        if after is not None:
+            query += " AND (e.start_datetime < %s OR (e.start_datetime = %s AND e.id < %s))"
+            params.extend([after[0], after[0], after[1]])
+
+        # Order by date (id breaks ties so pages never overlap)
+        query += " ORDER BY e.start_datetime DESC, e.id DESC"
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit + 1)
+        
+        # The SQL text and params carry the role/department filter and every
+        # query filter, so they identify the response (cache key and ETag)
+        cache_key = ('events', query, tuple(params))
+        etag = version_etag(db, cache_key, ('events', 'users', 'event_details_synced'))
+        unchanged = not_modified(etag)
+        if unchanged is not None:
+            return unchanged
+
+        def build():
+            events = db.execute_query(query, tuple(params))
+
+            next_cursor = None
+            if limit is not None:
+                if len(events) > limit:
+                    events = events[:limit]
+                    next_cursor = _encode_event_cursor(events[-1]['_cursor_start'], events[-1]['id'])
+                for e in events:
+                    del e['_cursor_start']
+
+            # Parse the requested JSON columns
+            for e in events:
+                _format_event_row(e)
+
+            response = {
+                'success': True,
+                'events': events,
+                'count': len(events)
+            }
+            if limit is not None:
+                response['next_cursor'] = next_cursor
+                response['has_more'] = next_cursor is not None
+            return response
+
+        response = response_cache.get_or_build(db, cache_key, ('events', 'users', 'event_details_synced'), build)
+        return conditional_json(response, etag)
         
     except Exception as e:
-        logger.error(f"Get events error: {e}")
+        logger.error(f"Get events error: {e}", exc_info=True)
         import traceback
         traceback_str = traceback.format_exc()
-        print(traceback_str) # Ensure it prints to stdout/stderr
         return jsonify({
             'error': 'Failed to fetch events', 
             'details': str(e),
@@ -613,18 +673,6 @@ def get_event(event_id):
         if not event:
             return jsonify({'error': 'Event not found'}), 404
             
-        # Convert Decimal types
-        if event.get('budget') is not None:
-            event['budget'] = float(event['budget'])
-        if event.get('spent') is not None:
-            event['spent'] = float(event['spent'])
-        
-        # Ensure dates are ISO strings for consistent frontend parsing
-        if event.get('start_datetime'):
-            event['start_datetime'] = event['start_datetime'].isoformat()
-        if event.get('end_datetime'):
-            event['end_datetime'] = event['end_datetime'].isoformat()
-        
         # Parse JSON columns from events table
         import json
         if event.get('equipment') and isinstance(event['equipment'], str):
@@ -656,14 +704,7 @@ def get_event(event_id):
                  event['end_datetime'], 
                  exclude_event_id=event_id
              )
-             
-             # Format conflict dates to ISO strings to prevent timezone shifting in frontend
-             for conflict in conflicts:
-                 if conflict.get('start_datetime'):
-                     conflict['start_datetime'] = conflict['start_datetime'].isoformat()
-                 if conflict.get('end_datetime'):
-                     conflict['end_datetime'] = conflict['end_datetime'].isoformat()
-                     
+
              event['conflicts'] = conflicts
              event['has_conflicts'] = len(conflicts) > 0
         else:
@@ -817,8 +858,8 @@ def create_event():
             session['user_id']
         ))
         
-        # Note: No need to call save_budget_breakdown, save_event_equipment, save_event_activities
-        # Everything is stored as JSON in the events table
+        # The JSON columns are the source of truth; mirror them into the indexed side tables
+        event_details.sync_event(db, event_id)
         
         # Log status history
         history_query = """
@@ -832,6 +873,8 @@ def create_event():
             f'Event created by {user_role}'
         ))
         
+        venue_index.refresh_event(db, event_id)
+        
         logger.info(f"Event created: ID={event_id}, Name={data['name']}, User={session.get('username', 'Unknown')}")
         
         return jsonify({
@@ -928,6 +971,9 @@ def update_event(event_id):
         
         query = f"UPDATE events SET {', '.join(update_fields)} WHERE id = %s"
         db.execute_update(query, tuple(params))
+        venue_index.refresh_event(db, event_id)
+        if any(field in data for field in ('equipment', 'activities', 'budget_breakdown', 'shared_with_departments')):
+            event_details.sync_event(db, event_id)
         
         # Log status change if status updated
         if 'status' in data and data['status'] != event['status']:
@@ -986,6 +1032,7 @@ def delete_event(event_id):
             "DELETE FROM events WHERE id = %s",
             (event_id,)
         )
+        venue_index.refresh_event(db, event_id)
         
         logger.info(f"Event deleted: ID={event_id}, User={session['username']}")
         
@@ -1221,28 +1268,67 @@ def get_approved_events():
         # Get Current User's Department (if Student)
         student_dept = None
         if session.get('role') == 'Student':
-             user_dept_row = db.execute_one("SELECT course FROM students WHERE user_id = %s", (session.get('user_id'),))
-             if user_dept_row:
-                 student_dept = user_dept_row.get('course')
-
-        query = """
-            SELECT e.id, e.name, e.event_type, e.description, e.status,
-                   e.start_datetime, e.end_datetime,
-                   e.venue, e.expected_attendees, e.max_attendees,
-                   e.organizing_department, e.shared_with_departments,
-                   COALESCE(b.total_budget, 0) as budget,
-                   COALESCE(e.organizer, u.first_name || ' ' || u.last_name) as organizer
-            FROM events e
-            JOIN users u ON e.requestor_id = u.id
-            LEFT JOIN budgets b ON e.id = b.event_id
-            WHERE e.status IN ('Approved', 'Completed', 'Ongoing')
-              AND e.deleted_at IS NULL
-              AND e.start_datetime >= %s
-              AND e.start_datetime < %s
-            ORDER BY e.start_datetime
-        """
-
-        events = db.execute_query(query, (start_date, end_date))
+             student_dept = student_course(db, session.get('user_id'))
+
+        # Body depends on the month, the eligibility filter and this user's registrations
+        etag = version_etag(
+            db, ('approved', start_date, student_dept, session.get('role'), session.get('user_id')),
+            ('events', 'users', 'budgets', 'event_registrations'))
+        unchanged = not_modified(etag)
+        if unchanged is not None:
+            return unchanged
+
+        def build():
+            query = """
+                SELECT e.id, e.name, e.event_type, e.description, e.status,
+                       e.start_datetime, e.end_datetime,
+                       e.venue, e.expected_attendees, e.max_attendees,
+                       e.organizing_department, e.shared_with_departments,
+                       COALESCE(b.total_budget, 0) as budget,
+                       COALESCE(e.organizer, u.first_name || ' ' || u.last_name) as organizer
+                FROM events e
+                JOIN users u ON e.requestor_id = u.id
+                LEFT JOIN budgets b ON e.id = b.event_id
+                WHERE e.status IN ('Approved', 'Completed', 'Ongoing')
+                  AND e.deleted_at IS NULL
+                  AND e.start_datetime >= %s
+                  AND e.start_datetime < %s
+                ORDER BY e.start_datetime
+            """
+
+            events = db.execute_query(query, (start_date, end_date))
+
+            for event in events:
+                # --- Eligibility Check ---
+                event['is_eligible'] = True
+                event['ineligibility_reason'] = None
+
+                if student_dept:
+                    evt_dept = event.get('organizing_department')
+                    shared = event.get('shared_with_departments') or [] # Postgres array or JSON? Usually list if handled by adapter, but safely handle None
+
+                    # Check JSON parsing if it's a string (common issue)
+                    if isinstance(shared, str):
+                        try:
+                            shared = json.loads(shared)
+                        except:
+                            shared = []
+
+                    if not evt_dept: evt_dept = 'General/Cross-Department' # Fallback
+
+                    is_general = evt_dept == 'General/Cross-Department'
+                    is_own = evt_dept == student_dept
+                    is_shared = student_dept in shared
+
+                    if not (is_general or is_own or is_shared):
+                         event['is_eligible'] = False
+                         event['ineligibility_reason'] = f"Restricted to {evt_dept}"
+            return events
+
+        # Shared by every user of the same month and department; registration
+        # status is per user and added below on copies
+        events = response_cache.get_or_build(
+            db, ('approved', start_date, student_dept), ('events', 'users', 'budgets'), build)
 
         # Get User's Registrations for these events
         user_registrations = {}
@@ -1255,43 +1341,6 @@ def get_approved_events():
              for r in regs:
                  user_registrations[r['event_id']] = r['registration_status']
 
-        # Convert Decimal types to float for JSON serialization
-        for event in events:
-            # Format dates to ISO strings (without timezone) to ensure frontend treats as local time
-            if event.get('start_datetime'):
-                event['start_datetime'] = event['start_datetime'].isoformat()
-            if event.get('end_datetime'):
-                event['end_datetime'] = event['end_datetime'].isoformat()
-
-            if event.get('budget') is not None:
-                event['budget'] = float(event['budget'])
-            
-            # --- Eligibility Check ---
-            event['is_eligible'] = True
-            event['ineligibility_reason'] = None
-            
-            if student_dept:
-                evt_dept = event.get('organizing_department')
-                shared = event.get('shared_with_departments') or [] # Postgres array or JSON? Usually list if handled by adapter, but safely handle None
-                
-                # Check JSON parsing if it's a string (common issue)
-                if isinstance(shared, str):
-                    try:
-                        import json
-                        shared = json.loads(shared)
-                    except:
-                        shared = []
-
-                if not evt_dept: evt_dept = 'General/Cross-Department' # Fallback
-                
-                is_general = evt_dept == 'General/Cross-Department'
-                is_own = evt_dept == student_dept
-                is_shared = student_dept in shared
-                
-                if not (is_general or is_own or is_shared):
-                     event['is_eligible'] = False
-                     event['ineligibility_reason'] = f"Restricted to {evt_dept}"
-        
         # --- STRICT FILTERING FOR STUDENTS ---
         # User requested to hide events completely if not eligible
         filtered_events = []
@@ -1303,6 +1352,7 @@ def get_approved_events():
             # --- Registration Status ---
             # Calculate this for the event before appending
             reg_status = user_registrations.get(event['id'])
+            event = dict(event)
             event['is_registered'] = reg_status in ['Registered', 'Waitlisted']
             event['registration_status'] = reg_status
             
@@ -1310,10 +1360,10 @@ def get_approved_events():
         
         events = filtered_events
 
-        return jsonify({
+        return conditional_json({
             'success': True,
             'events': events
-        }), 200
+        }, etag)
 
     except Exception as e:
         logger.error(f"Get approved events error: {e}")
@@ -1932,6 +1982,7 @@ def resolve_rejection(event_id):
                 "UPDATE events SET equipment = %s WHERE id = %s",
                 (json.dumps(updated_list), event_id)
             )
+            event_details.sync_event(db, event_id)
 
             # --- NOTIFICATION LOGIC FOR STAFF ---
             try:
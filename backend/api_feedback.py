@@ -333,12 +333,21 @@ def get_department_feedback():
             ORDER BY f.created_at DESC
         """.format(dept_condition)
 
-        feedback_list = db.execute_query(query, tuple(params))
+        # Stream rows straight into the per-event aggregates
+        feedback_rows = db.execute_stream(query, tuple(params))
 
         # Aggregate results by event
         events_map = {}
         
-        for f in feedback_list:
+        # Collect Rating Stats
+        rating_map = {
+            'overall': 'overall_rating', 'venue': 'venue_rating', 
+            'activities': 'activities_rating', 'organization': 'organization_rating',
+            'registration': 'registration_process', 'speakers': 'speaker_effectiveness',
+            'content': 'content_relevance'
+        }
+
+        for f in feedback_rows:
             eid = f['event_id']
             if eid not in events_map:
                 events_map[eid] = {
@@ -362,14 +371,6 @@ def get_department_feedback():
             event = events_map[eid]
             event['response_count'] += 1
             
-            # Collect Rating Stats
-            rating_map = {
-                'overall': 'overall_rating', 'venue': 'venue_rating', 
-                'activities': 'activities_rating', 'organization': 'organization_rating',
-                'registration': 'registration_process', 'speakers': 'speaker_effectiveness',
-                'content': 'content_relevance'
-            }
-            
             for key, db_col in rating_map.items():
                 val = f.get(db_col)
                 if val is not None:
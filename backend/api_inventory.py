@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request, session
 from backend.auth import require_role
 from backend.property_custodian_connector import connector
+from backend.event_details import event_details
 from database.db import get_db
 import logging
 import json
@@ -269,6 +270,7 @@ def reserve_items():
                                  "UPDATE events SET equipment = %s, equipment_approval_status = 'Approved' WHERE id = %s",
                                  (json.dumps(eq_list), event_id)
                              )
+                             event_details.sync_event(db, event_id)
                      except Exception as e:
                          logger.error(f"Failed to update event JSON: {e}")
 
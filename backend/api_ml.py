@@ -4,7 +4,7 @@ Matches the updated 'ai_training_data' table structure
 Full Implementation + Dynamic Resource Fetching
 REMOVED CATERING
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, session
 import os
 import joblib
 import pandas as pd
@@ -19,6 +19,12 @@ from sklearn.pipeline import make_pipeline
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import r2_score, accuracy_score, mean_absolute_error
 from database.db import get_db
+from backend.ml_registry import ModelRegistry
+from backend.ml_training import TrainingJobRunner, MIN_TRAINING_SAMPLES
+from backend.ml_training_data import training_set
+from backend.ml_usage_stats import build_usage_stats, select_items, label_id
+from backend.ml_similarity import SimilarityIndex
+from backend.ml_prediction_cache import prediction_cache
 import json
 from datetime import datetime
 
@@ -27,13 +33,30 @@ ml_bp = Blueprint('ml', __name__, url_prefix='/api/ml')
 MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models')
 os.makedirs(MODEL_DIR, exist_ok=True)
 
-# Define paths for models
-EVENT_VECTORIZER_PATH = os.path.join(MODEL_DIR, 'event_vectorizer.pkl')
-EVENT_CLASSIFIER_PATH = os.path.join(MODEL_DIR, 'event_classifier.pkl')
-BUDGET_MODEL_PATH = os.path.join(MODEL_DIR, 'budget_predictor.pkl')
-EQUIPMENT_MODEL_PATH = os.path.join(MODEL_DIR, 'equipment_predictor.pkl')
-BREAKDOWN_PROFILE_PATH = os.path.join(MODEL_DIR, 'budget_profiles.pkl')
-METADATA_PATH = os.path.join(MODEL_DIR, 'model_metadata.pkl')
+# Trained artifacts live in models/versions/<version>/ (see backend/ml_registry.py)
+
+# Similar-event matching thresholds (char n-gram cosine, 0..1)
+BUDGET_MATCH_THRESHOLD = 0.5   # reuse a past event's budget-per-attendee ratio
+STRONG_MATCH_THRESHOLD = 0.6   # breakdown/timeline from the single best match
+WEAK_MATCH_THRESHOLD = 0.3     # otherwise from each of the top 3 above this
+SIMILAR_TOP_K = 5
+
+# Upper bound on items per /batch request
+MAX_BATCH_SIZE = 500
+
+# Trained artifacts, loaded once per process and hot-swapped after retraining
+model_registry = ModelRegistry(MODEL_DIR)
+
+# Background training; training reads a fully reloaded training set so it
+# also sees rows hard-deleted by other workers
+training_jobs = TrainingJobRunner(
+    MODEL_DIR,
+    load_data=lambda: load_training_data(full=True),
+    on_activate=lambda: model_registry.reload()
+)
+
+# name -> (training DataFrame, artifact) built on the fly before the first training run
+_fallback_artifacts = {}
 
 def convert_to_24hour(time_str):
     """Convert 12-hour AM/PM time to 24-hour format for HTML time input"""
@@ -73,114 +96,35 @@ def convert_to_24hour(time_str):
     except:
         return '09:00'
 
-def load_training_data():
-    """Load and preprocess training data from ai_training_data table AND completed events"""
-    db = get_db()
-
+def load_training_data(full=False):
+    """
+    Training data from ai_training_data AND completed events.
+    Served from the in-memory training set cache (read-only DataFrame).
+    """
     try:
-        # Get ALL dedicated training data (removed limit - models should learn from ALL examples)
-        training_data = db.execute_query("""
-            SELECT event_name, event_type, attendees, total_budget,
-                   equipment, activities, additional_resources,
-                   budget_breakdown, venue, organizer, description
-            FROM ai_training_data
-            WHERE is_validated = TRUE AND total_budget > 0
-            ORDER BY created_at DESC
-        """)
-
-        # ALSO get ALL completed real events to learn from actual usage
-        completed_events = db.execute_query("""
-            SELECT 
-                e.name as event_name,
-                e.event_type,
-                e.expected_attendees as attendees,
-                COALESCE(b.total_budget, 0) as total_budget,
-                e.venue,
-                e.organizer,
-                e.description,
-                '' as equipment,
-                '' as activities,
-                '' as additional_resources,
-                '' as budget_breakdown
-            FROM events e
-            LEFT JOIN budgets b ON e.id = b.event_id
-            WHERE e.status = 'Completed' 
-              AND e.deleted_at IS NULL
-              AND b.total_budget > 0
-            ORDER BY e.created_at DESC
-        """)
-        
-        # Combine database training + completed events
-        all_data = training_data + completed_events
-        
-        # Ensure data is converted to dicts (handling sqlite3.Row objects)
-        all_data = [dict(row) for row in all_data]
-        
+        return training_set.get(get_db(), full=full)
     except Exception as e:
         print(f"Error loading training data: {e}")
         return pd.DataFrame()
-    
-    if not all_data:
-        return pd.DataFrame()
 
-    df = pd.DataFrame(all_data)
-
-    # Extract features
-    df['event_type_encoded'] = pd.Categorical(df['event_type']).codes
-    
-    # Scale attendees
-    scaler = StandardScaler()
-    df['attendees_scaled'] = scaler.fit_transform(df[['attendees']])
-
-    # Helper for safe JSON parsing
-    def safe_parse_json_list(x):
-        try:
-            if not x: return []
-            # Check if likely already parsed (e.g. Postgres + psycopg3 automatic adaptation)
-            if isinstance(x, (list, dict)):
-                items = x
-            else:
-                items = json.loads(x)
-                
-            if not isinstance(items, list): return []
-            # Handle both string items and dict items (with 'name' key)
-            return [item['name'] if isinstance(item, dict) and 'name' in item else item 
-                   for item in items if item]
-        except (json.JSONDecodeError, TypeError, ValueError):
-            return []
-
-    # Parse JSON arrays - extract names from equipment/resources objects
-    df['equipment_list'] = df['equipment'].apply(safe_parse_json_list)
-    
-    # NEW: Keep full objects to track quantities
-    # NEW: Keep full objects to track quantities
-    def parse_full_objects(x):
-        try:
-            if not x: return []
-            data = x if isinstance(x, (list, dict)) else json.loads(x)
-            return [item if isinstance(item, dict) and 'name' in item else {'name': item, 'quantity': 1}
-                    for item in (data if isinstance(data, list) else [])]
-        except:
-            return []
-
-    df['equipment_objects'] = df['equipment'].apply(parse_full_objects)
-    
-    if 'additional_resources' in df.columns:
-        df['additional_resources_list'] = df['additional_resources'].apply(safe_parse_json_list)
-    else:
-        df['additional_resources_list'] = [[] for _ in range(len(df))]
-    
-    def parse_generic_json(x):
-        try:
-            if not x: return []
-            return x if isinstance(x, (list, dict)) else json.loads(x)
-        except:
-            return []
-
-    df['activities_list'] = df['activities'].apply(parse_generic_json)
-    df['budget_breakdown_list'] = df['budget_breakdown'].apply(parse_generic_json)
-
-    return df
+def _trained_artifact(name, df, build):
+    """Artifact from the last training run, or built from df (once per DataFrame) if not trained yet"""
+    artifact = model_registry.get(name)
+    if artifact is not None:
+        return artifact
+    cached_df, artifact = _fallback_artifacts.get(name, (None, None))
+    if cached_df is not df:
+        artifact = build(df)
+        _fallback_artifacts[name] = (df, artifact)
+    return artifact
+
+def get_usage_stats(df):
+    """Equipment/resource frequency tables"""
+    return _trained_artifact('usage_stats', df, build_usage_stats)
+
+def get_similarity_index(df):
+    """Similar-event index over training event names"""
+    return _trained_artifact('similarity_index', df, SimilarityIndex.build)
 
 @ml_bp.route('/add-training-data', methods=['POST'])
 def add_training_data():
@@ -217,6 +161,7 @@ def add_training_data():
             activities_json,
             json.dumps(data.get('additionalResources', []))
         ))
+        training_set.invalidate()
         
         return jsonify({'success': True, 'message': 'Training data added successfully'})
 
@@ -266,6 +211,7 @@ def update_training_data(id):
             resources_json,
             id
         ))
+        training_set.invalidate(id)
         
         return jsonify({'success': True, 'message': 'Training data updated successfully'})
 
@@ -279,6 +225,7 @@ def delete_training_data(id):
         db = get_db()
         # Delete the record
         db.execute_update("DELETE FROM ai_training_data WHERE id = %s", (id,))
+        training_set.invalidate(id, deleted=True)
         return jsonify({'success': True, 'message': 'Training data deleted successfully'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -422,149 +369,71 @@ def get_equipment_options():
 @ml_bp.route('/train-models', methods=['POST'])
 def train_models():
     """
-    Retrains ALL AI models (Budget, Equipment, Classifier) using MySQL data.
+    Starts a background job that retrains ALL AI models (Budget, Equipment, Classifier).
+    Returns the job id immediately; poll /training-jobs/<job_id> for progress.
     """
     try:
-        df = load_training_data()
-        
-        if len(df) < 5:
-            return jsonify({'success': False, 'message': 'Not enough data to train (need at least 5 samples)'})
-
-        # --- 1. Train Budget Model (Linear Regression) ---
-        X_budget = df[['event_type_encoded', 'attendees']]
-        y_budget = df['total_budget']
-        
-        budget_model = LinearRegression()
-        budget_model.fit(X_budget, y_budget)
-        joblib.dump(budget_model, BUDGET_MODEL_PATH)
-        budget_score = budget_model.score(X_budget, y_budget)
-
-        # --- 2. Train Equipment Model (Random Forest) ---
-        mlb = MultiLabelBinarizer()
-        y_equipment = mlb.fit_transform(df['equipment_list'])
-        
-        # LIGHTWEIGHT MODE: 10 Trees, Depth 5 (Prevent OOM)
-        equipment_model = MultiOutputClassifier(RandomForestClassifier(n_estimators=10, max_depth=5, random_state=42))
-        equipment_model.fit(X_budget, y_equipment)
-        joblib.dump((equipment_model, mlb), EQUIPMENT_MODEL_PATH)
-        equipment_accuracy = equipment_model.score(X_budget, y_equipment)
-
-        # --- 3. Train Additional Resources Model (Random Forest) ---
-        mlb_resources = MultiLabelBinarizer()
-        y_resources = mlb_resources.fit_transform(df['additional_resources_list'])
-        
-        # LIGHTWEIGHT MODE: 10 Trees, Depth 5
-        resources_model = MultiOutputClassifier(RandomForestClassifier(n_estimators=10, max_depth=5, random_state=42))
-        resources_model.fit(X_budget, y_resources)
-        
-        RESOURCES_MODEL_PATH = os.path.join(MODEL_DIR, 'resources_predictor.pkl')
-        joblib.dump((resources_model, mlb_resources), RESOURCES_MODEL_PATH)
-        resources_accuracy = resources_model.score(X_budget, y_resources)
-
-        # --- 4. Train Event Classifier (TF-IDF + Logistic Regression) ---
-        if 'event_name' in df.columns:
-            # LIGHTWEIGHT MODE: Max 300 features
-            vectorizer = TfidfVectorizer(max_features=300, stop_words='english', ngram_range=(1, 1))
-            # Use LogisticRegression which often works better for small text datasets
-            classifier = LogisticRegression(random_state=42, class_weight='balanced', max_iter=200)
-            
-            X_text = vectorizer.fit_transform(df['event_name'])
-            y_type = df['event_type']
-            
-            classifier.fit(X_text, y_type)
-            
-            joblib.dump(vectorizer, EVENT_VECTORIZER_PATH)
-            joblib.dump(classifier, EVENT_CLASSIFIER_PATH)
-
-        # --- 4. Learn Budget Breakdown Profiles ---
-        budget_profiles = {}
-        for event_type in df['event_type'].unique():
-            type_df = df[df['event_type'] == event_type]
-            profile = {}
-            total_events = len(type_df)
-            
-            for breakdown_list in type_df['budget_breakdown_list']:
-                # Filter out valid dict items only
-                valid_items = [item for item in breakdown_list if isinstance(item, dict)]
-                event_total = sum(item.get('amount', 0) for item in valid_items)
-                
-                if event_total > 0:
-                    for item in valid_items:
-                        name = item.get('name', 'Misc')
-                        amount = item.get('amount', 0)
-                        name_key = name.strip().title() 
-                        if name_key not in profile: profile[name_key] = 0
-                        profile[name_key] += (amount / event_total) / total_events
-            
-            budget_profiles[event_type] = {k: round(v, 2) for k, v in profile.items() if v > 0.05}
-            
-        joblib.dump(budget_profiles, BREAKDOWN_PROFILE_PATH)
-
-        # --- 5. Learn Timeline Profiles ---
-        timeline_profiles = {}
-        for event_type in df['event_type'].unique():
-            type_df = df[df['event_type'] == event_type]
-            timelines = []
-            
-            for activities in type_df['activities_list']:
-                timeline = None
-                if isinstance(activities, dict):  # Multi-day format {day1: [...], day2: [...]}
-                    # Extract day1 as the primary timeline pattern
-                    if 'day1' in activities and isinstance(activities['day1'], list) and activities['day1']:
-                        timeline = activities['day1']
-                elif isinstance(activities, list) and activities:  # Single-day format [...]
-                    timeline = activities
-                
-                # Validate and clean timeline data
-                if timeline:
-                    valid_timeline = []
-                    for activity in timeline:
-                        if isinstance(activity, dict) and 'phase' in activity:
-                            # Ensure all required fields exist
-                            cleaned = {
-                                'phase': activity.get('phase', 'Activity'),
-                                'startTime': activity.get('startTime', activity.get('start_time', '09:00 AM')),
-                                'endTime': activity.get('endTime', activity.get('end_time', '10:00 AM'))
-                            }
-                            valid_timeline.append(cleaned)
-                    
-                    if valid_timeline:
-                        timelines.append(valid_timeline)
-            
-            if timelines:
-                # Store all timeline examples for this event type
-                timeline_profiles[event_type] = timelines
-        
-        TIMELINE_PROFILE_PATH = os.path.join(MODEL_DIR, 'timeline_profiles.pkl')
-        joblib.dump(timeline_profiles, TIMELINE_PROFILE_PATH)
-
-        # Convert any NaN values to 0 for JSON compatibility
-        def safe_float(val):
-            return 0.0 if (isinstance(val, float) and np.isnan(val)) else float(val)
-        
-        metadata = {
-            'trained_at': datetime.now().isoformat(),
-            'samples': len(df),
-            'budget_score': safe_float(budget_score),
-            'equipment_accuracy': safe_float(equipment_accuracy),
-            'equipment_labels': list(mlb.classes_),
-            'resources_accuracy': safe_float(resources_accuracy),
-            'resources_labels': list(mlb_resources.classes_)
-        }
-        joblib.dump(metadata, METADATA_PATH)
+        if len(load_training_data()) < MIN_TRAINING_SAMPLES:
+            return jsonify({'success': False, 'message': f'Not enough data to train (need at least {MIN_TRAINING_SAMPLES} samples)'})
 
+        job = training_jobs.submit(requested_by=session.get('user_id'))
         return jsonify({
-            'success': True, 
-            'message': f'Models trained on {len(df)} samples',
-            'metrics': {
-                'budget_r2': round(safe_float(budget_score), 4),
-                'equipment_acc': round(safe_float(equipment_accuracy), 4)
-            }
-        })
+            'success': True,
+            'message': 'Training started',
+            'job_id': job['id'],
+            'job': job,
+            'status_url': f"/api/ml/training-jobs/{job['id']}"
+        }), 202
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@ml_bp.route('/training-jobs/<job_id>', methods=['GET'])
+def get_training_job(job_id):
+    """Status, progress and per-stage timings of one training job"""
+    job = training_jobs.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Training job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+@ml_bp.route('/training-jobs', methods=['GET'])
+def list_training_jobs():
+    """Recent training jobs, newest first (?limit=1..100, default 20)"""
+    limit = request.args.get('limit', '20')
+    if not limit.isdigit() or int(limit) < 1:
+        return jsonify({'success': False, 'error': 'limit must be a positive integer'}), 400
+    limit = min(int(limit), 100)
+    return jsonify({'success': True, 'jobs': training_jobs.recent(limit)})
+
+def classify_names(names):
+    """
+    Event type probabilities for many names with one vectorizer/classifier pass.
+    Returns one entry per name: None if the models aren't trained, otherwise
+    {'known': bool, 'probs': array, 'classes': array} where known is False when
+    the name shares no vocabulary with the training data.
+    """
+    models = model_registry.snapshot()
+    if 'classifier' not in models or 'vectorizer' not in models:
+        return [None] * len(names)
+    classifier = models['classifier']
+    text_vecs = models['vectorizer'].transform(names)
+    probs = classifier.predict_proba(text_vecs)
+    known = text_vecs.getnnz(axis=1) > 0
+    return [
+        {'known': bool(known[i]), 'probs': probs[i], 'classes': classifier.classes_}
+        for i in range(len(names))
+    ]
+
+def _batch_items(key):
+    """List payload of a batch endpoint, or raise ValueError"""
+    data = request.get_json(silent=True) or {}
+    items = data.get(key)
+    if not isinstance(items, list) or not items:
+        raise ValueError(f"'{key}' must be a non-empty list")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} items per batch")
+    return items
+
 @ml_bp.route('/predict-resources', methods=['POST'])
 def predict_resources():
     """
@@ -577,405 +446,401 @@ def predict_resources():
         print(f"TRUE ML PREDICTION (Learning from ALL events)")
         print(f"{'='*60}")
         print(f"Request: {data}")
-        
-        event_type = data.get('eventType', 'Academic')
-        attendees = int(data.get('attendees', 100))
-        duration = float(data.get('duration', 4))
-        event_name = data.get('eventName', '')
-
-        predictions = {
-            'eventType': event_type,
-            'estimatedBudget': 0,
-            'resources': [],
-            'timeline': [],
-            'budgetBreakdown': {},
-            'confidence': 0.85
-        }
-
-        type_mapping = {'Academic': 0, 'Sports': 1, 'Cultural': 2, 'Workshop': 3, 'Seminar': 4}
-        event_type_encoded = type_mapping.get(event_type, 0)
 
         # Load ALL training data for analysis
         df = load_training_data()
-        
-        if df.empty:
-            print("[ML] No training data available, using fallback predictions")
-            return generate_fallback_predictions(event_type, attendees, duration)
+        payload = _prediction_payload(data)
+        key = _prediction_key(payload)
+        generation = _prediction_generation()
+        result = prediction_cache.get(key, generation)
+        if result is not None:
+            print(f"[ML CACHE] Hit for {key[1:]}")
+            return jsonify(result)
+
+        event_name = payload['eventName']
+        classification = classify_names([event_name])[0] if event_name else None
+        result = build_resource_prediction(payload, df, classification)
+        prediction_cache.put(key, generation, result)
+        return jsonify(result)
 
-        print(f"[ML] Loaded {len(df)} training samples for ML prediction")
-        
-        # ========================================================================
-        # STEP 0: EVENT TYPE CLASSIFICATION CONFIDENCE
-        # ========================================================================
-        try:
-            if event_name and os.path.exists(EVENT_CLASSIFIER_PATH) and os.path.exists(EVENT_VECTORIZER_PATH):
-                classifier = joblib.load(EVENT_CLASSIFIER_PATH)
-                vectorizer = joblib.load(EVENT_VECTORIZER_PATH)
-                text_vec = vectorizer.transform([event_name])
+    except Exception as e:
+        import traceback
+        print(f"[ML ERROR] {e}")
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
+@ml_bp.route('/predict-resources/batch', methods=['POST'])
+def predict_resources_batch():
+    """
+    Predictions for many events: {"events": [<predict-resources payload>, ...]}.
+    Event names are classified in one stacked pass; results keep input order
+    and a failing item only fails its own entry.
+    """
+    try:
+        events = _batch_items('events')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        df = load_training_data()
+        generation = _prediction_generation()
+        results = [None] * len(events)
+        pending = {}  # cache key -> (payload, [positions]); duplicates computed once
+        for i, event in enumerate(events):
+            try:
+                if not isinstance(event, dict):
+                    raise ValueError('Each event must be an object')
+                payload = _prediction_payload(event)
+            except (TypeError, ValueError) as e:
+                results[i] = {'success': False, 'error': str(e)}
+                continue
+            key = _prediction_key(payload)
+            if key in pending:
+                pending[key][1].append(i)
+                continue
+            results[i] = prediction_cache.get(key, generation)
+            if results[i] is None:
+                pending[key] = (payload, [i])
+
+        keys = list(pending)
+        classifications = [None] * len(keys)
+        named = [n for n, key in enumerate(keys) if pending[key][0]['eventName']]
+        if named:
+            try:
+                names = [pending[keys[n]][0]['eventName'] for n in named]
+                for n, result in zip(named, classify_names(names)):
+                    classifications[n] = result
+            except Exception as e:
+                print(f"[TYPE ML] Batch classification failed: {e}")
+
+        for key, classification in zip(keys, classifications):
+            payload, positions = pending[key]
+            try:
+                result = build_resource_prediction(payload, df, classification)
+                prediction_cache.put(key, generation, result)
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+            for i in positions:
+                results[i] = result
+
+        return jsonify({'success': True, 'count': len(results), 'results': results})
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+def _prediction_payload(data):
+    """
+    Canonical predict-resources input: numbers parsed, name whitespace collapsed.
+    Raises ValueError/TypeError on malformed fields.
+    """
+    event_type = data.get('eventType') or 'Academic'
+    if not isinstance(event_type, str):
+        raise ValueError('eventType must be a string')
+    return {
+        'eventType': event_type,
+        'attendees': int(data.get('attendees', 100)),
+        'duration': float(data.get('duration', 4)),
+        'eventName': ' '.join(str(data.get('eventName') or '').split()),
+    }
+
+def _prediction_key(payload):
+    # Name matching (classifier, similarity index) is case-insensitive
+    return ('predict-resources', payload['eventType'], payload['attendees'],
+            payload['duration'], payload['eventName'].lower())
+
+def _prediction_generation():
+    """Cached predictions are valid only for these models and this training set"""
+    return (model_registry.version, training_set.version)
+
+def build_resource_prediction(data, df, classification=None):
+    """
+    Full resource/budget/timeline prediction for one event payload.
+    classification is this event's classify_names() entry (or None).
+    """
+    event_type = data.get('eventType', 'Academic')
+    attendees = int(data.get('attendees', 100))
+    duration = float(data.get('duration', 4))
+    event_name = data.get('eventName', '')
+
+    predictions = {
+        'eventType': event_type,
+        'estimatedBudget': 0,
+        'resources': [],
+        'timeline': [],
+        'budgetBreakdown': {},
+        'confidence': 0.85
+    }
+
+    type_mapping = {'Academic': 0, 'Sports': 1, 'Cultural': 2, 'Workshop': 3, 'Seminar': 4}
+    event_type_encoded = type_mapping.get(event_type, 0)
+
+    if df.empty:
+        print("[ML] No training data available, using fallback predictions")
+        return generate_fallback_predictions(event_type, attendees, duration)
+
+    print(f"[ML] Loaded {len(df)} training samples for ML prediction")
+    
+    # ========================================================================
+    # STEP 0: EVENT TYPE CLASSIFICATION CONFIDENCE
+    # ========================================================================
+    try:
+        if event_name and classification is not None:
+            # CHECK FOR UNKNOWN WORDS (Zero Vector)
+            # If the input text has no overlap with training vocabulary,
+            # the vector will be all zeros, meaning the model is just guessing.
+            if not classification['known']:
+                print(f"[TYPE ML] No vocabulary overlap for '{event_name}' - Unknown Event")
+                predictions['confidence'] = 10.0
+                predictions['eventType'] = 'Unknown' # Optional: could leave as guessed but low confidence
+            else:
+                probs = classification['probs']
+                type_confidence = round(max(probs) * 100, 1)  # Round to 1 decimal place
+                predictions['confidence'] = type_confidence
                 
-                # CHECK FOR UNKNOWN WORDS (Zero Vector)
-                # If the input text has no overlap with training vocabulary,
-                # the vector will be all zeros, meaning the model is just guessing.
-                if text_vec.nnz == 0:
-                    print(f"[TYPE ML] No vocabulary overlap for '{event_name}' - Unknown Event")
-                    predictions['confidence'] = 10.0
-                    predictions['eventType'] = 'Unknown' # Optional: could leave as guessed but low confidence
-                else:
-                    probs = classifier.predict_proba(text_vec)[0]
-                    type_confidence = round(max(probs) * 100, 1)  # Round to 1 decimal place
-                    predictions['confidence'] = type_confidence
-                    
-                    # FIX: Actually USE the predicted event type if confidence is good
-                    predicted_class_index = probs.argmax()
-                    predicted_type = classifier.classes_[predicted_class_index]
-                    
-                    if type_confidence > 40.0:  # Threshold to override user input/default
-                        print(f"[TYPE ML] 🚀 overriding event type to: {predicted_type}")
-                        predictions['eventType'] = predicted_type
-                        event_type = predicted_type  # Update local var for subsequent lookups
-                        type_mapping = {'Academic': 0, 'Sports': 1, 'Cultural': 2, 'Workshop': 3, 'Seminar': 4}
-                        event_type_encoded = type_mapping.get(event_type, 0)
+                # FIX: Actually USE the predicted event type if confidence is good
+                predicted_class_index = probs.argmax()
+                predicted_type = classification['classes'][predicted_class_index]
+                
+                if type_confidence > 40.0:  # Threshold to override user input/default
+                    print(f"[TYPE ML] 🚀 overriding event type to: {predicted_type}")
+                    predictions['eventType'] = predicted_type
+                    event_type = predicted_type  # Update local var for subsequent lookups
+                    type_mapping = {'Academic': 0, 'Sports': 1, 'Cultural': 2, 'Workshop': 3, 'Seminar': 4}
+                    event_type_encoded = type_mapping.get(event_type, 0)
+    except Exception as e:
+        print(f"[TYPE ML] Could not get type confidence: {e}")
+
+    # Similar past events (same type) by name, shared by budget scaling and breakdown
+    similar_matches = []
+    similarity_index = None
+    if event_name:
+        try:
+            similarity_index = get_similarity_index(df)
+            similar_matches = similarity_index.search(event_name, event_type, k=SIMILAR_TOP_K)
         except Exception as e:
-            print(f"[TYPE ML] Could not get type confidence: {e}")
+            print(f"[SIMILARITY] Index unavailable: {e}")
 
-        # ========================================================================
-        # STEP 1: BUDGET PREDICTION - Scale based on attendee ratio from training data
-        # ========================================================================
-        print(f"\n[BUDGET SCALING] Calculating budget using attendee ratio from training data...")
+    # ========================================================================
+    # STEP 1: BUDGET PREDICTION - Scale based on attendee ratio from training data
+    # ========================================================================
+    print(f"\n[BUDGET SCALING] Calculating budget using attendee ratio from training data...")
+    
+    try:
+        # Strategy: 
+        # 1. Try to find the most similar event by name (same event type)
+        # 2. If found, use that event's budget-per-attendee ratio AND its attendee count (for Auto-Organize context)
+        # 3. Otherwise, use average of all events of the same type
         
-        try:
-            # Strategy: 
-            # 1. Try to find the most similar event by name (same event type)
-            # 2. If found, use that event's budget-per-attendee ratio AND its attendee count (for Auto-Organize context)
-            # 3. Otherwise, use average of all events of the same type
+        # Filter training data by event type
+        type_df = df[df['event_type'] == event_type].copy()
+        
+        if len(type_df) > 0:
+            # Calculate budget-per-attendee ratio for each training sample
+            type_df['budget_per_attendee'] = type_df['total_budget'] / type_df['attendees']
             
-            # Filter training data by event type
-            type_df = df[df['event_type'] == event_type].copy()
+            # Remove outliers (budget per attendee > 1000 or < 1)
+            type_df = type_df[
+                (type_df['budget_per_attendee'] >= 1) & 
+                (type_df['budget_per_attendee'] <= 1000)
+            ]
             
             if len(type_df) > 0:
-                # Calculate budget-per-attendee ratio for each training sample
-                type_df['budget_per_attendee'] = type_df['total_budget'] / type_df['attendees']
+                # STEP 1: Try to find similar event by name
+                best_match = None
+                best_match_ratio = None
+                best_match_attendees = None
                 
-                # Remove outliers (budget per attendee > 1000 or < 1)
-                type_df = type_df[
-                    (type_df['budget_per_attendee'] >= 1) & 
-                    (type_df['budget_per_attendee'] <= 1000)
-                ]
+                for match, similarity in similar_matches:
+                    # If similarity > 50%, consider it a match (best first)
+                    if similarity <= BUDGET_MATCH_THRESHOLD:
+                        break
+                    if not match['attendees']:
+                        continue
+                    ratio = match['total_budget'] / match['attendees']
+                    if 1 <= ratio <= 1000:
+                        best_match = similarity
+                        best_match_ratio = ratio
+                        best_match_attendees = match['attendees']
+                        print(f"[BUDGET SCALING] Found similar event: '{match['event_name']}' (similarity: {similarity:.1%})")
+                        print(f"[BUDGET SCALING]   Training: {int(match['attendees'])} attendees, ₱{int(match['total_budget']):,} budget")
+                        print(f"[BUDGET SCALING]   Ratio: ₱{ratio:.2f} per attendee")
+                        break
                 
-                if len(type_df) > 0:
-                    # STEP 1: Try to find similar event by name
-                    best_match = None
-                    best_match_ratio = None
-                    best_match_attendees = None
-                    
-                    if event_name:
-                        from difflib import SequenceMatcher
-                        
-                        # Calculate similarity score for each training event
-                        for idx, row in type_df.iterrows():
-                            training_name = row['event_name'].lower()
-                            input_name = event_name.lower()
-                            
-                            # Calculate similarity (0 to 1)
-                            similarity = SequenceMatcher(None, training_name, input_name).ratio()
-                            
-                            # If similarity > 50%, consider it a match
-                            if similarity > 0.5:
-                                if best_match is None or similarity > best_match:
-                                    best_match = similarity
-                                    best_match_ratio = row['budget_per_attendee']
-                                    best_match_attendees = row['attendees']
-                                    print(f"[BUDGET SCALING] Found similar event: '{row['event_name']}' (similarity: {similarity:.1%})")
-                                    print(f"[BUDGET SCALING]   Training: {int(row['attendees'])} attendees, ₱{int(row['total_budget']):,} budget")
-                                    print(f"[BUDGET SCALING]   Ratio: ₱{row['budget_per_attendee']:.2f} per attendee")
+                # STEP 2: Use best match ratio if found, otherwise use average
+                if best_match_ratio is not None:
+                    avg_budget_per_attendee = best_match_ratio
+                    print(f"[BUDGET SCALING] ✓ Using similar event's ratio: ₱{avg_budget_per_attendee:.2f} per attendee")
                     
-                    # STEP 2: Use best match ratio if found, otherwise use average
-                    if best_match_ratio is not None:
-                        avg_budget_per_attendee = best_match_ratio
-                        print(f"[BUDGET SCALING] ✓ Using similar event's ratio: ₱{avg_budget_per_attendee:.2f} per attendee")
-                        
-                        # CRITICAL FIX: If we found a specific event, use its attendee count for the suggestion
-                        # This ensures "Auto-Organize" restores the full scope (e.g., 300 attendees -> 1500 budget)
-                        if best_match_attendees:
-                            # Use historical attendees for calculation
-                            attendees = int(best_match_attendees) 
-                            predictions['suggestedAttendees'] = attendees
-                            print(f"[BUDGET SCALING] Auto-adjusting attendees to historical: {attendees}")
-                    else:
-                        avg_budget_per_attendee = type_df['budget_per_attendee'].mean()
-                        print(f"[BUDGET SCALING] No similar event found, using type average: ₱{avg_budget_per_attendee:.2f} per attendee")
-                    
-                    # Scale to user's attendee count (which might have been updated above)
-                    predicted_budget = int(avg_budget_per_attendee * attendees)
-                    predictions['estimatedBudget'] = max(500, predicted_budget)  # Minimum ₱500
-                    
-                    print(f"[BUDGET SCALING] Event Type: {event_type}")
-                    print(f"[BUDGET SCALING] Training samples: {len(type_df)}")
-                    print(f"[BUDGET SCALING] Calculation Attendees: {attendees}")
-                    print(f"[BUDGET SCALING] Scaled budget: ₱{predictions['estimatedBudget']:,}")
+                    # CRITICAL FIX: If we found a specific event, use its attendee count for the suggestion
+                    # This ensures "Auto-Organize" restores the full scope (e.g., 300 attendees -> 1500 budget)
+                    if best_match_attendees:
+                        # Use historical attendees for calculation
+                        attendees = int(best_match_attendees) 
+                        predictions['suggestedAttendees'] = attendees
+                        print(f"[BUDGET SCALING] Auto-adjusting attendees to historical: {attendees}")
                 else:
-                    raise ValueError("No valid training samples after outlier removal")
+                    avg_budget_per_attendee = type_df['budget_per_attendee'].mean()
+                    print(f"[BUDGET SCALING] No similar event found, using type average: ₱{avg_budget_per_attendee:.2f} per attendee")
+                
+                # Scale to user's attendee count (which might have been updated above)
+                predicted_budget = int(avg_budget_per_attendee * attendees)
+                predictions['estimatedBudget'] = max(500, predicted_budget)  # Minimum ₱500
+                
+                print(f"[BUDGET SCALING] Event Type: {event_type}")
+                print(f"[BUDGET SCALING] Training samples: {len(type_df)}")
+                print(f"[BUDGET SCALING] Calculation Attendees: {attendees}")
+                print(f"[BUDGET SCALING] Scaled budget: ₱{predictions['estimatedBudget']:,}")
             else:
-                raise ValueError(f"No training data for event type: {event_type}")
-            
-        except Exception as e:
-            print(f"[BUDGET SCALING] Error: {e}, using fallback")
-            # Fallback: use default rates
-            rate = {'Academic': 200, 'Sports': 250, 'Cultural': 300, 'Workshop': 220, 'Seminar': 180}.get(event_type, 200)
-            predictions['estimatedBudget'] = attendees * rate
-            print(f"[BUDGET SCALING] Fallback: ₱{rate} per attendee × {attendees} = ₱{predictions['estimatedBudget']:,}")
-
-        # ========================================================================
-        # STEP 2: EQUIPMENT PREDICTION - Learn equipment patterns from ALL events
-        # ========================================================================
-        print(f"\n[EQUIPMENT ML] Learning equipment patterns from ALL events...")
+                raise ValueError("No valid training samples after outlier removal")
+        else:
+            raise ValueError(f"No training data for event type: {event_type}")
         
-        try:
-            # Collect ALL equipment from ALL events
-            all_equipment_counts = {}
-            type_equipment_counts = {}
-            equipment_quantities = {} # NEW: Track quantities
-            
-            for idx, row in df.iterrows():
-                eq_list = row.get('equipment_list', [])
-                eq_objects = row.get('equipment_objects', []) # NEW
-                event_type_row = row.get('event_type', '')
-                
-                # Use eq_objects if available to get quantities
-                for item_obj in eq_objects:
-                    name = item_obj.get('name')
-                    qty = int(item_obj.get('quantity', 1))
-                    
-                    if name not in equipment_quantities:
-                        equipment_quantities[name] = []
-                    equipment_quantities[name].append(qty)
+    except Exception as e:
+        print(f"[BUDGET SCALING] Error: {e}, using fallback")
+        # Fallback: use default rates
+        rate = {'Academic': 200, 'Sports': 250, 'Cultural': 300, 'Workshop': 220, 'Seminar': 180}.get(event_type, 200)
+        predictions['estimatedBudget'] = attendees * rate
+        print(f"[BUDGET SCALING] Fallback: ₱{rate} per attendee × {attendees} = ₱{predictions['estimatedBudget']:,}")
+
+    # ========================================================================
+    # STEP 2: EQUIPMENT PREDICTION - Learn equipment patterns from ALL events
+    # ========================================================================
+    print(f"\n[EQUIPMENT ML] Learning equipment patterns from ALL events...")
+    
+    try:
+        usage_stats = get_usage_stats(df)
+        equipment_table = usage_stats['equipment']
+        labels = equipment_table['labels']
 
-                for item in eq_list:
-                    # Count across ALL events
-                    all_equipment_counts[item] = all_equipment_counts.get(item, 0) + 1
-                    
-                    # Count by event type
-                    if event_type_row not in type_equipment_counts:
-                        type_equipment_counts[event_type_row] = {}
-                    type_equipment_counts[event_type_row][item] = type_equipment_counts[event_type_row].get(item, 0) + 1
-            
-            # Calculate probability: how often does each equipment appear for this event type?
-            equipment_probs = {}
-            if event_type in type_equipment_counts:
-                type_total_events = len(df[df['event_type'] == event_type])
-                for item, count in type_equipment_counts[event_type].items():
-                    probability = count / type_total_events
-                    equipment_probs[item] = probability
-            
-            # Select equipment with >30% probability for this event type
-            predicted_equipment = [item for item, prob in equipment_probs.items() if prob > 0.3]
-            
-            # Add high-frequency items from ALL events (>50% appearance rate)
-            for item, count in all_equipment_counts.items():
-                if count / len(df) > 0.5 and item not in predicted_equipment:
-                    predicted_equipment.append(item)
-            
-            # Adjust based on attendees (large events need more equipment)
-            if attendees > 200:
-                for item in ['Microphone', 'Speaker', 'Tables', 'Chairs']:
-                    if item in all_equipment_counts and item not in predicted_equipment:
-                        predicted_equipment.append(item)
-            
-            # Format as objects with quantities
-            final_resources = []
-            for item in predicted_equipment:
-                # Calculate average quantity from history
-                avg_qty = 1
-                if item in equipment_quantities and equipment_quantities[item]:
-                    quantities = equipment_quantities[item]
-                    avg_qty = max(1, int(round(sum(quantities) / len(quantities))))
-                
-                final_resources.append({'name': item, 'quantity': avg_qty})
+        # Equipment used by >30% of this type's events, then by >50% of ALL events
+        predicted_ids, equipment_probs = select_items(equipment_table, event_type, 0.3, 0.5)
+        
+        # Adjust based on attendees (large events need more equipment)
+        if attendees > 200:
+            for item in ['Microphone', 'Speaker', 'Tables', 'Chairs']:
+                item_id = label_id(equipment_table, item)
+                if item_id is not None and item_id not in predicted_ids:
+                    predicted_ids.append(item_id)
+        
+        # Format as objects with average quantities from history
+        final_resources = [
+            {'name': labels[i], 'quantity': int(equipment_table['avg_quantity'][i])}
+            for i in predicted_ids
+        ]
+
+        predictions['resources'] = final_resources
+        predictions['equipment'] = final_resources
+        
+        print(f"[EQUIPMENT ML] Predicted {len(predicted_ids)} items based on:")
+        print(f"  - {len(equipment_probs)} patterns from {event_type} events")
+        print(f"  - Equipment probabilities: {[(k, f'{v:.1%}') for k, v in sorted(equipment_probs.items(), key=lambda x: -x[1])[:5]]}")
+        
+    except Exception as e:
+        print(f"[EQUIPMENT ML] Error: {e}, using fallback")
+        defaults = {
+            'Academic': [{'name': 'Projector', 'quantity': 1}, {'name': 'Microphone', 'quantity': 1}, {'name': 'Whiteboard', 'quantity': 1}],
+            'Sports': [{'name': 'Scoreboard', 'quantity': 1}, {'name': 'First Aid Kit', 'quantity': 1}, {'name': 'Sound System', 'quantity': 1}],
+            'Cultural': [{'name': 'Stage', 'quantity': 1}, {'name': 'Sound System', 'quantity': 1}, {'name': 'Microphone', 'quantity': 2}, {'name': 'Lighting', 'quantity': 4}]
+        }
+        predictions['resources'] = defaults.get(event_type, [{'name': 'Projector', 'quantity': 1}])
 
-            predictions['resources'] = final_resources
-            predictions['equipment'] = final_resources
-            
-            print(f"[EQUIPMENT ML] Predicted {len(predicted_equipment)} items based on:")
-            print(f"  - {len(type_equipment_counts.get(event_type, {}))} patterns from {event_type} events")
-            print(f"  - Equipment probabilities: {[(k, f'{v:.1%}') for k, v in sorted(equipment_probs.items(), key=lambda x: -x[1])[:5]]}")
-            
-        except Exception as e:
-            print(f"[EQUIPMENT ML] Error: {e}, using fallback")
-            defaults = {
-                'Academic': [{'name': 'Projector', 'quantity': 1}, {'name': 'Microphone', 'quantity': 1}, {'name': 'Whiteboard', 'quantity': 1}],
-                'Sports': [{'name': 'Scoreboard', 'quantity': 1}, {'name': 'First Aid Kit', 'quantity': 1}, {'name': 'Sound System', 'quantity': 1}],
-                'Cultural': [{'name': 'Stage', 'quantity': 1}, {'name': 'Sound System', 'quantity': 1}, {'name': 'Microphone', 'quantity': 2}, {'name': 'Lighting', 'quantity': 4}]
-            }
-            predictions['resources'] = defaults.get(event_type, [{'name': 'Projector', 'quantity': 1}])
+    # ========================================================================
+    # STEP 2.5: ADDITIONAL RESOURCES PREDICTION - Learn from ALL events
+    # ========================================================================
+    print(f"\n[ADDITIONAL RL] Learning additional resource patterns...")
+    
+    try:
+        resources_table = get_usage_stats(df)['resources']
 
-        # ========================================================================
-        # STEP 2.5: ADDITIONAL RESOURCES PREDICTION - Learn from ALL events
-        # ========================================================================
-        print(f"\n[ADDITIONAL RL] Learning additional resource patterns...")
+        # Items used by >20% of this type's events (lower threshold for extras), then by >40% of ALL events
+        predicted_ids, _ = select_items(resources_table, event_type, 0.2, 0.4)
+        predicted_additional = resources_table['labels'][predicted_ids].tolist()
+        
+        predictions['additionalResources'] = predicted_additional
+        print(f"[ADDITIONAL RL] Predicted {len(predicted_additional)} items")
         
+    except Exception as e:
+        print(f"[ADDITIONAL RL] Error: {e}")
+        predictions['additionalResources'] = []
+
+    # ========================================================================
+    # STEP 3: BUDGET BREAKDOWN - Learn from TOP 3 similar events ONLY
+    # ========================================================================
+    print(f"\n[BREAKDOWN ML] Finding similar events for budget breakdown...")
+    
+    # We'll find top similar events first, then use them for breakdown
+    top_similar_events = []
+    
+    if event_name and len(event_name) > 3:
+        try:
+            # STEP 1: Try exact match first (case-insensitive)
+            exact_match = similarity_index.exact(event_name, event_type) if similarity_index else None
+            if exact_match is not None:
+                top_similar_events.append(exact_match)
+                print(f"[BREAKDOWN ML] ✅ EXACT MATCH found: {exact_match['event_name']}")
+            elif similar_matches and similar_matches[0][1] > STRONG_MATCH_THRESHOLD:
+                # STEP 2: A single strong match is enough
+                best_match_event, best_score = similar_matches[0]
+                top_similar_events.append(best_match_event)
+                print(f"[BREAKDOWN ML] ✅ STRONG MATCH found: {best_match_event['event_name']} (score: {best_score:.2%})")
+            else:
+                # STEP 3: Otherwise combine the top 3 reasonable matches
+                print(f"[BREAKDOWN ML] Top 3 similarity matches:")
+                for similar_evt, sim in similar_matches[:3]:
+                    print(f"  - {similar_evt['event_name']} (similarity: {sim:.2%})")
+                    if sim > WEAK_MATCH_THRESHOLD:
+                        top_similar_events.append(similar_evt)
+            
+            # Only log if no good matches found
+            if len(top_similar_events) == 0:
+                print(f"[BREAKDOWN ML] No similar events found. Using event-type fallback.")
+        except Exception as e:
+            print(f"[BREAKDOWN ML] Similarity error: {e}")
+    
+    # Use ONLY top similar events for breakdown
+    if len(top_similar_events) > 0:
         try:
-            # Collect ALL additional resources
-            all_additional_counts = {}
-            type_additional_counts = {}
+            breakdown_patterns = {}
             
-            for idx, row in df.iterrows():
-                res_list = row.get('additional_resources_list', [])
-                event_type_row = row.get('event_type', '')
+            # Collect categories ONLY from top similar events
+            for similar_evt in top_similar_events:
+                breakdown_list = similar_evt.get('budget_breakdown_list', [])
+                total_budget = similar_evt.get('total_budget', 1)
                 
-                for item in res_list:
-                    # Count frequency
-                    all_additional_counts[item] = all_additional_counts.get(item, 0) + 1
+                for item in breakdown_list:
+                    category = item.get('name', 'Misc')
+                    amount = item.get('amount', 0)
+                    percentage = (amount / total_budget) * 100 if total_budget > 0 else 0
                     
-                    if event_type_row not in type_additional_counts:
-                        type_additional_counts[event_type_row] = {}
-                    type_additional_counts[event_type_row][item] = type_additional_counts[event_type_row].get(item, 0) + 1
+                    if category not in breakdown_patterns:
+                        breakdown_patterns[category] = []
+                    breakdown_patterns[category].append(percentage)
             
-            # Calculate probability
-            additional_probs = {}
-            if event_type in type_additional_counts:
-                type_total_events = len(df[df['event_type'] == event_type])
-                for item, count in type_additional_counts[event_type].items():
-                    probability = count / type_total_events
-                    additional_probs[item] = probability
+            # Calculate AVERAGE percentage for each category
+            avg_percentages = {}
+            for category, percentages in breakdown_patterns.items():
+                avg_percentages[category] = sum(percentages) / len(percentages)
             
-            # Select items with >20% probability (lower threshold for extras)
-            predicted_additional = [item for item, prob in additional_probs.items() if prob > 0.2]
+            # Apply learned percentages to predicted budget
+            total_budget = predictions['estimatedBudget']
+            learned_breakdown = {}
             
-            # Add high-frequency items from ALL events (>40%)
-            for item, count in all_additional_counts.items():
-                if count / len(df) > 0.4 and item not in predicted_additional:
-                    predicted_additional.append(item)
+            for category, avg_pct in avg_percentages.items():
+                learned_breakdown[category] = int((avg_pct / 100) * total_budget)
             
-            predictions['additionalResources'] = predicted_additional
-            print(f"[ADDITIONAL RL] Predicted {len(predicted_additional)} items")
+            # Normalize to ensure sum equals total budget
+            breakdown_sum = sum(learned_breakdown.values())
+            if breakdown_sum > 0:
+                for category in learned_breakdown:
+                    learned_breakdown[category] = int((learned_breakdown[category] / breakdown_sum) * total_budget)
+            
+            predictions['budgetBreakdown'] = learned_breakdown
+            
+            print(f"[BREAKDOWN ML] Learned from TOP {len(top_similar_events)} similar events only")
+            print(f"  - Categories used: {list(learned_breakdown.keys())}")
             
         except Exception as e:
-            print(f"[ADDITIONAL RL] Error: {e}")
-            predictions['additionalResources'] = []
-
-        # ========================================================================
-        # STEP 3: BUDGET BREAKDOWN - Learn from TOP 3 similar events ONLY
-        # ========================================================================
-        print(f"\n[BREAKDOWN ML] Finding similar events for budget breakdown...")
-        
-        # We'll find top similar events first, then use them for breakdown
-        top_similar_events = []
-        top_similarities = []
-        
-        if event_name and len(event_name) > 3:
-            try:
-                type_df = df[df['event_type'] == event_type]
-                
-                if not type_df.empty and 'event_name' in type_df.columns:
-                    # STEP 1: Try exact match first (case-insensitive)
-                    exact_match = type_df[type_df['event_name'].str.lower() == event_name.lower()]
-                    if not exact_match.empty:
-                        top_similar_events.append(exact_match.iloc[0])
-                        print(f"[BREAKDOWN ML] ✅ EXACT MATCH found: {exact_match.iloc[0]['event_name']}")
-                    else:
-                        # STEP 2: Try fuzzy matching (contains key words)
-                        event_words = set(event_name.lower().split())
-                        best_fuzzy_match = None
-                        best_fuzzy_score = 0
-                        
-                        for idx, row in type_df.iterrows():
-                            training_words = set(row['event_name'].lower().split())
-                            # Calculate word overlap
-                            overlap = len(event_words & training_words)
-                            overlap_ratio = overlap / max(len(event_words), len(training_words))
-                            
-                            if overlap_ratio > best_fuzzy_score:
-                                best_fuzzy_score = overlap_ratio
-                                best_fuzzy_match = row
-                        
-                        # If fuzzy match is good (>40% word overlap), use it
-                        if best_fuzzy_score > 0.40:
-                            top_similar_events.append(best_fuzzy_match)
-                            print(f"[BREAKDOWN ML] ✅ FUZZY MATCH found: {best_fuzzy_match['event_name']} (score: {best_fuzzy_score:.2%})")
-                        else:
-                            # STEP 3: Fall back to TF-IDF only if no good fuzzy match
-                            print(f"[BREAKDOWN ML] No exact/fuzzy match. Trying TF-IDF similarity...")
-                            vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
-                            training_names = type_df['event_name'].tolist()
-                            all_names = training_names + [event_name]
-                            
-                            vectors = vectorizer.fit_transform(all_names)
-                            input_vector = vectors[-1]
-                            training_vectors = vectors[:-1]
-                            
-                            similarities = cosine_similarity(input_vector, training_vectors)[0]
-                            
-                            # Get TOP 3 similar events
-                            top_indices = similarities.argsort()[-3:][::-1]
-                            top_similarities = similarities[top_indices]
-                            
-                            print(f"[BREAKDOWN ML] Top 3 TF-IDF matches:")
-                            for idx, sim in zip(top_indices, top_similarities):
-                                similar_evt = type_df.iloc[idx]
-                                print(f"  - {similar_evt['event_name']} (similarity: {sim:.2%})")
-                                
-                                if sim > 0.15:  # Lowered threshold to 15% for better matching
-                                    top_similar_events.append(similar_evt)
-                    
-                    # Only log if no good matches found
-                    if len(top_similar_events) == 0:
-                        print(f"[BREAKDOWN ML] No similar events found. Using event-type fallback.")
-            except Exception as e:
-                print(f"[BREAKDOWN ML] Similarity error: {e}")
-        
-        # Use ONLY top similar events for breakdown
-        if len(top_similar_events) > 0:
-            try:
-                breakdown_patterns = {}
-                
-                # Collect categories ONLY from top similar events
-                for similar_evt in top_similar_events:
-                    breakdown_list = similar_evt.get('budget_breakdown_list', [])
-                    total_budget = similar_evt.get('total_budget', 1)
-                    
-                    for item in breakdown_list:
-                        category = item.get('name', 'Misc')
-                        amount = item.get('amount', 0)
-                        percentage = (amount / total_budget) * 100 if total_budget > 0 else 0
-                        
-                        if category not in breakdown_patterns:
-                            breakdown_patterns[category] = []
-                        breakdown_patterns[category].append(percentage)
-                
-                # Calculate AVERAGE percentage for each category
-                avg_percentages = {}
-                for category, percentages in breakdown_patterns.items():
-                    avg_percentages[category] = sum(percentages) / len(percentages)
-                
-                # Apply learned percentages to predicted budget
-                total_budget = predictions['estimatedBudget']
-                learned_breakdown = {}
-                
-                for category, avg_pct in avg_percentages.items():
-                    learned_breakdown[category] = int((avg_pct / 100) * total_budget)
-                
-                # Normalize to ensure sum equals total budget
-                breakdown_sum = sum(learned_breakdown.values())
-                if breakdown_sum > 0:
-                    for category in learned_breakdown:
-                        learned_breakdown[category] = int((learned_breakdown[category] / breakdown_sum) * total_budget)
-                
-                predictions['budgetBreakdown'] = learned_breakdown
-                
-                print(f"[BREAKDOWN ML] Learned from TOP {len(top_similar_events)} similar events only")
-                print(f"  - Categories used: {list(learned_breakdown.keys())}")
-                
-            except Exception as e:
-                print(f"[BREAKDOWN ML] Error: {e}, using default allocation")
-                predictions['budgetBreakdown'] = {
-                    "Equipment": int(predictions['estimatedBudget'] * 0.35),
-                    "Venue": int(predictions['estimatedBudget'] * 0.25),
-                    "Materials": int(predictions['estimatedBudget'] * 0.20),
-                    "Marketing": int(predictions['estimatedBudget'] * 0.10),
-                    "Miscellaneous": int(predictions['estimatedBudget'] * 0.10)
-                }
-        else:
-            # Fallback if no similar events found
+            print(f"[BREAKDOWN ML] Error: {e}, using default allocation")
             predictions['budgetBreakdown'] = {
                 "Equipment": int(predictions['estimatedBudget'] * 0.35),
                 "Venue": int(predictions['estimatedBudget'] * 0.25),
@@ -983,203 +848,206 @@ def predict_resources():
                 "Marketing": int(predictions['estimatedBudget'] * 0.10),
                 "Miscellaneous": int(predictions['estimatedBudget'] * 0.10)
             }
+    else:
+        # Fallback if no similar events found
+        predictions['budgetBreakdown'] = {
+            "Equipment": int(predictions['estimatedBudget'] * 0.35),
+            "Venue": int(predictions['estimatedBudget'] * 0.25),
+            "Materials": int(predictions['estimatedBudget'] * 0.20),
+            "Marketing": int(predictions['estimatedBudget'] * 0.10),
+            "Miscellaneous": int(predictions['estimatedBudget'] * 0.10)
+        }
 
-        # ========================================================================
-        # STEP 4: TIMELINE - Reuse top similar events already found
-        # ========================================================================
-        print(f"\n[TIMELINE ML] Using top similar events for timeline generation...")
-        
-        if len(top_similar_events) > 0:
-            try:
-                combined_phases = []
-                phase_occurrences = {}
+    # ========================================================================
+    # STEP 4: TIMELINE - Reuse top similar events already found
+    # ========================================================================
+    print(f"\n[TIMELINE ML] Using top similar events for timeline generation...")
+    
+    if len(top_similar_events) > 0:
+        try:
+            combined_phases = []
+            phase_occurrences = {}
+            
+            print(f"[TIMELINE ML] Combining timelines from {len(top_similar_events)} similar events")
+            
+            # Analyze phases from top similar events
+            for similar_event in top_similar_events:
+                activities = similar_event.get('activities_list', [])
                 
-                print(f"[TIMELINE ML] Combining timelines from {len(top_similar_events)} similar events")
+                # Parse activities - handle both string and object formats
+                parsed_activities = []
+                if isinstance(activities, list):
+                    for activity in activities:
+                        if isinstance(activity, str):
+                            # Parse string format: "08:00 - 08:30: Registration and attendance checking"
+                            import re
+                            match = re.match(r'(\d{2}:\d{2})\s*-\s*(\d{2}:\d{2}):\s*(.+)', activity)
+                            if match:
+                                parsed_activities.append({
+                                    'phase': match.group(3).strip(),
+                                    'startTime': match.group(1),
+                                    'endTime': match.group(2)
+                                })
+                        elif isinstance(activity, dict) and activity.get('phase'):
+                            # Already in object format
+                            parsed_activities.append(activity)
                 
-                # Analyze phases from top similar events
-                for similar_event in top_similar_events:
-                    activities = similar_event.get('activities_list', [])
-                    
-                    # Parse activities - handle both string and object formats
-                    parsed_activities = []
-                    if isinstance(activities, list):
-                        for activity in activities:
-                            if isinstance(activity, str):
-                                # Parse string format: "08:00 - 08:30: Registration and attendance checking"
-                                import re
-                                match = re.match(r'(\d{2}:\d{2})\s*-\s*(\d{2}:\d{2}):\s*(.+)', activity)
-                                if match:
-                                    parsed_activities.append({
-                                        'phase': match.group(3).strip(),
-                                        'startTime': match.group(1),
-                                        'endTime': match.group(2)
-                                    })
-                            elif isinstance(activity, dict) and activity.get('phase'):
-                                # Already in object format
-                                parsed_activities.append(activity)
+                # Process parsed activities
+                for activity in parsed_activities:
+                    if activity.get('phase'):
+                        phase_name = activity.get('phase')
+                        
+                        if phase_name not in phase_occurrences:
+                            phase_occurrences[phase_name] = {
+                                'count': 0,
+                                'start_times': [],
+                                'end_times': [],
+                                'descriptions': []
+                            }
+                        
+                        phase_occurrences[phase_name]['count'] += 1
+                        phase_occurrences[phase_name]['start_times'].append(
+                            activity.get('startTime', activity.get('start_time', '09:00'))
+                        )
+                        phase_occurrences[phase_name]['end_times'].append(
+                            activity.get('endTime', activity.get('end_time', '10:00'))
+                        )
+                        if activity.get('description'):
+                            phase_occurrences[phase_name]['descriptions'].append(activity.get('description'))
+            
+            # Use phases that appear in majority of similar events
+            min_occurrences = max(1, len(top_similar_events) // 2)  # At least half
+            for phase_name, data in phase_occurrences.items():
+                if data['count'] >= min_occurrences:
+                    # Use most common time (mode)
+                    start_time = max(set(data['start_times']), key=data['start_times'].count)
+                    end_time = max(set(data['end_times']), key=data['end_times'].count)
                     
-                    # Process parsed activities
-                    for activity in parsed_activities:
-                        if activity.get('phase'):
-                            phase_name = activity.get('phase')
-                            
-                            if phase_name not in phase_occurrences:
-                                phase_occurrences[phase_name] = {
-                                    'count': 0,
-                                    'start_times': [],
-                                    'end_times': [],
-                                    'descriptions': []
-                                }
-                            
-                            phase_occurrences[phase_name]['count'] += 1
-                            phase_occurrences[phase_name]['start_times'].append(
-                                activity.get('startTime', activity.get('start_time', '09:00'))
-                            )
-                            phase_occurrences[phase_name]['end_times'].append(
-                                activity.get('endTime', activity.get('end_time', '10:00'))
-                            )
-                            if activity.get('description'):
-                                phase_occurrences[phase_name]['descriptions'].append(activity.get('description'))
+                    # Select best description (longest one usually has most detail)
+                    description = ""
+                    if data['descriptions']:
+                        description = max(data['descriptions'], key=len)
+
+                    combined_phases.append({
+                        'phase': phase_name,
+                        'description': description,
+                        'startTime': convert_to_24hour(start_time),
+                        'endTime': convert_to_24hour(end_time)
+                    })
+            
+            if combined_phases:
+                # Sort by start time
+                combined_phases.sort(key=lambda x: x['startTime'])
+                predictions['timeline'] = combined_phases
                 
-                # Use phases that appear in majority of similar events
-                min_occurrences = max(1, len(top_similar_events) // 2)  # At least half
-                for phase_name, data in phase_occurrences.items():
-                    if data['count'] >= min_occurrences:
-                        # Use most common time (mode)
-                        start_time = max(set(data['start_times']), key=data['start_times'].count)
-                        end_time = max(set(data['end_times']), key=data['end_times'].count)
-                        
-                        # Select best description (longest one usually has most detail)
-                        description = ""
-                        if data['descriptions']:
-                            description = max(data['descriptions'], key=len)
-
-                        combined_phases.append({
-                            'phase': phase_name,
-                            'description': description,
-                            'startTime': convert_to_24hour(start_time),
-                            'endTime': convert_to_24hour(end_time)
-                        })
+                # Get description and attendees from most similar event
+                predictions['description'] = top_similar_events[0].get('description', '')
+                predictions['suggestedAttendees'] = int(top_similar_events[0].get('attendees', attendees))
                 
-                if combined_phases:
-                    # Sort by start time
-                    combined_phases.sort(key=lambda x: x['startTime'])
-                    predictions['timeline'] = combined_phases
-                    
-                    # Get description and attendees from most similar event
-                    predictions['description'] = top_similar_events[0].get('description', '')
-                    predictions['suggestedAttendees'] = int(top_similar_events[0].get('attendees', attendees))
-                    
-                    # ---------------------------------------------------------
-                    # STEP 5: VENUE - Get most frequent venue from similar events
-                    # ---------------------------------------------------------
-                    venues = [e.get('venue') for e in top_similar_events if e.get('venue')]
-                    if venues:
-                        # Find mode (most common venue)
-                        suggested_venue = max(set(venues), key=venues.count)
-                        predictions['suggestedVenue'] = suggested_venue
-                        print(f"[VENUE ML] Suggested venue: {suggested_venue} (from {len(venues)} samples)")
-                    
-                    print(f"[TIMELINE ML] Generated {len(combined_phases)} phases")
-                    
-            except Exception as e:
-                print(f"[TIMELINE ML] Error: {e}")
-                import traceback
-                traceback.print_exc()
-
-        # Fallback venue if none generated
-        if not predictions.get('suggestedVenue'):
-             fallback_venues = {
-                'Academic': 'Auditorium',
-                'Sports': 'Gymnasium',
-                'Cultural': 'Auditorium',
-                'Workshop': 'Function Hall',
-                'Seminar': 'Conference Room',
-                'Other': 'Multi-purpose Hall'
-             }
-             predictions['suggestedVenue'] = fallback_venues.get(event_type, 'Auditorium')
-             print(f"[VENUE ML] Using fallback venue: {predictions['suggestedVenue']}")
-
-        # Fallback timeline if none generated - EVENT TYPE SPECIFIC
-        if not predictions.get('timeline'):
-            print(f"[TIMELINE ML] Using event-type-specific fallback for {event_type}")
-            fallback_timelines = {
-                'Academic': [
-                    {'phase': 'Registration & Welcome', 'startTime': '08:00', 'endTime': '08:30', 'description': 'Checking attendance and distributing event kits.'},
-                    {'phase': 'Opening Ceremony', 'startTime': '08:30', 'endTime': '09:00', 'description': 'National Anthem, Invocation, and Opening Remarks.'},
-                    {'phase': 'Main Presentation', 'startTime': '09:00', 'endTime': '11:00', 'description': 'Keynote presentation and topic discussion.'},
-                    {'phase': 'Q&A Session', 'startTime': '11:00', 'endTime': '11:30', 'description': 'Open floor for questions from the audience.'},
-                    {'phase': 'Closing Remarks', 'startTime': '11:30', 'endTime': '12:00', 'description': 'Summary of the event and awarding of certificates.'}
-                ],
-                'Sports': [
-                    {'phase': 'Player Registration', 'startTime': '07:00', 'endTime': '07:30', 'description': 'Checking player eligibility and distributing jerseys.'},
-                    {'phase': 'Opening Ceremony', 'startTime': '07:30', 'endTime': '08:00', 'description': 'Oath of Sportsmanship and lighting of the torch.'},
-                    {'phase': 'Competition Rounds', 'startTime': '08:00', 'endTime': '12:00', 'description': 'Elimination rounds for various sports categories.'},
-                    {'phase': 'Lunch Break', 'startTime': '12:00', 'endTime': '13:00', 'description': 'Rest period for players and officials.'},
-                    {'phase': 'Finals', 'startTime': '13:00', 'endTime': '15:00', 'description': 'Championship matches.'},
-                    {'phase': 'Awarding Ceremony', 'startTime': '15:00', 'endTime': '16:00', 'description': 'Distribution of medals and trophies.'}
-                ],
-                'Cultural': [
-                    {'phase': 'Setup & Sound Check', 'startTime': '08:00', 'endTime': '09:00', 'description': 'Stage preparation and audio-visual testing.'},
-                    {'phase': 'Opening Performance', 'startTime': '09:00', 'endTime': '09:30', 'description': 'Welcome number by the cultural troupe.'},
-                    {'phase': 'Main Performances', 'startTime': '09:30', 'endTime': '12:00', 'description': 'showcase of talents including singing, dancing, and drama.'},
-                    {'phase': 'Intermission', 'startTime': '12:00', 'endTime': '13:00', 'description': 'Lunch and networking break.'},
-                    {'phase': 'Afternoon Performances', 'startTime': '13:00', 'endTime': '16:00', 'description': 'continuation of cultural presentations.'},
-                    {'phase': 'Closing Performance', 'startTime': '16:00', 'endTime': '17:00', 'description': 'Finale number and closing remarks.'}
-                ],
-                'Workshop': [
-                    {'phase': 'Registration', 'startTime': '08:00', 'endTime': '08:30', 'description': 'Attendance signing and kit distribution.'},
-                    {'phase': 'Introduction & Icebreaker', 'startTime': '08:30', 'endTime': '09:00', 'description': 'Getting to know participants and setting expectations.'},
-                    {'phase': 'Workshop Session 1', 'startTime': '09:00', 'endTime': '10:30', 'description': 'First hands-on activity and lecture.'},
-                    {'phase': 'Break', 'startTime': '10:30', 'endTime': '10:45', 'description': 'Short health break.'},
-                    {'phase': 'Workshop Session 2', 'startTime': '10:45', 'endTime': '12:00', 'description': 'Second hands-on activity and output presentation.'},
-                    {'phase': 'Wrap-up & Certificates', 'startTime': '12:00', 'endTime': '12:30', 'description': 'Evaluation and distribution of certificates.'}
-                ],
-                'Seminar': [
-                    {'phase': 'Registration', 'startTime': '08:00', 'endTime': '08:30', 'description': 'Registration of participants.'},
-                    {'phase': 'Opening Remarks', 'startTime': '08:30', 'endTime': '09:00', 'description': 'Welcome address by the organizers.'},
-                    {'phase': 'Keynote Speaker', 'startTime': '09:00', 'endTime': '10:30', 'description': 'Main talk on the seminar topic.'},
-                    {'phase': 'Break', 'startTime': '10:30', 'endTime': '10:45', 'description': 'Coffee break.'},
-                    {'phase': 'Panel Discussion', 'startTime': '10:45', 'endTime': '12:00', 'description': 'Experts discussing specific aspects of the topic.'},
-                    {'phase': 'Closing Remarks', 'startTime': '12:00', 'endTime': '12:30', 'description': 'Closing summary and acknowledgments.'}
-                ]
-            }
-            predictions['timeline'] = fallback_timelines.get(event_type, fallback_timelines['Academic'])
-
-        # ========================================================================
-        # STEP 6: ATTENDEES - Ensure we have a suggestion
-        # ========================================================================
-        if not predictions.get('suggestedAttendees'):
-            # Calculate average from full dataset for this event type
-            try:
-                type_df = df[df['event_type'] == event_type]
-                if not type_df.empty:
-                    avg_attendees = int(type_df['attendees'].mean())
-                    predictions['suggestedAttendees'] = avg_attendees
-                    print(f"[ATTENDEES ML] Calculated average for {event_type}: {avg_attendees}")
-                else:
-                    defaults = {'Academic': 100, 'Sports': 300, 'Cultural': 500, 'Workshop': 50, 'Seminar': 150}
-                    predictions['suggestedAttendees'] = defaults.get(event_type, 100)
-                    print(f"[ATTENDEES ML] Using default for {event_type}: {predictions['suggestedAttendees']}")
-            except Exception as e:
-                print(f"[ATTENDEES ML] Error calculating: {e}")
-                predictions['suggestedAttendees'] = 100
-
-        print(f"\n{'='*60}")
-        print(f"[ML SUMMARY] Prediction complete!")
-        print(f"  Budget: ₱{predictions['estimatedBudget']:,}")
-        print(f"  Equipment: {len(predictions['resources'])} items")
-        print(f"  Timeline: {len(predictions['timeline'])} phases")
-        print(f"  Confidence: {predictions['confidence']:.1%}")
-        print(f"{'='*60}\n")
-        
-        return jsonify({'success': True, **predictions})
+                # ---------------------------------------------------------
+                # STEP 5: VENUE - Get most frequent venue from similar events
+                # ---------------------------------------------------------
+                venues = [e.get('venue') for e in top_similar_events if e.get('venue')]
+                if venues:
+                    # Find mode (most common venue)
+                    suggested_venue = max(set(venues), key=venues.count)
+                    predictions['suggestedVenue'] = suggested_venue
+                    print(f"[VENUE ML] Suggested venue: {suggested_venue} (from {len(venues)} samples)")
+                
+                print(f"[TIMELINE ML] Generated {len(combined_phases)} phases")
+                
+        except Exception as e:
+            print(f"[TIMELINE ML] Error: {e}")
+            import traceback
+            traceback.print_exc()
+
+    # Fallback venue if none generated
+    if not predictions.get('suggestedVenue'):
+         fallback_venues = {
+            'Academic': 'Auditorium',
+            'Sports': 'Gymnasium',
+            'Cultural': 'Auditorium',
+            'Workshop': 'Function Hall',
+            'Seminar': 'Conference Room',
+            'Other': 'Multi-purpose Hall'
+         }
+         predictions['suggestedVenue'] = fallback_venues.get(event_type, 'Auditorium')
+         print(f"[VENUE ML] Using fallback venue: {predictions['suggestedVenue']}")
+
+    # Fallback timeline if none generated - EVENT TYPE SPECIFIC
+    if not predictions.get('timeline'):
+        print(f"[TIMELINE ML] Using event-type-specific fallback for {event_type}")
+        fallback_timelines = {
+            'Academic': [
+                {'phase': 'Registration & Welcome', 'startTime': '08:00', 'endTime': '08:30', 'description': 'Checking attendance and distributing event kits.'},
+                {'phase': 'Opening Ceremony', 'startTime': '08:30', 'endTime': '09:00', 'description': 'National Anthem, Invocation, and Opening Remarks.'},
+                {'phase': 'Main Presentation', 'startTime': '09:00', 'endTime': '11:00', 'description': 'Keynote presentation and topic discussion.'},
+                {'phase': 'Q&A Session', 'startTime': '11:00', 'endTime': '11:30', 'description': 'Open floor for questions from the audience.'},
+                {'phase': 'Closing Remarks', 'startTime': '11:30', 'endTime': '12:00', 'description': 'Summary of the event and awarding of certificates.'}
+            ],
+            'Sports': [
+                {'phase': 'Player Registration', 'startTime': '07:00', 'endTime': '07:30', 'description': 'Checking player eligibility and distributing jerseys.'},
+                {'phase': 'Opening Ceremony', 'startTime': '07:30', 'endTime': '08:00', 'description': 'Oath of Sportsmanship and lighting of the torch.'},
+                {'phase': 'Competition Rounds', 'startTime': '08:00', 'endTime': '12:00', 'description': 'Elimination rounds for various sports categories.'},
+                {'phase': 'Lunch Break', 'startTime': '12:00', 'endTime': '13:00', 'description': 'Rest period for players and officials.'},
+                {'phase': 'Finals', 'startTime': '13:00', 'endTime': '15:00', 'description': 'Championship matches.'},
+                {'phase': 'Awarding Ceremony', 'startTime': '15:00', 'endTime': '16:00', 'description': 'Distribution of medals and trophies.'}
+            ],
+            'Cultural': [
+                {'phase': 'Setup & Sound Check', 'startTime': '08:00', 'endTime': '09:00', 'description': 'Stage preparation and audio-visual testing.'},
+                {'phase': 'Opening Performance', 'startTime': '09:00', 'endTime': '09:30', 'description': 'Welcome number by the cultural troupe.'},
+                {'phase': 'Main Performances', 'startTime': '09:30', 'endTime': '12:00', 'description': 'showcase of talents including singing, dancing, and drama.'},
+                {'phase': 'Intermission', 'startTime': '12:00', 'endTime': '13:00', 'description': 'Lunch and networking break.'},
+                {'phase': 'Afternoon Performances', 'startTime': '13:00', 'endTime': '16:00', 'description': 'continuation of cultural presentations.'},
+                {'phase': 'Closing Performance', 'startTime': '16:00', 'endTime': '17:00', 'description': 'Finale number and closing remarks.'}
+            ],
+            'Workshop': [
+                {'phase': 'Registration', 'startTime': '08:00', 'endTime': '08:30', 'description': 'Attendance signing and kit distribution.'},
+                {'phase': 'Introduction & Icebreaker', 'startTime': '08:30', 'endTime': '09:00', 'description': 'Getting to know participants and setting expectations.'},
+                {'phase': 'Workshop Session 1', 'startTime': '09:00', 'endTime': '10:30', 'description': 'First hands-on activity and lecture.'},
+                {'phase': 'Break', 'startTime': '10:30', 'endTime': '10:45', 'description': 'Short health break.'},
+                {'phase': 'Workshop Session 2', 'startTime': '10:45', 'endTime': '12:00', 'description': 'Second hands-on activity and output presentation.'},
+                {'phase': 'Wrap-up & Certificates', 'startTime': '12:00', 'endTime': '12:30', 'description': 'Evaluation and distribution of certificates.'}
+            ],
+            'Seminar': [
+                {'phase': 'Registration', 'startTime': '08:00', 'endTime': '08:30', 'description': 'Registration of participants.'},
+                {'phase': 'Opening Remarks', 'startTime': '08:30', 'endTime': '09:00', 'description': 'Welcome address by the organizers.'},
+                {'phase': 'Keynote Speaker', 'startTime': '09:00', 'endTime': '10:30', 'description': 'Main talk on the seminar topic.'},
+                {'phase': 'Break', 'startTime': '10:30', 'endTime': '10:45', 'description': 'Coffee break.'},
+                {'phase': 'Panel Discussion', 'startTime': '10:45', 'endTime': '12:00', 'description': 'Experts discussing specific aspects of the topic.'},
+                {'phase': 'Closing Remarks', 'startTime': '12:00', 'endTime': '12:30', 'description': 'Closing summary and acknowledgments.'}
+            ]
+        }
+        predictions['timeline'] = fallback_timelines.get(event_type, fallback_timelines['Academic'])
 
-    except Exception as e:
-        import traceback
-        print(f"[ML ERROR] {e}")
-        traceback.print_exc()
-        return jsonify({'success': False, 'error': str(e)})
+    # ========================================================================
+    # STEP 6: ATTENDEES - Ensure we have a suggestion
+    # ========================================================================
+    if not predictions.get('suggestedAttendees'):
+        # Calculate average from full dataset for this event type
+        try:
+            type_df = df[df['event_type'] == event_type]
+            if not type_df.empty:
+                avg_attendees = int(type_df['attendees'].mean())
+                predictions['suggestedAttendees'] = avg_attendees
+                print(f"[ATTENDEES ML] Calculated average for {event_type}: {avg_attendees}")
+            else:
+                defaults = {'Academic': 100, 'Sports': 300, 'Cultural': 500, 'Workshop': 50, 'Seminar': 150}
+                predictions['suggestedAttendees'] = defaults.get(event_type, 100)
+                print(f"[ATTENDEES ML] Using default for {event_type}: {predictions['suggestedAttendees']}")
+        except Exception as e:
+            print(f"[ATTENDEES ML] Error calculating: {e}")
+            predictions['suggestedAttendees'] = 100
+
+    print(f"\n{'='*60}")
+    print(f"[ML SUMMARY] Prediction complete!")
+    print(f"  Budget: ₱{predictions['estimatedBudget']:,}")
+    print(f"  Equipment: {len(predictions['resources'])} items")
+    print(f"  Timeline: {len(predictions['timeline'])} phases")
+    print(f"  Confidence: {predictions['confidence']:.1%}")
+    print(f"{'='*60}\n")
+    
+    return {'success': True, **predictions}
 
 
 def generate_fallback_predictions(event_type, attendees, duration):
@@ -1193,7 +1061,7 @@ def generate_fallback_predictions(event_type, attendees, duration):
         'Cultural': ['Stage', 'Sound System', 'Microphone', 'Lighting', 'Decorations']
     }
     
-    return jsonify({
+    return {
         'success': True,
         'estimatedBudget': budget,
         'resources': equipment_defaults.get(event_type, ['Projector']),
@@ -1207,7 +1075,7 @@ def generate_fallback_predictions(event_type, attendees, duration):
             'Other': int(budget * 0.3)
         },
         'confidence': 50.0
-    })
+    }
 
 @ml_bp.route('/classify-event-type', methods=['POST'])
 def classify_event_type():
@@ -1220,32 +1088,59 @@ def classify_event_type():
         if not text or len(text) < 3:
             return jsonify({'success': False, 'error': 'Text too short'})
 
-        if not os.path.exists(EVENT_CLASSIFIER_PATH) or not os.path.exists(EVENT_VECTORIZER_PATH):
-            print(f'[CLASSIFY] Models not found! Classifier: {os.path.exists(EVENT_CLASSIFIER_PATH)}, Vectorizer: {os.path.exists(EVENT_VECTORIZER_PATH)}')
+        classification = classify_names([text])[0]
+        if classification is None:
+            print(f"[CLASSIFY] Models not found!")
             return jsonify({'success': False, 'message': 'Models not initialized'})
 
-        classifier = joblib.load(EVENT_CLASSIFIER_PATH)
-        vectorizer = joblib.load(EVENT_VECTORIZER_PATH)
-        
-        print(f'[CLASSIFY] Loaded models. Classes: {classifier.classes_}')
+        result = _classification_result(classification)
+        print(f"[CLASSIFY] Prediction: {result['eventType']}, Confidence: {result['confidence']:.1f}%")
 
-        text_vec = vectorizer.transform([text])
-        prediction = classifier.predict(text_vec)[0]
-        
-        probs = classifier.predict_proba(text_vec)[0]
-        confidence = max(probs) * 100
-        
-        print(f'[CLASSIFY] Prediction: {prediction}, Confidence: {confidence:.1f}%')
+        return jsonify(result)
 
-        return jsonify({
-            'success': True,
-            'eventType': prediction,
-            'confidence': round(confidence, 1)
-        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@ml_bp.route('/classify-event-type/batch', methods=['POST'])
+def classify_event_type_batch():
+    """
+    Classify many texts at once: {"texts": ["...", ...]}.
+    One vectorizer/classifier pass; results keep input order.
+    """
+    try:
+        texts = _batch_items('texts')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        results = [None] * len(texts)
+        valid = []
+        for i, text in enumerate(texts):
+            if not isinstance(text, str) or len(text) < 3:
+                results[i] = {'success': False, 'error': 'Text too short'}
+            else:
+                valid.append(i)
+
+        if valid:
+            classifications = classify_names([texts[i] for i in valid])
+            if classifications[0] is None:
+                return jsonify({'success': False, 'message': 'Models not initialized'})
+            for i, classification in zip(valid, classifications):
+                results[i] = _classification_result(classification)
+
+        return jsonify({'success': True, 'count': len(results), 'results': results})
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+def _classification_result(classification):
+    probs = classification['probs']
+    return {
+        'success': True,
+        'eventType': classification['classes'][probs.argmax()],
+        'confidence': round(max(probs) * 100, 1)
+    }
+
 @ml_bp.route('/model-status', methods=['GET'])
 def model_status():
     """
@@ -1253,23 +1148,18 @@ def model_status():
     Returns model availability, metadata, and training status.
     """
     try:
-        # Check if all critical models exist
+        # Check if all critical models are loaded
+        models = model_registry.snapshot()
         models_exist = {
-            'budget': os.path.exists(BUDGET_MODEL_PATH),
-            'equipment': os.path.exists(EQUIPMENT_MODEL_PATH),
-            'classifier': os.path.exists(EVENT_CLASSIFIER_PATH),
-            'breakdown': os.path.exists(BREAKDOWN_PROFILE_PATH)
+            'budget': 'budget' in models,
+            'equipment': 'equipment' in models,
+            'classifier': 'classifier' in models,
+            'breakdown': 'budget_profiles' in models
         }
         
         all_ready = all(models_exist.values())
         
-        # Load metadata if available
-        metadata = None
-        if os.path.exists(METADATA_PATH):
-            try:
-                metadata = joblib.load(METADATA_PATH)
-            except:
-                metadata = None
+        metadata = models.get('metadata')
         
         # Get training data count
         try:
@@ -1284,6 +1174,9 @@ def model_status():
             'ready': all_ready,
             'models': models_exist,
             'metadata': metadata,
+            'registry': model_registry.status(),
+            'training_cache': training_set.stats(),
+            'prediction_cache': prediction_cache.stats(),
             'training_samples': training_samples,
             'needs_training': training_samples >= 5 and not all_ready
         })
@@ -1298,34 +1191,80 @@ def quick_estimate():
     Only requires event type (and optionally attendees).
     """
     try:
-        data = request.json
-        event_type = data.get('eventType', 'Academic')
-        attendees = int(data.get('attendees', 100)) if data.get('attendees') else 100
-        
-        type_mapping = {'Academic': 0, 'Sports': 1, 'Cultural': 2, 'Workshop': 3, 'Seminar': 4}
-        event_type_encoded = type_mapping.get(event_type, 0)
-        
-        # Try using trained model first
-        if os.path.exists(BUDGET_MODEL_PATH):
-            budget_model = joblib.load(BUDGET_MODEL_PATH)
-            estimated = budget_model.predict([[event_type_encoded, attendees]])[0]
-            estimated_budget = max(1000, int(estimated))
-            using_model = True
+        return jsonify(estimate_budgets([request.json])[0])
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@ml_bp.route('/quick-estimate/batch', methods=['POST'])
+def quick_estimate_batch():
+    """
+    Budget estimates for many events: {"events": [{"eventType", "attendees"}, ...]}.
+    The budget model runs once on the stacked feature matrix.
+    """
+    try:
+        events = _batch_items('events')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        results = estimate_budgets(events)
+        return jsonify({'success': True, 'count': len(results), 'results': results})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+def estimate_budgets(events):
+    """quick-estimate results for a list of payloads (per-item errors, input order)"""
+    type_mapping = {'Academic': 0, 'Sports': 1, 'Cultural': 2, 'Workshop': 3, 'Seminar': 4}
+    base_rates = {'Academic': 150, 'Sports': 200, 'Cultural': 300, 'Workshop': 180, 'Seminar': 160}
+
+    # Try using trained model first
+    budget_model = model_registry.get('budget')
+    generation = (model_registry.version, budget_model is not None)
+
+    results = [None] * len(events)
+    features = []
+    rows = []
+    pending = {}  # cache key -> positions sharing it
+    for i, data in enumerate(events):
+        try:
+            if not isinstance(data, dict):
+                raise ValueError('Each event must be an object')
+            event_type = data.get('eventType') or 'Academic'
+            if not isinstance(event_type, str):
+                raise ValueError('eventType must be a string')
+            attendees = int(data.get('attendees', 100)) if data.get('attendees') else 100
+        except (TypeError, ValueError) as e:
+            results[i] = {'success': False, 'error': str(e)}
+            continue
+        key = ('quick-estimate', event_type, attendees)
+        if key in pending:
+            pending[key].append(i)
+            continue
+        results[i] = prediction_cache.get(key, generation)
+        if results[i] is not None:
+            continue
+        pending[key] = [i]
+        features.append([type_mapping.get(event_type, 0), attendees])
+        rows.append((key, event_type, attendees))
+
+    estimates = budget_model.predict(np.array(features)) if budget_model is not None and features else None
+
+    for n, (key, event_type, attendees) in enumerate(rows):
+        if estimates is not None:
+            estimated_budget = max(1000, int(estimates[n]))
         else:
             # Fallback to simple calculation
-            base_rates = {'Academic': 150, 'Sports': 200, 'Cultural': 300, 'Workshop': 180, 'Seminar': 160}
-            rate = base_rates.get(event_type, 150)
-            estimated_budget = attendees * rate
-            using_model = False
-        
-        return jsonify({
+            estimated_budget = attendees * base_rates.get(event_type, 150)
+        result = {
             'success': True,
             'estimatedBudget': estimated_budget,
-            'usingModel': using_model
-        })
-    
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+            'usingModel': estimates is not None
+        }
+        prediction_cache.put(key, generation, result)
+        for i in pending[key]:
+            results[i] = result
+    return results
 
 @ml_bp.route('/suggest-reschedule', methods=['POST'])
 def suggest_reschedule():
@@ -6,6 +6,7 @@ Handles in-system notifications for equipment adjustments and other events
 from flask import Blueprint, jsonify, request, session
 from database.db import get_db
 from backend.auth import require_role
+from backend.response_cache import version_etag, not_modified, conditional_json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,6 +40,27 @@ def get_notifications():
         if filter_read:
             where_clause += " AND n.is_read = 0"
         
+        # Get total count and unread count. Together with the newest id they
+        # change on every insert, delete or mark-read for this user, so they
+        # double as the change token for the ETag (index-only on user_id, is_read)
+        count_query = f"""
+            SELECT 
+                COUNT(*) as total,
+                SUM(CASE WHEN is_read = 0 THEN 1 ELSE 0 END) as unread,
+                MAX(id) as last_id
+            FROM notifications
+            WHERE user_id = %s
+        """
+        counts = db.execute_one(count_query, (user_id,))
+
+        # Joined event names/dates come from events
+        etag = version_etag(
+            db, ('notifications', user_id, page, per_page, filter_read), ('events',),
+            token=(counts['total'], counts['unread'], counts['last_id']))
+        unchanged = not_modified(etag)
+        if unchanged is not None:
+            return unchanged
+        
         # Get notifications with event details
         query = f"""
             SELECT 
@@ -61,16 +83,6 @@ def get_notifications():
         
         notifications = db.execute_query(query, tuple(params))
         
-        # Get total count and unread count
-        count_query = f"""
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN is_read = 0 THEN 1 ELSE 0 END) as unread
-            FROM notifications
-            WHERE user_id = %s
-        """
-        counts = db.execute_one(count_query, (user_id,))
-        
         # Format notifications
         formatted_notifications = []
         for notif in notifications:
@@ -78,22 +90,22 @@ def get_notifications():
                 'id': notif['id'],
                 'eventId': notif['event_id'],
                 'eventName': notif['event_name'],
-                'eventDate': notif['event_date'].isoformat() if notif.get('event_date') else None,
+                'eventDate': notif['event_date'],
                 'type': notif['type'],
                 'title': notif['title'],
                 'message': notif['message'],
                 'isRead': bool(notif['is_read']),
-                'createdAt': notif['created_at'].isoformat()
+                'createdAt': notif['created_at']
             })
         
-        return jsonify({
+        return conditional_json({
             'success': True,
             'notifications': formatted_notifications,
             'total': counts['total'],
             'unread': counts['unread'],
             'page': page,
             'perPage': per_page
-        })
+        }, etag)
         
     except Exception as e:
         logger.error(f"Get notifications error: {str(e)}")
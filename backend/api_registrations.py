@@ -5,7 +5,7 @@
 
 from flask import Blueprint, request, jsonify, session
 from backend.auth import require_role
-from database.db import get_db
+from database.db import get_db, request_scoped
 from datetime import datetime
 import logging
 
@@ -21,6 +21,7 @@ registration_bp = Blueprint('registration', __name__, url_prefix='/api/registrat
 
 @registration_bp.route('/register/<int:event_id>', methods=['POST'])
 @require_role(['Participant', 'Student', 'Student Organization Officer'])
+@request_scoped
 def register_for_event(event_id):
     """
     Register current user for an event
@@ -189,12 +190,6 @@ def get_my_registrations():
 
         registrations = db.execute_query(query, (session['user_id'],))
 
-        # Format the results
-        for reg in registrations:
-            reg['start_datetime'] = reg['start_datetime'].isoformat() if reg['start_datetime'] else None
-            reg['end_datetime'] = reg['end_datetime'].isoformat() if reg['end_datetime'] else None
-            reg['registration_date'] = reg['registration_date'].isoformat() if reg['registration_date'] else None
-
         return jsonify({
             'success': True,
             'registrations': registrations
@@ -230,7 +225,7 @@ def check_registration_status(event_id):
         return jsonify({
             'registered': True,
             'status': registration['registration_status'],
-            'registration_date': registration['registration_date'].isoformat() if registration['registration_date'] else None
+            'registration_date': registration['registration_date']
         }), 200
 
     except Exception as e:
@@ -6,6 +6,11 @@
 from flask import Blueprint, request, jsonify, session
 from backend.auth import require_role
 from database.db import get_db
+from backend.venue_index import find_overlapping_events
+from backend.event_details import event_details
+from backend.response_cache import (
+    response_cache, student_course, venue_name, version_etag, not_modified, conditional_json
+)
 from datetime import datetime, timedelta
 import json
 import logging
@@ -72,40 +77,10 @@ def get_equipment():
         
         equipment_list = db.execute_query(equipment_query)
         
-        # Then, get all approved/ongoing events with equipment JSON
-        events_with_equipment = db.execute_query("""
-            SELECT id, name, equipment
-            FROM events
-            WHERE status IN ('Approved', 'Ongoing') 
-            AND deleted_at IS NULL
-            AND equipment IS NOT NULL
-            AND equipment != ''
-            AND equipment != 'null'
-        """)
-        
-        # Calculate in_use for each equipment item
-        import json
-        equipment_usage = {}  # {equipment_name: {'quantity': X, 'events': [...]}}
-        
-        for event in events_with_equipment:
-            try:
-                if event['equipment']:
-                    equipment_data = json.loads(event['equipment'])
-                    if isinstance(equipment_data, list):
-                        for item in equipment_data:
-                            if isinstance(item, dict) and 'name' in item and 'quantity' in item:
-                                eq_name = item['name']
-                                qty = int(item.get('approved_quantity', item.get('quantity', 0)))
-                                
-                                if eq_name not in equipment_usage:
-                                    equipment_usage[eq_name] = {'quantity': 0, 'events': []}
-                                
-                                equipment_usage[eq_name]['quantity'] += qty
-                                if event['name'] not in equipment_usage[eq_name]['events']:
-                                    equipment_usage[eq_name]['events'].append(event['name'])
-            except (json.JSONDecodeError, ValueError, TypeError) as e:
-                logger.error(f"Error parsing equipment JSON for event {event.get('id')}: {e}")
-                continue
+        # Then, in_use per equipment item across approved/ongoing events
+        # {equipment_name: {'quantity': X, 'events': [...]}}, from event_equipment
+        # (JSON column for events not synced yet)
+        equipment_usage = event_details.equipment_usage(db, ('Approved', 'Ongoing'))
         
         # Process the results to match frontend expectations
         equipment = []
@@ -579,12 +554,13 @@ def get_venue_calendar():
             # STRICT FILTERING for Admins
             # See: Own Dept Events OR Shared OR Approved/Ongoing/Completed from others
             dept_filter = user_department if user_department else 'Unassigned'
-            query += """ AND (
+            shared_sql, shared_params = event_details.shared_with_condition(db, dept_filter)
+            query += f""" AND (
                 e.organizing_department = %s 
-                OR %s = ANY(e.shared_with_departments)
+                OR {shared_sql}
                 OR e.status IN ('Approved', 'Ongoing', 'Completed')
             )"""
-            params.extend([dept_filter, dept_filter])
+            params.extend([dept_filter, *shared_params])
             
         elif user_role == 'Requestor':
             # Requestor sees only own events
@@ -593,13 +569,11 @@ def get_venue_calendar():
             
         elif user_role == 'Participant':
             # Participant sees Dept + Shared
-            student = db.execute_one(
-                "SELECT course FROM students WHERE user_id = %s", (user_id,)
-            )
-            if student and student.get('course'):
-                student_dept = student['course']
-                query += " AND (e.organizing_department = %s OR %s = ANY(e.shared_with_departments))"
-                params.extend([student_dept, student_dept])
+            student_dept = student_course(db, user_id)
+            if student_dept:
+                shared_sql, shared_params = event_details.shared_with_condition(db, student_dept)
+                query += f" AND (e.organizing_department = %s OR {shared_sql})"
+                params.extend([student_dept, *shared_params])
             else:
                  query += " AND e.status = 'Approved'"
 
@@ -611,68 +585,70 @@ def get_venue_calendar():
         # Filter by venue if provided
         if venue_filter:
             # Find venue name from ID using DB
-            venue_row = db.execute_one("SELECT name FROM venues WHERE id = %s", (venue_filter,))
-            venue_name = venue_row['name'] if venue_row else None
-            if venue_name:
+            filter_venue = venue_name(db, venue_filter)
+            if filter_venue:
                 query += " AND e.venue = %s"
-                params.append(venue_name)
+                params.append(filter_venue)
         
         query += " ORDER BY e.start_datetime ASC"
         
-        events = db.execute_query(query, tuple(params))
-        
-        # Format for frontend
-        calendar_events = []
-        for event in events:
-            # Determine color based on status
-            color_class = 'bg-gray-100 text-gray-600 border-gray-200' # Default for Draft
-            if event['status'] == 'Approved':
-                color_class = 'bg-green-100 text-green-800 border-green-200'
-            elif event['status'] == 'Pending':
-                color_class = 'bg-yellow-100 text-yellow-800 border-yellow-200'
-            elif event['status'] == 'Under Review':
-                color_class = 'bg-purple-100 text-purple-800 border-purple-200'
-            elif event['status'] == 'Draft':
-                color_class = 'bg-slate-100 text-slate-600 border-slate-200 border-dashed'
-                
-            calendar_events.append({
-                'id': event['id'],
-                'title': event['name'],
-                'start': event['start_datetime'].isoformat(),
-                'end': event['end_datetime'].isoformat(),
-                'venue': event['venue'],
-                'status': event['status'],
-                'organizer': f"{event['first_name']} {event['last_name']}",
-                'colorClass': color_class
-            })
-            
-        return jsonify({'success': True, 'events': calendar_events})
+        # Role/department filter, month and venue are all in the SQL text and params
+        cache_key = ('calendar', query, tuple(params))
+        etag = version_etag(db, cache_key, ('events', 'users', 'event_details_synced'))
+        unchanged = not_modified(etag)
+        if unchanged is not None:
+            return unchanged
+
+        def build():
+            events = db.execute_query(query, tuple(params))
+
+            # Format for frontend
+            calendar_events = []
+            for event in events:
+                # Determine color based on status
+                color_class = 'bg-gray-100 text-gray-600 border-gray-200' # Default for Draft
+                if event['status'] == 'Approved':
+                    color_class = 'bg-green-100 text-green-800 border-green-200'
+                elif event['status'] == 'Pending':
+                    color_class = 'bg-yellow-100 text-yellow-800 border-yellow-200'
+                elif event['status'] == 'Under Review':
+                    color_class = 'bg-purple-100 text-purple-800 border-purple-200'
+                elif event['status'] == 'Draft':
+                    color_class = 'bg-slate-100 text-slate-600 border-slate-200 border-dashed'
+
+                calendar_events.append({
+                    'id': event['id'],
+                    'title': event['name'],
+                    'start': event['start_datetime'],
+                    'end': event['end_datetime'],
+                    'venue': event['venue'],
+                    'status': event['status'],
+                    'organizer': f"{event['first_name']} {event['last_name']}",
+                    'colorClass': color_class
+                })
+            return calendar_events
+
+        calendar_events = response_cache.get_or_build(db, cache_key, ('events', 'users', 'event_details_synced'), build)
+
+        return conditional_json({'success': True, 'events': calendar_events}, etag)
         
     except Exception as e:
         logger.error(f"Calendar error: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 def get_venue_conflicts(db, venue, start_str, end_str, exclude_event_id=None):
-    """Helper to check for venue conflicts"""
-    query = """
-        SELECT id, name, start_datetime, end_datetime, status 
-        FROM events 
-        WHERE venue = %s 
-        AND status IN ('Approved', 'Pending', 'Under Review')
-        AND deleted_at IS NULL
-        AND (
-            (start_datetime <= %s AND end_datetime > %s) OR
-            (start_datetime < %s AND end_datetime >= %s) OR
-            (start_datetime >= %s AND end_datetime <= %s)
-        )
-    """
-    params = [venue, end_str, start_str, end_str, start_str, start_str, end_str]
-    
-    if exclude_event_id:
-        query += " AND id != %s"
-        params.append(exclude_event_id)
-        
-    return db.execute_query(query, tuple(params))
+    """Helper to check for venue conflicts (served from the venue interval index when warm)"""
+    rows = find_overlapping_events(
+        db, venue, start_str, end_str,
+        ('Approved', 'Pending', 'Under Review'), exclude_event_id
+    )
+    return [{
+        'id': r['id'],
+        'name': r['name'],
+        'start_datetime': r['start_datetime'],
+        'end_datetime': r['end_datetime'],
+        'status': r['status']
+    } for r in rows]
 
 @venues_bp.route('/check-conflicts', methods=['POST'])
 def check_conflicts():
@@ -747,21 +723,11 @@ def get_equipment_requests():
         equipment_rows = db.execute_query(equipment_query)
         equipment_map = {row['name']: {'total': row['total_quantity'], 'category': row['category']} for row in equipment_rows}
         
-        # 3. Calculate current usage across all approved/ongoing events
-        import json
-        usage_map = {}
-        for row in rows:
-            if row['event_status'] in ['Approved', 'Ongoing'] and row['equipment']:
-                try:
-                    equipment_list = json.loads(row['equipment']) if isinstance(row['equipment'], str) else row['equipment']
-                    if isinstance(equipment_list, list):
-                        for item in equipment_list:
-                            name = item.get('name')
-                            qty = item.get('quantity', 1)
-                            if name:
-                                usage_map[name] = usage_map.get(name, 0) + qty
-                except (json.JSONDecodeError, TypeError):
-                    pass
+        # 3. Calculate current usage (requested quantities) across all approved events
+        usage_map = {
+            name: usage['quantity']
+            for name, usage in event_details.equipment_usage(db, ('Approved',), approved=False).items()
+        }
         
         # 4. Build response with events and their equipment
         events_list = []
@@ -968,6 +934,7 @@ def update_request_status(event_id):
                         "UPDATE events SET equipment = %s WHERE id = %s",
                         (json.dumps(equipment_list_payload), event_id)
                     )
+                    event_details.sync_event(db, event_id)
                     
                     # Determine overall status
                     # If all items are Rejected -> Rejected
@@ -1064,6 +1031,7 @@ def update_request_status(event_id):
                                 "UPDATE events SET equipment = %s WHERE id = %s",
                                 (json.dumps(equipment_list), event_id)
                             )
+                            event_details.sync_event(db, event_id)
                     except Exception as e:
                         logger.error(f"Item rejection error: {e}")
                         return jsonify({'success': False, 'error': 'Failed to reject item'}), 500
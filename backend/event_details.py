@@ -0,0 +1,314 @@
+# ============================================================================
+# EVENT DETAIL TABLES
+# Indexed copies of the events JSON columns
+# ============================================================================
+#
+# events.equipment, timeline, budget_breakdown and shared_with_departments
+# stay the source of truth (the API returns them as stored). Every write to
+# them calls sync_event(), which rewrites the event's rows in event_equipment,
+# event_activities, budget_breakdown and event_shared_departments and marks
+# the event in event_details_synced, all in one transaction
+# (migrations/normalize_event_details.sql).
+#
+# Readers are dual-path: synced events are answered from the side tables,
+# events without a marker (written before the migration, or by a worker
+# running older code, or whose last sync failed) from their JSON.
+# `flask backfill-event-details` syncs the rest (--all resyncs every event).
+# additional_resources has no reader that aggregates it and stays JSON-only.
+# Without the migration everything reads JSON as before.
+
+import json
+import logging
+
+from database.db import build_multi_insert
+
+logger = logging.getLogger(__name__)
+
+_ER_NO_SUCH_TABLE = 1146
+
+# Side tables rewritten per event (the marker goes last)
+_DETAIL_TABLES = ('event_equipment', 'event_activities', 'budget_breakdown', 'event_shared_departments')
+
+_EQUIPMENT_COLUMNS = ('event_id', 'equipment_name', 'quantity', 'approved_quantity', 'item_status', 'sequence_order')
+_ACTIVITY_COLUMNS = ('event_id', 'activity_name', 'start_time', 'end_time', 'sequence_order')
+_BUDGET_COLUMNS = ('event_id', 'category', 'amount', 'percentage')
+_SHARED_COLUMNS = ('event_id', 'department')
+
+_MARK_SYNCED_SQL = """
+    INSERT INTO event_details_synced (event_id, synced_at) VALUES (%s, NOW())
+    ON DUPLICATE KEY UPDATE synced_at = NOW()
+"""
+
+
+# ----------------------------------------------------------------------------
+# JSON column parsing (shared by the sync and the JSON read path)
+# ----------------------------------------------------------------------------
+
+def _load(value):
+    if isinstance(value, (str, bytes)):
+        try:
+            return json.loads(value) if value else None
+        except ValueError:
+            return None
+    return value
+
+
+def _to_int(value, default=None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def equipment_items(value):
+    """events.equipment as [{'name', 'quantity', 'approved_quantity', 'status'}]"""
+    data = _load(value)
+    items = []
+    for item in data if isinstance(data, list) else []:
+        if isinstance(item, str):
+            item = {'name': item}
+        if not isinstance(item, dict) or not item.get('name'):
+            continue
+        items.append({
+            'name': str(item['name'])[:200],
+            'quantity': _to_int(item.get('quantity'), 1),
+            'approved_quantity': _to_int(item.get('approved_quantity')),
+            'status': str(item['status'])[:30] if item.get('status') else None,
+        })
+    return items
+
+
+def _activity_items(value):
+    data = _load(value)
+    items = []
+    for item in data if isinstance(data, list) else []:
+        if isinstance(item, str):
+            item = {'phase': item}
+        if not isinstance(item, dict):
+            continue
+        name = item.get('phase') or item.get('activity_name') or item.get('name') or item.get('title')
+        if not name:
+            continue
+        start, end = item.get('startTime'), item.get('endTime')
+        items.append((str(name)[:500], str(start)[:20] if start else None, str(end)[:20] if end else None))
+    return items
+
+
+def _budget_items(value):
+    # {category: {amount, percentage}} / {category: amount} / [{name|category, amount, percentage}]
+    data = _load(value)
+    if isinstance(data, dict):
+        entries = [(category, details) for category, details in data.items()]
+    elif isinstance(data, list):
+        entries = [(d.get('category') or d.get('name'), d) for d in data if isinstance(d, dict)]
+    else:
+        entries = []
+
+    merged = {}   # one row per category (unique_event_category)
+    for category, details in entries:
+        if isinstance(details, dict):
+            amount, percentage = _to_float(details.get('amount')), _to_float(details.get('percentage'))
+        else:
+            amount, percentage = _to_float(details), 0.0
+        category = str(category or '').strip()[:100]
+        if not category and not amount:
+            continue
+        total = merged.setdefault(category, [0.0, 0.0])
+        total[0] += amount
+        total[1] += percentage
+    return [(category, round(amount, 2), round(percentage, 2)) for category, (amount, percentage) in merged.items()]
+
+
+def _shared_items(value):
+    data = _load(value)
+    departments, seen = [], set()
+    for department in data if isinstance(data, list) else []:
+        department = str(department or '').strip()[:100]
+        # The primary key compares case-insensitively
+        if department and department.lower() not in seen:
+            seen.add(department.lower())
+            departments.append(department)
+    return departments
+
+
+def detail_rows(event_id, event):
+    """(table, columns, rows) for every side table, from an events row"""
+    return (
+        ('event_equipment', _EQUIPMENT_COLUMNS, [
+            (event_id, item['name'], item['quantity'], item['approved_quantity'], item['status'], idx)
+            for idx, item in enumerate(equipment_items(event.get('equipment')))
+        ]),
+        ('event_activities', _ACTIVITY_COLUMNS, [
+            (event_id, name, start, end, idx)
+            for idx, (name, start, end) in enumerate(_activity_items(event.get('timeline')))
+        ]),
+        ('budget_breakdown', _BUDGET_COLUMNS, [
+            (event_id, category, amount, percentage)
+            for category, amount, percentage in _budget_items(event.get('budget_breakdown'))
+        ]),
+        ('event_shared_departments', _SHARED_COLUMNS, [
+            (event_id, department) for department in _shared_items(event.get('shared_with_departments'))
+        ]),
+    )
+
+
+# ----------------------------------------------------------------------------
+# Sync
+# ----------------------------------------------------------------------------
+
+class EventDetails:
+    """Keeps the side tables in step with events and builds the dual-path reads"""
+
+    def __init__(self):
+        self._available = None   # unknown until probed; False when the migration is missing
+        self._stats = {'synced': 0, 'sync_errors': 0, 'backfilled': 0}
+
+    def available(self, db):
+        if self._available is None:
+            try:
+                db.execute_one("SELECT event_id FROM event_details_synced LIMIT 1")
+                self._available = True
+            except Exception as e:
+                if getattr(e, 'errno', None) != _ER_NO_SUCH_TABLE:
+                    # Unknown state; read JSON for this call and probe again next time
+                    logger.warning(f"Event detail tables probe failed: {e}")
+                    return False
+                logger.warning("Event detail tables missing, reading events JSON columns; "
+                               "apply migrations/normalize_event_details.sql to enable them")
+                self._available = False
+        return self._available
+
+    def sync_event(self, db, event_id):
+        """Rewrite one event's side tables from its JSON columns after a write"""
+        if not self.available(db):
+            return False
+        try:
+            event = db.execute_one("""
+                SELECT equipment, timeline, budget_breakdown, shared_with_departments
+                FROM events WHERE id = %s
+            """, (event_id,))
+            with db.get_transaction() as cursor:
+                for table in _DETAIL_TABLES:
+                    cursor.execute(f"DELETE FROM {table} WHERE event_id = %s", (event_id,))
+                if event is None:
+                    # Hard delete
+                    cursor.execute("DELETE FROM event_details_synced WHERE event_id = %s", (event_id,))
+                else:
+                    for table, columns, rows in detail_rows(event_id, event):
+                        if rows:
+                            query, params = build_multi_insert(table, columns, rows)
+                            cursor.execute(db.fix_sql(query), params)
+                    cursor.execute(_MARK_SYNCED_SQL, (event_id,))
+            self._stats['synced'] += 1
+            return True
+        except Exception as e:
+            # Rolled back, so the side tables still hold the previous JSON.
+            # Drop the marker on its own so readers use the JSON columns until
+            # the next write or backfill resyncs the event.
+            self._stats['sync_errors'] += 1
+            logger.error(f"Event detail sync failed for event {event_id}: {e}")
+            try:
+                db.execute_update("DELETE FROM event_details_synced WHERE event_id = %s", (event_id,))
+            except Exception as e:
+                logger.error(f"Event {event_id} side tables may be stale, run "
+                             f"`flask backfill-event-details --all`: {e}")
+            return False
+
+    def backfill(self, db, resync=False):
+        """
+        Sync every event that has no marker yet, or every event when resync
+        is set. Returns the number synced.
+        """
+        if not self.available(db):
+            return 0
+        if resync:
+            rows = db.execute_query("SELECT id FROM events ORDER BY id")
+        else:
+            rows = db.execute_query("""
+                SELECT e.id FROM events e
+                LEFT JOIN event_details_synced ds ON ds.event_id = e.id
+                WHERE ds.event_id IS NULL
+                ORDER BY e.id
+            """)
+        count = sum(1 for row in rows if self.sync_event(db, row['id']))
+        self._stats['backfilled'] += count
+        return count
+
+    # ------------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------------
+
+    def shared_with_condition(self, db, department, alias='e'):
+        """
+        (sql, params) for "event alias is shared with department": an indexed
+        lookup for synced events, JSON_CONTAINS for the rest.
+        """
+        if not self.available(db):
+            return f"JSON_CONTAINS({alias}.shared_with_departments, JSON_QUOTE(%s))", [department]
+        return f"""(
+            {alias}.id IN (SELECT sd.event_id FROM event_shared_departments sd WHERE sd.department = %s)
+            OR (
+                NOT EXISTS (SELECT 1 FROM event_details_synced ds WHERE ds.event_id = {alias}.id)
+                AND JSON_CONTAINS({alias}.shared_with_departments, JSON_QUOTE(%s))
+            )
+        )""", [department, department]
+
+    def equipment_usage(self, db, statuses, approved=True):
+        """
+        {equipment name: {'quantity': n, 'events': [event names]}} summed over
+        live events in statuses. approved=True counts an item's
+        approved_quantity where one is set, otherwise the requested quantity.
+        """
+        usage = {}
+
+        def add(name, event_name, quantity):
+            entry = usage.setdefault(name, {'quantity': 0, 'events': []})
+            entry['quantity'] += quantity
+            if event_name not in entry['events']:
+                entry['events'].append(event_name)
+
+        placeholders = ', '.join(['%s'] * len(statuses))
+        unsynced = ''
+        if self.available(db):
+            quantity = 'COALESCE(ee.approved_quantity, ee.quantity)' if approved else 'ee.quantity'
+            rows = db.execute_query(f"""
+                SELECT ee.equipment_name, e.name AS event_name, SUM({quantity}) AS quantity
+                FROM events e
+                JOIN event_details_synced ds ON ds.event_id = e.id
+                JOIN event_equipment ee ON ee.event_id = e.id
+                WHERE e.status IN ({placeholders}) AND e.deleted_at IS NULL
+                GROUP BY ee.equipment_name, e.id, e.name
+                ORDER BY e.id
+            """, tuple(statuses))
+            for row in rows:
+                add(row['equipment_name'], row['event_name'], int(row['quantity'] or 0))
+            unsynced = "AND NOT EXISTS (SELECT 1 FROM event_details_synced ds WHERE ds.event_id = e.id)"
+
+        rows = db.execute_query(f"""
+            SELECT e.id, e.name, e.equipment
+            FROM events e
+            WHERE e.status IN ({placeholders}) AND e.deleted_at IS NULL
+            AND e.equipment IS NOT NULL AND e.equipment != '' AND e.equipment != 'null'
+            {unsynced}
+        """, tuple(statuses))
+        for row in rows:
+            for item in equipment_items(row['equipment']):
+                quantity = item['quantity']
+                if approved and item['approved_quantity'] is not None:
+                    quantity = item['approved_quantity']
+                add(item['name'], row['name'], quantity)
+        return usage
+
+    def stats(self):
+        return dict(self._stats, available=self._available)
+
+
+# Process-wide instance
+event_details = EventDetails()
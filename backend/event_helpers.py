@@ -4,8 +4,11 @@
 # ============================================================================
 
 from datetime import datetime, timedelta, time as time_type
+from bisect import bisect_left
 import logging
 
+from database.db import build_multi_insert, DEFAULT_INSERT_CHUNK_SIZE
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,10 +51,70 @@ def validate_equipment_availability(equipment_list):
     return True, "All equipment available"
 
 
-def suggest_alternative_times(db, venue, requested_start, requested_end, exclude_event_id=None):
+# Free-slot search defaults for suggest_alternative_times
+ALTERNATIVE_SLOT_HOURS = (8, 13, 18)   # Common time blocks: 8AM, 1PM, 6PM
+ALTERNATIVE_HORIZON_DAYS = 14          # Search next 2 weeks
+ALTERNATIVE_MAX_RESULTS = 5
+BLOCKING_STATUSES = ('Approved', 'Pending', 'Under Review')
+
+
+def merge_busy_intervals(bookings):
+    """Collapse bookings into sorted, disjoint (start, end) busy blocks"""
+    merged = []
+    for booking in sorted(bookings, key=lambda b: b['start_datetime']):
+        start, end = booking['start_datetime'], booking['end_datetime']
+        if merged and start < merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def find_free_slots(db, venue, window_start, window_end, duration, slot_hours=ALTERNATIVE_SLOT_HOURS,
+                    exclude_event_id=None, max_results=ALTERNATIVE_MAX_RESULTS, not_before=None):
+    """
+    Free [start, start + duration) slots at venue on a daily grid of slot_hours.
+    Loads every booking in the window with ONE lookup, then sweeps the merged
+    busy timeline in memory. Slots are returned earliest first.
+    """
+    first_day = window_start.date()
+    days = (window_end.date() - first_day).days + 1
+    candidates = [
+        datetime.combine(first_day + timedelta(days=d), time_type(hour, 0))
+        for d in range(days) for hour in sorted(slot_hours)
+    ]
+    candidates = [c for c in candidates if window_start <= c and (not_before is None or c >= not_before)]
+    if not candidates:
+        return []
+
+    from backend.venue_index import find_overlapping_events
+    bookings = find_overlapping_events(
+        db, venue, candidates[0], candidates[-1] + duration, BLOCKING_STATUSES, exclude_event_id
+    )
+    busy = merge_busy_intervals(bookings)
+    busy_starts = [block[0] for block in busy]
+
+    free = []
+    for slot_start in candidates:
+        slot_end = slot_start + duration
+        # Last busy block starting before slot_end must end by slot_start
+        i = bisect_left(busy_starts, slot_end) - 1
+        if i >= 0 and busy[i][1] > slot_start:
+            continue
+        free.append((slot_start, slot_end))
+        if len(free) >= max_results:
+            break
+    return free
+
+
+def suggest_alternative_times(db, venue, requested_start, requested_end, exclude_event_id=None,
+                              slot_hours=ALTERNATIVE_SLOT_HOURS, horizon_days=ALTERNATIVE_HORIZON_DAYS,
+                              duration=None, max_results=ALTERNATIVE_MAX_RESULTS):
     """
     Find next available time slots for the same venue.
-    Simple algorithm: tries common time blocks over next 2 weeks.
+    Simple algorithm: tries common time blocks over next 2 weeks
+    (one bookings query for the whole window, see find_free_slots).
     
     Args:
         db: Database connection
@@ -59,50 +122,30 @@ def suggest_alternative_times(db, venue, requested_start, requested_end, exclude
         requested_start: Requested start datetime
         requested_end: Requested end datetime
         exclude_event_id: Event ID to exclude from conflict checking
+        slot_hours: Start hours tried each day
+        horizon_days: Number of days searched from the requested date
+        duration: Slot length (timedelta), defaults to the requested duration
+        max_results: Maximum number of alternatives
     
     Returns:
-        list: Array of up to 5 alternative slot dictionaries
+        list: Array of up to max_results alternative slot dictionaries
     """
-    from backend.api_venues import get_venue_conflicts
-    
-    duration_seconds = (requested_end - requested_start).total_seconds()
-    alternatives = []
-    search_date = requested_start.date()
+    duration = duration or (requested_end - requested_start)
+    search_start = datetime.combine(requested_start.date(), time_type(0, 0))
+    search_end = search_start + timedelta(days=horizon_days - 1)
     
-    # Search next 14 days
-    for day_offset in range(14):
-        current_date = search_date + timedelta(days=day_offset)
-        
-        # Try common time slots: 8AM, 1PM, 6PM
-        for start_hour in [8, 13, 18]:
-            slot_start = datetime.combine(current_date, time_type(start_hour, 0))
-            slot_end = slot_start + timedelta(seconds=duration_seconds)
-            
-            # Skip if in the past
-            if slot_start < datetime.now():
-                continue
-            
-            # Check existing conflicts
-            conflicts = get_venue_conflicts(
-                db, venue,
-                slot_start.strftime('%Y-%m-%d %H:%M:%S'),
-                slot_end.strftime('%Y-%m-%d %H:%M:%S'),
-                exclude_event_id
-            )
-            
-            if not conflicts:
-                alternatives.append({
-                    'start': slot_start.strftime('%Y-%m-%d %H:%M'),
-                    'end': slot_end.strftime('%Y-%m-%d %H:%M'),
-                    'day': slot_start.strftime('%A, %B %d'),
-                    'time_display': f"{slot_start.strftime('%I:%M %p')} - {slot_end.strftime('%I:%M %p')}"
-                })
-            
-            # Return first 5 alternatives
-            if len(alternatives) >= 5:
-                return alternatives
+    slots = find_free_slots(
+        db, venue, search_start, search_end, duration, slot_hours,
+        exclude_event_id, max_results,
+        not_before=datetime.now()  # Skip if in the past
+    )
     
-    return alternatives
+    return [{
+        'start': slot_start.strftime('%Y-%m-%d %H:%M'),
+        'end': slot_end.strftime('%Y-%m-%d %H:%M'),
+        'day': slot_start.strftime('%A, %B %d'),
+        'time_display': f"{slot_start.strftime('%I:%M %p')} - {slot_end.strftime('%I:%M %p')}"
+    } for slot_start, slot_end in slots]
 
 
 def validate_event_booking(db, venue, start_datetime, end_datetime, exclude_event_id=None):
@@ -125,24 +168,19 @@ def validate_event_booking(db, venue, start_datetime, end_datetime, exclude_even
             'alternatives': list
         }
     """
-    start_str = start_datetime.strftime('%Y-%m-%d %H:%M:%S')
-    end_str = end_datetime.strftime('%Y-%m-%d %H:%M:%S')
-    exclude_id = exclude_event_id or 0
+    from backend.venue_index import find_overlapping_events
     
     # Hard conflicts: Already approved/under review events (blocks submission)
-    hard_conflicts = db.execute_query("""
-        SELECT id, name as event_name, start_datetime, end_datetime, status, requestor_id as created_by
-        FROM events 
-        WHERE venue = %s 
-        AND status IN ('Approved', 'Under Review')
-        AND id != %s
-        AND (
-            (start_datetime < %s AND end_datetime > %s) OR
-            (start_datetime < %s AND end_datetime >= %s) OR
-            (start_datetime >= %s AND start_datetime < %s)
-        )
-        AND deleted_at IS NULL
-    """, (venue, exclude_id, end_str, start_str, end_str, end_str, start_str, end_str))
+    hard_conflicts = [{
+        'id': r['id'],
+        'event_name': r['name'],
+        'start_datetime': r['start_datetime'],
+        'end_datetime': r['end_datetime'],
+        'status': r['status'],
+        'created_by': r['requestor_id']
+    } for r in find_overlapping_events(
+        db, venue, start_datetime, end_datetime, ('Approved', 'Under Review'), exclude_event_id
+    )]
     
     if hard_conflicts:
         alternatives = suggest_alternative_times(db, venue, start_datetime, end_datetime, exclude_event_id)
@@ -155,19 +193,16 @@ def validate_event_booking(db, venue, start_datetime, end_datetime, exclude_even
         }
     
     # Soft conflicts: Pending requests (allows submission with warning)
-    soft_conflicts = db.execute_query("""
-        SELECT id, name as event_name, start_datetime, end_datetime, requestor_id as created_by, created_at
-        FROM events 
-        WHERE venue = %s 
-        AND status = 'Pending'
-        AND id != %s
-        AND (
-            (start_datetime < %s AND end_datetime > %s) OR
-            (start_datetime < %s AND end_datetime >= %s) OR
-            (start_datetime >= %s AND start_datetime < %s)
-        )
-        AND deleted_at IS NULL
-    """, (venue, exclude_id, end_str, start_str, end_str, end_str, start_str, end_str))
+    soft_conflicts = [{
+        'id': r['id'],
+        'event_name': r['name'],
+        'start_datetime': r['start_datetime'],
+        'end_datetime': r['end_datetime'],
+        'created_by': r['requestor_id'],
+        'created_at': r['created_at']
+    } for r in find_overlapping_events(
+        db, venue, start_datetime, end_datetime, ('Pending',), exclude_event_id
+    )]
     
     if soft_conflicts:
         alternatives = suggest_alternative_times(db, venue, start_datetime, end_datetime, exclude_event_id)
@@ -190,32 +225,48 @@ def validate_event_booking(db, venue, start_datetime, end_datetime, exclude_even
 # EVENT EQUIPMENT/ACTIVITIES/BUDGET HELPERS
 # ============================================================================
 
+def _replace_event_rows(db, table, event_id, columns, rows):
+    """Replace an event's rows in table: DELETE + multi-row INSERTs in one transaction"""
+    with db.get_transaction() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE event_id = %s", (event_id,))
+        for i in range(0, len(rows), DEFAULT_INSERT_CHUNK_SIZE):
+            query, params = build_multi_insert(table, columns, rows[i:i + DEFAULT_INSERT_CHUNK_SIZE])
+            cursor.execute(db.fix_sql(query), params)
+
+
 def save_event_equipment(db, event_id, equipment_list):
     """Save equipment items for an event"""
     if not equipment_list or not isinstance(equipment_list, list):
         return
     
-    # First, clear existing equipment for this event (for updates)
-    db.execute_update("DELETE FROM event_equipment WHERE event_id = %s", (event_id,))
-    
-    # Look up equipment IDs
+    items = []
     for item_name in equipment_list:
         # Handle both string names and objects
         name = item_name['name'] if isinstance(item_name, dict) else item_name
         quantity = item_name['quantity'] if isinstance(item_name, dict) else 1
-        
-        # Find equipment ID (Validation only)
-        equip = db.execute_one("SELECT id FROM equipment WHERE name = %s", (name,))
-        
-        if equip:
+        items.append((name, quantity))
+    
+    # Validate all names against inventory in one query
+    known_names = set()
+    if items:
+        names = list({name for name, _ in items})
+        known = db.execute_query(
+            "SELECT name FROM equipment WHERE name IN ({})".format(', '.join(['%s'] * len(names))),
+            tuple(names)
+        )
+        known_names = {row['name'] for row in known}
+    
+    rows = []
+    for name, quantity in items:
+        if name in known_names:
             # Insert into linking table (using name as per schema)
-            db.execute_insert(
-                "INSERT INTO event_equipment (event_id, equipment_name, quantity) VALUES (%s, %s, %s)", 
-                (event_id, name, quantity)
-            )
+            rows.append((event_id, name, quantity))
         else:
             # Optional: Log warning that equipment was not found
             print(f"Warning: Equipment '{name}' not found in inventory.")
+    
+    # Clears existing equipment for this event (for updates) in the same transaction
+    _replace_event_rows(db, 'event_equipment', event_id, ('event_id', 'equipment_name', 'quantity'), rows)
 
 
 def save_event_activities(db, event_id, activities_list):
@@ -223,14 +274,13 @@ def save_event_activities(db, event_id, activities_list):
     if not activities_list or not isinstance(activities_list, list):
         return
     
-    # First, clear existing activities for this event (for updates)
-    db.execute_update("DELETE FROM event_activities WHERE event_id = %s", (event_id,))
-    
-    query = "INSERT INTO event_activities (event_id, activity_name, sequence_order) VALUES (%s, %s, %s)"
+    rows = []
     for idx, activity in enumerate(activities_list):
         # Handle both string names and objects
         name = activity['activity_name'] if isinstance(activity, dict) else activity
-        db.execute_insert(query, (event_id, name, idx))
+        rows.append((event_id, name, idx))
+    # Clears existing activities for this event (for updates) in the same transaction
+    _replace_event_rows(db, 'event_activities', event_id, ('event_id', 'activity_name', 'sequence_order'), rows)
 
 
 def save_budget_breakdown(db, event_id, breakdown):
@@ -238,20 +288,19 @@ def save_budget_breakdown(db, event_id, breakdown):
     if not breakdown or not isinstance(breakdown, dict):
         return
     
-    # First, clear existing breakdown for this event (for updates)
-    db.execute_update("DELETE FROM budget_breakdown WHERE event_id = %s", (event_id,))
-    
-    query = "INSERT INTO budget_breakdown (event_id, category, amount, percentage) VALUES (%s, %s, %s, %s)"
+    rows = []
     for category, details in breakdown.items():
         # Skip empty categories with no amount
         if not category and details.get('amount', 0) == 0:
             continue
-        db.execute_insert(query, (
+        rows.append((
             event_id,
             category,
             details.get('amount', 0),
             details.get('percentage', 0)
         ))
+    # Clears existing breakdown for this event (for updates) in the same transaction
+    _replace_event_rows(db, 'budget_breakdown', event_id, ('event_id', 'category', 'amount', 'percentage'), rows)
 
 
 def get_event_equipment(db, event_id):
@@ -303,46 +352,44 @@ def auto_complete_past_events(db):
     
     Returns:
         int: Number of events updated
+    Raises:
+        Database errors, after rolling back (the status scheduler records them)
     """
-    try:
-        # Find approved/ongoing events that have ended
-        # end_datetime < NOW()
+    # Find approved/ongoing events that have ended
+    # end_datetime < NOW()
+    
+    # Use a transaction to ensure atomic updates
+    with db.get_transaction() as cursor:
+        # First, find IDs to update
+        cursor.execute("""
+            SELECT id, name, status, requestor_id 
+            FROM events 
+            WHERE status IN ('Approved', 'Ongoing') 
+            AND end_datetime < NOW()
+            AND deleted_at IS NULL
+        """)
+        events_to_complete = cursor.fetchall()
         
-        # Use a transaction to ensure atomic updates
-        with db.get_transaction() as cursor:
-            # First, find IDs to update
-            cursor.execute("""
-                SELECT id, name, status, requestor_id 
-                FROM events 
-                WHERE status IN ('Approved', 'Ongoing') 
-                AND end_datetime < NOW()
-                AND deleted_at IS NULL
-            """)
-            events_to_complete = cursor.fetchall()
+        if not events_to_complete:
+            return 0
             
-            if not events_to_complete:
-                return 0
-                
-            count = 0
-            for event in events_to_complete:
-                # Update status
-                cursor.execute(
-                    "UPDATE events SET status = 'Completed', updated_at = NOW() WHERE id = %s",
-                    (event['id'],)
-                )
-                
-                # Log history
-                cursor.execute(
-                    """INSERT INTO event_status_history (event_id, old_status, new_status, changed_by, reason)
-                       VALUES (%s, %s, 'Completed', NULL, 'Auto-completed (system)')""",
-                    (event['id'], event['status'])
-                )
-                
-                logger.info(f"Auto-completed event {event['id']}: {event['name']}")
-                count += 1
-                
-            return count
+        ids = [event['id'] for event in events_to_complete]
+        
+        # Update status (one statement for all ended events)
+        cursor.execute(
+            "UPDATE events SET status = 'Completed', updated_at = NOW() WHERE id IN ({})".format(
+                ', '.join(['%s'] * len(ids))),
+            tuple(ids)
+        )
+        
+        # Log history (single multi-row INSERT)
+        cursor.executemany(
+            """INSERT INTO event_status_history (event_id, old_status, new_status, changed_by, reason)
+               VALUES (%s, %s, 'Completed', NULL, 'Auto-completed (system)')""",
+            [(event['id'], event['status']) for event in events_to_complete]
+        )
+        
+        for event in events_to_complete:
+            logger.info(f"Auto-completed event {event['id']}: {event['name']}")
             
-    except Exception as e:
-        logger.error(f"Error auto-completing events: {e}")
-        return 0
+        return len(events_to_complete)
@@ -0,0 +1,74 @@
+"""
+JSON Provider
+Replacement for Flask's default JSON provider (installed on the app in
+app.create_app), so jsonify() encodes result rows as the DB returns them:
+
+    datetime / date / time -> ISO 8601 ('2025-03-01T09:00:00', no timezone
+                              for naive values, as isoformat() gives)
+    Decimal                -> float
+    numpy scalars / arrays -> int / float / bool / list (model outputs in api_ml)
+
+orjson does the encoding when it is installed; otherwise the stdlib encoder
+runs with the same conversions, so responses look the same either way.
+Calls that pass json.dumps-style arguments (cls=, separators=, ...), such as
+the session serializer, always take the stdlib path.
+"""
+import decimal
+from datetime import date, time
+from flask.json.provider import DefaultJSONProvider
+
+# orjson encodes several times faster; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _default(o):
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    if np is not None and isinstance(o, np.generic):
+        return o.item()
+    if np is not None and isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, (date, time)):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with ISO dates, float Decimals and orjson when available"""
+
+    default = staticmethod(_default)
+
+    def _options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        # Same indent rule as DefaultJSONProvider.response
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
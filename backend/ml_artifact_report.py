@@ -0,0 +1,119 @@
+"""
+ML Artifact Report
+Size and load-time comparison of each model artifact loaded the old way
+(whole pickle copied into the process) and memory-mapped (mmap_mode='r').
+
+    python -m backend.ml_artifact_report [model_dir] [--repeat N]
+
+"private" is array memory each worker holds its own copy of; "shared" is
+array memory served from the shared page cache. sklearn forests copy their
+node arrays into the Tree objects on load, so they stay private either way.
+"""
+import os
+import sys
+import time
+import joblib
+import numpy as np
+from backend.ml_registry import ARTIFACTS, read_active_version, version_dir
+
+
+def _is_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base if isinstance(array.base, np.ndarray) else None
+    return False
+
+
+def array_bytes(obj):
+    """(private, mapped) bytes of the numpy arrays reachable from obj"""
+    private = mapped = 0
+    seen = {}  # id -> object; holding the object keeps ids of temporary states unique
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen[id(item)] = item
+        if isinstance(item, np.ndarray):
+            if item.dtype == object:
+                stack.extend(item.ravel().tolist())
+            elif _is_mapped(item):
+                mapped += item.nbytes
+            else:
+                private += item.nbytes
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+        elif hasattr(item, '__getstate__') and type(item).__module__.startswith('sklearn.tree'):
+            # Cython Tree: arrays only reachable through its pickled state
+            stack.extend(item.__getstate__().values())
+        elif hasattr(item, '__dict__'):
+            stack.extend(vars(item).values())
+    return private, mapped
+
+
+def _timed_load(path, mmap_mode, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        obj = joblib.load(path, mmap_mode=mmap_mode)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return obj, round(best, 2)
+
+
+def artifact_report(directory, repeat=3):
+    """One row per artifact present in directory"""
+    rows = []
+    for name, file_name in ARTIFACTS.items():
+        path = os.path.join(directory, file_name)
+        if not os.path.exists(path):
+            continue
+        loaded, load_ms = _timed_load(path, None, repeat)
+        mapped_obj, mmap_ms = _timed_load(path, 'r', repeat)
+        private, _ = array_bytes(loaded)
+        mmap_private, mapped = array_bytes(mapped_obj)
+        rows.append({
+            'artifact': name,
+            'file_bytes': os.path.getsize(path),
+            'load_ms': load_ms,
+            'mmap_load_ms': mmap_ms,
+            'private_bytes': private,
+            'mmap_private_bytes': mmap_private,
+            'mmap_shared_bytes': mapped,
+        })
+    return rows
+
+
+def _kb(n):
+    return f"{n / 1024:,.1f}"
+
+
+def print_report(rows):
+    header = f"{'artifact':<18}{'file KB':>10}{'load ms':>10}{'mmap ms':>10}{'private KB':>12}{'mmap priv KB':>14}{'shared KB':>11}"
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        print(f"{row['artifact']:<18}{_kb(row['file_bytes']):>10}{row['load_ms']:>10}{row['mmap_load_ms']:>10}"
+              f"{_kb(row['private_bytes']):>12}{_kb(row['mmap_private_bytes']):>14}{_kb(row['mmap_shared_bytes']):>11}")
+    if rows:
+        total = {key: sum(row[key] for row in rows) for key in rows[0] if key != 'artifact'}
+        print('-' * len(header))
+        print(f"{'total':<18}{_kb(total['file_bytes']):>10}{round(total['load_ms'], 2):>10}{round(total['mmap_load_ms'], 2):>10}"
+              f"{_kb(total['private_bytes']):>12}{_kb(total['mmap_private_bytes']):>14}{_kb(total['mmap_shared_bytes']):>11}")
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    repeat = 3
+    if '--repeat' in args:
+        i = args.index('--repeat')
+        repeat = int(args[i + 1])
+        del args[i:i + 2]
+    model_dir = args[0] if args else os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models')
+    active = read_active_version(model_dir)
+    directory = version_dir(model_dir, active) if active else model_dir
+    print(f"Artifacts in {directory}")
+    print_report(artifact_report(directory, repeat))
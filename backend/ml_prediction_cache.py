@@ -0,0 +1,104 @@
+"""
+ML Prediction Cache
+TTL + LRU memo for predict-resources / quick-estimate results. The event form
+re-requests the same prediction on every re-render, so results are keyed on
+the normalised request fields and stamped with a generation (active model
+version + training set version); a retrain or a training-data change makes
+every older entry a miss without an explicit flush.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """
+    Process-wide LRU of prediction results.
+
+    Keys are tuples whose first element names the endpoint (used for the
+    per-kind counters). Cached values are shared between requests and must
+    be treated as read-only. max_entries=0 or ttl=0 disables the cache.
+    """
+
+    def __init__(self, max_entries=2048, ttl=300):
+        self.max_entries = max_entries  # entries kept across all kinds
+        self.ttl = ttl                  # seconds an entry stays valid
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (generation, expires_at, value)
+        self._counters = {}             # kind -> {'hits', 'misses', 'stale', 'expired'}
+        self._evictions = 0
+
+    def configure(self, max_entries=2048, ttl=300):
+        with self._lock:
+            self.max_entries = max_entries
+            self.ttl = ttl
+            self._trim()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.ttl > 0
+
+    def _count(self, key, field):
+        counters = self._counters.setdefault(key[0], {'hits': 0, 'misses': 0, 'stale': 0, 'expired': 0})
+        counters[field] += 1
+
+    def _trim(self):
+        while len(self._entries) > max(self.max_entries, 0):
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, key, generation):
+        """Cached value for key under this generation, or None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._count(key, 'misses')
+                return None
+            entry_generation, expires_at, value = entry
+            if entry_generation != generation or time.monotonic() >= expires_at:
+                # Retrained / data changed / too old: drop it and recompute
+                del self._entries[key]
+                self._count(key, 'stale' if entry_generation != generation else 'expired')
+                self._count(key, 'misses')
+                return None
+            self._entries.move_to_end(key)
+            self._count(key, 'hits')
+            return value
+
+    def put(self, key, generation, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            self._trim()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            by_kind = {}
+            for kind, counters in self._counters.items():
+                lookups = counters['hits'] + counters['misses']
+                by_kind[kind] = dict(counters, hit_rate=round(counters['hits'] / lookups, 4) if lookups else None)
+            hits = sum(c['hits'] for c in self._counters.values())
+            lookups = hits + sum(c['misses'] for c in self._counters.values())
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'evictions': self._evictions,
+                'hits': hits,
+                'misses': lookups - hits,
+                'hit_rate': round(hits / lookups, 4) if lookups else None,
+                'by_kind': by_kind,
+            }
+
+
+# Process-wide instance (configured in app.create_app)
+prediction_cache = PredictionCache()
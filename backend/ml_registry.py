@@ -0,0 +1,175 @@
+"""
+ML Model Registry
+Loads each artifact in models/ once per process and hot-swaps it when the
+file on disk changes (e.g. after /api/ml/train-models in any worker).
+
+Trained versions live in models/versions/<version>/ and models/ACTIVE names
+the one being served; without an ACTIVE file the flat models/*.pkl files
+(pre-versioning layout) are used.
+
+Version directories are never rewritten, so their artifacts are loaded with
+mmap_mode='r': numpy arrays stay in the page cache and are shared by all
+worker processes instead of being copied into each one.
+"""
+import os
+import threading
+import time
+import joblib
+
+# Registry name -> file name inside the model directory
+ARTIFACTS = {
+    'vectorizer': 'event_vectorizer.pkl',
+    'classifier': 'event_classifier.pkl',
+    'budget': 'budget_predictor.pkl',
+    'equipment': 'equipment_predictor.pkl',
+    'resources': 'resources_predictor.pkl',
+    'usage_stats': 'usage_stats.pkl',
+    'similarity_index': 'similarity_index.pkl',
+    'budget_profiles': 'budget_profiles.pkl',
+    'timeline_profiles': 'timeline_profiles.pkl',
+    'metadata': 'model_metadata.pkl',
+}
+
+VERSIONS_DIR = 'versions'
+ACTIVE_FILE = 'ACTIVE'
+
+# joblib mmap mode for versioned artifacts. The flat legacy files are
+# rewritten in place by train_event_classifier.py, which would invalidate a
+# live mapping, so those are always read into memory.
+MMAP_MODE = 'r'
+
+
+def read_active_version(model_dir):
+    try:
+        with open(os.path.join(model_dir, ACTIVE_FILE)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def version_dir(model_dir, version):
+    return os.path.join(model_dir, VERSIONS_DIR, version)
+
+
+def activate_version(model_dir, version):
+    """Atomically point models/ACTIVE at a fully written version directory"""
+    tmp_path = os.path.join(model_dir, f'.{ACTIVE_FILE}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(model_dir, ACTIVE_FILE))
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of trained model artifacts.
+
+    Readers always see one immutable snapshot dict; a reload builds a new
+    snapshot and swaps the reference, so a request never mixes half-loaded
+    state. File mtimes are re-checked at most every check_interval seconds.
+    """
+
+    def __init__(self, model_dir, artifacts=ARTIFACTS, check_interval=2.0):
+        self.model_dir = model_dir
+        self.artifacts = dict(artifacts)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = {'models': {}, 'mtimes': {}, 'info': {}, 'dir': None}
+        self._last_check = 0.0
+        self._reloads = 0
+
+    def artifact_dir(self):
+        """Directory of the active version (or the flat legacy layout)"""
+        version = read_active_version(self.model_dir)
+        return version_dir(self.model_dir, version) if version else self.model_dir
+
+    def path(self, name, directory=None):
+        return os.path.join(directory or self.artifact_dir(), self.artifacts[name])
+
+    def _current_mtimes(self, directory):
+        mtimes = {}
+        for name in self.artifacts:
+            try:
+                mtimes[name] = os.stat(self.path(name, directory)).st_mtime_ns
+            except OSError:
+                mtimes[name] = None
+        return mtimes
+
+    def reload(self, force=False):
+        """Reload artifacts whose files changed (or all of them if force)"""
+        with self._lock:
+            self._last_check = time.monotonic()
+            old = self._snapshot
+            directory = self.artifact_dir()
+            mtimes = self._current_mtimes(directory)
+            if not force and directory == old['dir'] and mtimes == old['mtimes']:
+                return False
+            # A version flip replaces the whole set, never mix two versions
+            flipped = directory != old['dir']
+            force = force or flipped
+
+            mmap_mode = MMAP_MODE if directory != self.model_dir else None
+
+            models = {} if flipped else dict(old['models'])
+            info = {} if flipped else dict(old['info'])
+            for name, mtime in mtimes.items():
+                if not force and old['mtimes'].get(name) == mtime and name in models:
+                    continue
+                if mtime is None:
+                    models.pop(name, None)
+                    info.pop(name, None)
+                    continue
+                started = time.perf_counter()
+                try:
+                    models[name] = joblib.load(self.path(name, directory), mmap_mode=mmap_mode)
+                except Exception as e:
+                    # Keep serving the previous version (file may be mid-write)
+                    print(f"[MODEL REGISTRY] Failed to load {name}: {e}")
+                    mtimes[name] = old['mtimes'].get(name)
+                    continue
+                info[name] = {
+                    'file': self.artifacts[name],
+                    'load_ms': round((time.perf_counter() - started) * 1000, 2),
+                    'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'mtime': mtime,
+                    'mmap': mmap_mode is not None,
+                }
+
+            self._snapshot = {'models': models, 'mtimes': mtimes, 'info': info, 'dir': directory}
+            self._reloads += 1
+            return True
+
+    def _maybe_reload(self):
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self.reload()
+
+    def snapshot(self):
+        """Consistent {name: model} view for one request"""
+        self._maybe_reload()
+        return self._snapshot['models']
+
+    def get(self, name, default=None):
+        return self.snapshot().get(name, default)
+
+    def has(self, *names):
+        models = self.snapshot()
+        return all(name in models for name in names)
+
+    @property
+    def version(self):
+        """Version stamp of the active models (from model_metadata.pkl)"""
+        metadata = self.get('metadata') or {}
+        return metadata.get('version') or metadata.get('trained_at')
+
+    def status(self):
+        self._maybe_reload()
+        snapshot = self._snapshot
+        return {
+            'version': self.version,
+            'active_version': read_active_version(self.model_dir),
+            'reloads': self._reloads,
+            'artifacts': {
+                name: snapshot['info'].get(name) for name in self.artifacts
+            }
+        }
@@ -0,0 +1,107 @@
+"""
+Similar-Event Index
+Character n-gram TF-IDF over training event names, partitioned by event type
+and built once at train time (models/similarity_index.pkl). Rows are
+L2-normalised, so a top-k search is one sparse dot product plus argpartition
+over the partition instead of per-request SequenceMatcher / TF-IDF refits.
+"""
+from collections import Counter
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Fields of each training row needed by budget scaling, breakdown, timeline and venue steps
+RECORD_FIELDS = (
+    'event_name', 'event_type', 'attendees', 'total_budget', 'description',
+    'venue', 'budget_breakdown_list', 'activities_list'
+)
+
+
+def _normalise(name):
+    return ' '.join(str(name or '').lower().split())
+
+
+class SimilarityIndex:
+    """Top-k similar training events by name within one event type"""
+
+    def __init__(self, vectorizer=None, partitions=None, records=None):
+        self.vectorizer = vectorizer
+        self.partitions = partitions or {}
+        self.records = records or []
+        self._analyzer = None
+        self._idf = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_analyzer'] = None  # closure, rebuilt lazily
+        return state
+
+    def _query_vector(self, name):
+        """(column ids, weights) of the normalised TF-IDF vector for name"""
+        # Same weighting as vectorizer.transform() without its per-call overhead
+        if self._analyzer is None:
+            self._analyzer = self.vectorizer.build_analyzer()
+            self._idf = self.vectorizer.idf_.astype(np.float32)
+        vocabulary = self.vectorizer.vocabulary_
+        counts = Counter(vocabulary[g] for g in self._analyzer(name) if g in vocabulary)
+        if not counts:
+            return None, None
+        ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        weights = (1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))) * self._idf[ids]
+        return ids, weights / np.linalg.norm(weights)
+
+    @classmethod
+    def build(cls, df):
+        if df.empty or 'event_name' not in df.columns:
+            return cls()
+
+        names = [_normalise(name) for name in df['event_name'].tolist()]
+        records = [
+            {field: row.get(field) for field in RECORD_FIELDS}
+            for row in df.to_dict('records')
+        ]
+        vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4),
+                                     sublinear_tf=True, dtype=np.float32)
+        try:
+            matrix = vectorizer.fit_transform(names).tocsr()
+        except ValueError:
+            # Only empty names: no vocabulary, exact lookups still work
+            vectorizer, matrix = None, None
+
+        partitions = {}
+        for event_type, positions in df.groupby('event_type', sort=False).indices.items():
+            positions = np.asarray(positions, dtype=np.int32)
+            exact = {}
+            for pos in positions.tolist():
+                exact.setdefault(names[pos], pos)  # first row wins, like iloc[0]
+            partitions[event_type] = {
+                'rows': positions,
+                # CSC: a query only touches the columns of its own n-grams
+                'matrix': matrix[positions].tocsc() if matrix is not None else None,
+                'exact': exact,
+            }
+        return cls(vectorizer, partitions, records)
+
+    def exact(self, name, event_type):
+        """Training row with the same (case-insensitive) name, or None"""
+        partition = self.partitions.get(event_type)
+        if not partition:
+            return None
+        pos = partition['exact'].get(_normalise(name))
+        return self.records[pos] if pos is not None else None
+
+    def search(self, name, event_type, k=3):
+        """[(record, score)] for the k most similar names, best first"""
+        partition = self.partitions.get(event_type)
+        if not partition or self.vectorizer is None or partition['matrix'] is None or not name:
+            return []
+        ids, weights = self._query_vector(_normalise(name))
+        if ids is None:
+            return []
+        scores = partition['matrix'][:, ids] @ weights
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.records[partition['rows'][i]], float(scores[i])) for i in top]
+
+    def __len__(self):
+        return len(self.records)
@@ -0,0 +1,84 @@
+"""
+Out-of-Core Event Classifier
+Hashing features + SGD fitted with partial_fit one chunk at a time, so
+training memory depends on the chunk size rather than on how much history
+ai_training_data holds. Used by train_event_classifier.py for large tables;
+the artifacts are drop-in replacements for event_vectorizer.pkl /
+event_classifier.pkl (transform / predict_proba / classes_).
+"""
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+HASH_FEATURES = 2 ** 18
+# Rows held back (every HOLDOUT_EVERY-th) to score the streamed model
+HOLDOUT_EVERY = 5
+MAX_HOLDOUT_ROWS = 5000
+
+
+class SeenHashingVectorizer:
+    """
+    HashingVectorizer that remembers which buckets occurred during training.
+
+    Unseen buckets are zeroed on transform, so a text with no known words
+    still maps to an all-zero row (classify_names() reports it as unknown,
+    as it does for the TF-IDF vocabulary).
+    """
+
+    def __init__(self, n_features=HASH_FEATURES, ngram_range=(1, 2), stop_words='english'):
+        self.hasher = HashingVectorizer(n_features=n_features, ngram_range=ngram_range,
+                                        stop_words=stop_words, alternate_sign=False, norm='l2')
+        self.seen = np.zeros(n_features, dtype=bool)
+
+    def partial_fit(self, texts):
+        X = self.hasher.transform(texts)
+        self.seen[X.indices] = True
+        return X
+
+    def transform(self, texts):
+        X = self.hasher.transform(texts)
+        X.data *= self.seen[X.indices]
+        X.eliminate_zeros()
+        return X
+
+
+def fit_streaming_classifier(chunks, classes, epochs=3):
+    """
+    chunks: callable returning a fresh iterator of (texts, labels) batches in
+    a stable order; it is called once per epoch so nothing is kept between
+    passes except the hold-out rows.
+    Returns (vectorizer, classifier, holdout accuracy or None).
+    """
+    vectorizer = SeenHashingVectorizer()
+    classifier = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+    classes = np.asarray(sorted(classes))
+    holdout_texts, holdout_labels = [], []
+    rng = np.random.default_rng(42)
+
+    for epoch in range(epochs):
+        position = 0
+        for texts, labels in chunks():
+            train_texts, train_labels = [], []
+            for text, label in zip(texts, labels):
+                # Same rows every epoch (chunks() yields a stable order)
+                if position % HOLDOUT_EVERY == 0 and position // HOLDOUT_EVERY < MAX_HOLDOUT_ROWS:
+                    if epoch == 0:
+                        holdout_texts.append(text)
+                        holdout_labels.append(label)
+                else:
+                    train_texts.append(text)
+                    train_labels.append(label)
+                position += 1
+            if not train_texts:
+                continue
+            # Rows arrive ordered by id; shuffle within the chunk so SGD steps aren't biased
+            order = rng.permutation(len(train_texts))
+            X = vectorizer.partial_fit([train_texts[i] for i in order])
+            classifier.partial_fit(X, np.asarray(train_labels, dtype=object)[order], classes=classes)
+
+    if not hasattr(classifier, 'classes_'):
+        return vectorizer, None, None
+    accuracy = None
+    if holdout_texts:
+        accuracy = float(np.mean(classifier.predict(vectorizer.transform(holdout_texts)) == np.asarray(holdout_labels, dtype=object)))
+    return vectorizer, classifier, accuracy
@@ -0,0 +1,560 @@
+"""
+ML Training Pipeline & Job Runner
+Training runs off the request path in a background job. Each run writes a
+complete artifact set into models/versions/<version>/ and only then flips
+models/ACTIVE, so workers never serve a half-written model set.
+
+The stages are independent, so they are fitted concurrently in a process
+pool sized by CPU count and available memory; the forests get the CPUs the
+pool leaves idle via n_jobs.
+"""
+import os
+import shutil
+import threading
+import time
+import uuid
+import json
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from datetime import datetime
+import joblib
+import numpy as np
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.multioutput import MultiOutputClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import MultiLabelBinarizer
+from sklearn.feature_extraction.text import TfidfVectorizer
+from database.db import get_db
+from backend.ml_registry import ARTIFACTS, VERSIONS_DIR, version_dir, activate_version, read_active_version
+from backend.ml_usage_stats import build_usage_stats
+from backend.ml_similarity import SimilarityIndex
+
+MIN_TRAINING_SAMPLES = 5
+KEEP_VERSIONS = 3  # version directories kept on disk (active one is never pruned)
+
+# MySQL named lock so only one worker process trains at a time
+LOCK_NAME = 'sems_model_training'
+
+# Forest size (previously fixed at 10 trees / depth 5 to prevent OOM)
+DEFAULT_FOREST_ESTIMATORS = 10
+DEFAULT_FOREST_MAX_DEPTH = 5
+
+# Rough resident cost of one spawned worker (interpreter + numpy/sklearn/pandas)
+WORKER_BASE_MEMORY = 250 * 1024 * 1024
+# Share of currently available memory the pool may plan to use
+WORKER_MEMORY_BUDGET = 0.5
+# Below this many samples spawning workers costs more than the fits themselves
+PARALLEL_MIN_SAMPLES = 2000
+
+
+def _dump(obj, out_dir, name):
+    # Uncompressed so the registry can memory-map the numpy arrays (mmap_mode='r')
+    joblib.dump(obj, os.path.join(out_dir, ARTIFACTS[name]), compress=0)
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _safe_float(val):
+    # Convert any NaN values to 0 for JSON compatibility
+    return 0.0 if (isinstance(val, float) and np.isnan(val)) else float(val)
+
+
+# ============================================================================
+# TRAINING STAGES
+# Each stage takes the training DataFrame, the output directory and the
+# training options, and returns its metrics. Stages run in separate
+# processes, so they must not depend on each other.
+# ============================================================================
+
+def _forest(options):
+    return RandomForestClassifier(
+        n_estimators=options.get('n_estimators', DEFAULT_FOREST_ESTIMATORS),
+        max_depth=options.get('max_depth', DEFAULT_FOREST_MAX_DEPTH),
+        n_jobs=options.get('n_jobs', 1),
+        random_state=42
+    )
+
+
+def train_budget_model(df, out_dir, options):
+    """Budget model (Linear Regression)"""
+    X_budget = df[['event_type_encoded', 'attendees']]
+    y_budget = df['total_budget']
+
+    budget_model = LinearRegression()
+    budget_model.fit(X_budget, y_budget)
+    _dump(budget_model, out_dir, 'budget')
+    return {'budget_score': _safe_float(budget_model.score(X_budget, y_budget))}
+
+
+def train_equipment_model(df, out_dir, options):
+    """Equipment model (Random Forest)"""
+    X_budget = df[['event_type_encoded', 'attendees']]
+    mlb = MultiLabelBinarizer()
+    y_equipment = mlb.fit_transform(df['equipment_list'])
+
+    equipment_model = MultiOutputClassifier(_forest(options))
+    equipment_model.fit(X_budget, y_equipment)
+    _dump((equipment_model, mlb), out_dir, 'equipment')
+    return {
+        'equipment_accuracy': _safe_float(equipment_model.score(X_budget, y_equipment)),
+        'equipment_labels': list(mlb.classes_),
+    }
+
+
+def train_resources_model(df, out_dir, options):
+    """Additional resources model (Random Forest)"""
+    X_budget = df[['event_type_encoded', 'attendees']]
+    mlb_resources = MultiLabelBinarizer()
+    y_resources = mlb_resources.fit_transform(df['additional_resources_list'])
+
+    resources_model = MultiOutputClassifier(_forest(options))
+    resources_model.fit(X_budget, y_resources)
+    _dump((resources_model, mlb_resources), out_dir, 'resources')
+    return {
+        'resources_accuracy': _safe_float(resources_model.score(X_budget, y_resources)),
+        'resources_labels': list(mlb_resources.classes_),
+    }
+
+
+def train_event_classifier(df, out_dir, options):
+    """Event type classifier (TF-IDF + Logistic Regression)"""
+    if 'event_name' not in df.columns:
+        return {}
+    # LIGHTWEIGHT MODE: Max 300 features
+    vectorizer = TfidfVectorizer(max_features=300, stop_words='english', ngram_range=(1, 1))
+    # Use LogisticRegression which often works better for small text datasets
+    classifier = LogisticRegression(random_state=42, class_weight='balanced', max_iter=200)
+
+    X_text = vectorizer.fit_transform(df['event_name'])
+    classifier.fit(X_text, df['event_type'])
+
+    _dump(vectorizer, out_dir, 'vectorizer')
+    _dump(classifier, out_dir, 'classifier')
+    return {}
+
+
+def build_usage_tables(df, out_dir, options):
+    """Per-type equipment/resource frequencies for predict-resources"""
+    _dump(build_usage_stats(df), out_dir, 'usage_stats')
+    return {}
+
+
+def build_similarity_index(df, out_dir, options):
+    """Similar-event index for budget scaling / breakdown"""
+    _dump(SimilarityIndex.build(df), out_dir, 'similarity_index')
+    return {}
+
+
+def learn_budget_profiles(df, out_dir, options):
+    """Average budget breakdown share per category, per event type"""
+    budget_profiles = {}
+    for event_type in df['event_type'].unique():
+        type_df = df[df['event_type'] == event_type]
+        profile = {}
+        total_events = len(type_df)
+
+        for breakdown_list in type_df['budget_breakdown_list']:
+            # Filter out valid dict items only
+            valid_items = [item for item in breakdown_list if isinstance(item, dict)]
+            event_total = sum(item.get('amount', 0) for item in valid_items)
+
+            if event_total > 0:
+                for item in valid_items:
+                    name = item.get('name', 'Misc')
+                    amount = item.get('amount', 0)
+                    name_key = name.strip().title()
+                    if name_key not in profile: profile[name_key] = 0
+                    profile[name_key] += (amount / event_total) / total_events
+
+        budget_profiles[event_type] = {k: round(v, 2) for k, v in profile.items() if v > 0.05}
+
+    _dump(budget_profiles, out_dir, 'budget_profiles')
+    return {}
+
+
+def learn_timeline_profiles(df, out_dir, options):
+    """Example timelines per event type"""
+    timeline_profiles = {}
+    for event_type in df['event_type'].unique():
+        type_df = df[df['event_type'] == event_type]
+        timelines = []
+
+        for activities in type_df['activities_list']:
+            timeline = None
+            if isinstance(activities, dict):  # Multi-day format {day1: [...], day2: [...]}
+                # Extract day1 as the primary timeline pattern
+                if 'day1' in activities and isinstance(activities['day1'], list) and activities['day1']:
+                    timeline = activities['day1']
+            elif isinstance(activities, list) and activities:  # Single-day format [...]
+                timeline = activities
+
+            # Validate and clean timeline data
+            if timeline:
+                valid_timeline = []
+                for activity in timeline:
+                    if isinstance(activity, dict) and 'phase' in activity:
+                        # Ensure all required fields exist
+                        cleaned = {
+                            'phase': activity.get('phase', 'Activity'),
+                            'startTime': activity.get('startTime', activity.get('start_time', '09:00 AM')),
+                            'endTime': activity.get('endTime', activity.get('end_time', '10:00 AM'))
+                        }
+                        valid_timeline.append(cleaned)
+
+                if valid_timeline:
+                    timelines.append(valid_timeline)
+
+        if timelines:
+            # Store all timeline examples for this event type
+            timeline_profiles[event_type] = timelines
+
+    _dump(timeline_profiles, out_dir, 'timeline_profiles')
+    return {}
+
+
+TRAINING_STAGES = [
+    ('budget', train_budget_model),
+    ('equipment', train_equipment_model),
+    ('resources', train_resources_model),
+    ('classifier', train_event_classifier),
+    ('usage_stats', build_usage_tables),
+    ('similarity_index', build_similarity_index),
+    ('budget_profiles', learn_budget_profiles),
+    ('timeline_profiles', learn_timeline_profiles),
+]
+
+
+def _available_memory():
+    """Bytes of memory available to new processes, or None if unknown"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def plan_workers(df, max_workers=0):
+    """
+    (pool workers, forest n_jobs) for this DataFrame.
+    Workers are capped by CPUs, stage count and by how many copies of the
+    training data (each worker gets its own) fit in the memory budget.
+    """
+    cpus = os.cpu_count() or 1
+    workers = min(max_workers or cpus, cpus, len(TRAINING_STAGES))
+    if len(df) < PARALLEL_MIN_SAMPLES:
+        workers = 1
+    available = _available_memory()
+    if available:
+        # DataFrame copy + label matrices / fitted trees, roughly 3x the frame
+        per_worker = WORKER_BASE_MEMORY + 3 * int(df.memory_usage(deep=True).sum())
+        workers = min(workers, int(available * WORKER_MEMORY_BUDGET // per_worker))
+    workers = max(1, workers)
+    return workers, max(1, cpus // workers)
+
+
+def _run_stage(stage, df, out_dir, options):
+    """Process pool entry point: run one stage, return (stage, metrics, ms)"""
+    fn = dict(TRAINING_STAGES)[stage]
+    started = time.perf_counter()
+    metrics = fn(df, out_dir, options)
+    return stage, metrics, round((time.perf_counter() - started) * 1000, 2)
+
+
+def train_all(df, out_dir, version, on_stage=None, max_workers=0, options=None):
+    """
+    Run every training stage into out_dir and write model_metadata.pkl last.
+    on_stage(stage, done, total) is called as stages finish.
+    Returns (metadata, stage_timings_ms).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers, forest_jobs = plan_workers(df, max_workers)
+    options = {**(options or {}), 'n_jobs': forest_jobs}
+    metrics = {}
+    timings = {}
+    started = time.perf_counter()
+
+    def finished(stage, stage_metrics, ms):
+        metrics.update(stage_metrics)
+        timings[stage] = ms
+        if on_stage:
+            on_stage(stage, len(timings), len(TRAINING_STAGES))
+
+    if workers > 1:
+        # spawn: forking a threaded web worker (DB pool, schedulers) is unsafe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(_run_stage, stage, df, out_dir, options) for stage, _ in TRAINING_STAGES]
+            for future in as_completed(futures):
+                finished(*future.result())
+    else:
+        for stage, _ in TRAINING_STAGES:
+            finished(*_run_stage(stage, df, out_dir, options))
+
+    wall_ms = round((time.perf_counter() - started) * 1000, 2)
+    serial_ms = round(sum(timings.values()), 2)
+    speedup = round(serial_ms / wall_ms, 2) if wall_ms else 1.0
+    print(f"[TRAINING] {len(TRAINING_STAGES)} stages on {workers} workers (forest n_jobs={forest_jobs}): "
+          f"{wall_ms}ms wall vs {serial_ms}ms of stage time ({speedup}x)")
+
+    metadata = {
+        'version': version,
+        'trained_at': datetime.now().isoformat(),
+        'samples': len(df),
+        'budget_score': metrics.get('budget_score', 0.0),
+        'equipment_accuracy': metrics.get('equipment_accuracy', 0.0),
+        'equipment_labels': metrics.get('equipment_labels', []),
+        'resources_accuracy': metrics.get('resources_accuracy', 0.0),
+        'resources_labels': metrics.get('resources_labels', []),
+        'stage_timings_ms': timings,
+        'training': {
+            'workers': workers,
+            'forest_n_jobs': forest_jobs,
+            'n_estimators': options.get('n_estimators', DEFAULT_FOREST_ESTIMATORS),
+            'max_depth': options.get('max_depth', DEFAULT_FOREST_MAX_DEPTH),
+            'wall_ms': wall_ms,
+            'stage_total_ms': serial_ms,
+            'speedup': speedup,
+        },
+    }
+    _dump(metadata, out_dir, 'metadata')
+    return metadata, timings
+
+
+def prune_versions(model_dir, keep=KEEP_VERSIONS):
+    """Delete old version directories, keeping the newest `keep` and the active one"""
+    root = os.path.join(model_dir, VERSIONS_DIR)
+    try:
+        versions = sorted(os.listdir(root), reverse=True)
+    except OSError:
+        return
+    active = read_active_version(model_dir)
+    for version in versions[keep:]:
+        if version != active:
+            shutil.rmtree(os.path.join(root, version), ignore_errors=True)
+
+
+# ============================================================================
+# JOB RUNNER
+# ============================================================================
+
+class TrainingJobRunner:
+    """
+    Runs training jobs one at a time on a background thread.
+
+    Job state is kept in memory for fast progress polling and mirrored to the
+    training_jobs table so any worker can report on it.
+    """
+
+    def __init__(self, model_dir, load_data, on_activate=None):
+        self.model_dir = model_dir
+        self.load_data = load_data        # () -> training DataFrame
+        self.on_activate = on_activate    # called after a version flip
+        self.max_workers = 0              # 0 = size the pool automatically
+        self.options = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-training')
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._current = None
+        self._persist_failed = False
+
+    def configure(self, max_workers=0, n_estimators=DEFAULT_FOREST_ESTIMATORS, max_depth=DEFAULT_FOREST_MAX_DEPTH):
+        self.max_workers = max_workers
+        self.options = {'n_estimators': n_estimators, 'max_depth': max_depth}
+
+    def submit(self, requested_by=None):
+        """Queue a training run; returns the job (the in-flight one if already running)"""
+        with self._lock:
+            current = self._jobs.get(self._current)
+            if current and current['status'] in ('queued', 'running'):
+                return dict(current)
+            job = {
+                'id': uuid.uuid4().hex,
+                'status': 'queued',
+                'stage': None,
+                'progress': 0,
+                'stage_timings': {},
+                'metrics': None,
+                'version': datetime.now().strftime('%Y%m%d%H%M%S%f'),
+                'samples': 0,
+                'requested_by': requested_by,
+                'error': None,
+                'created_at': _now(),
+                'started_at': None,
+                'completed_at': None,
+            }
+            self._jobs[job['id']] = job
+            self._current = job['id']
+        self._persist(job)
+        self._executor.submit(self._run, job)
+        return dict(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                return dict(job)
+        return self._load(job_id)
+
+    def recent(self, limit=20):
+        try:
+            rows = get_db().execute_query(
+                "SELECT * FROM training_jobs ORDER BY created_at DESC LIMIT %s", (limit,)
+            )
+            return [self._from_row(row) for row in rows]
+        except Exception as e:
+            print(f"[TRAINING JOB] Could not list jobs: {e}")
+            with self._lock:
+                jobs = sorted(self._jobs.values(), key=lambda j: j['created_at'], reverse=True)
+                return [dict(job) for job in jobs[:limit]]
+
+    def _update(self, job, **fields):
+        with self._lock:
+            job.update(fields)
+        self._persist(job)
+
+    def _run(self, job):
+        db = get_db()
+        conn = db.get_connection()
+        locked = False
+        started = time.perf_counter()
+        try:
+            locked = self._acquire_db_lock(db, conn)
+            if not locked:
+                raise RuntimeError('Another training run is in progress')
+
+            self._update(job, status='running', stage='load_data', started_at=_now())
+            load_started = time.perf_counter()
+            df = self.load_data()
+            job['stage_timings']['load_data'] = round((time.perf_counter() - load_started) * 1000, 2)
+            if len(df) < MIN_TRAINING_SAMPLES:
+                raise ValueError(f'Not enough data to train (need at least {MIN_TRAINING_SAMPLES} samples)')
+            self._update(job, samples=len(df))
+
+            def on_stage(stage, done, total):
+                self._update(job, stage=stage, progress=int(done * 100 / (total + 1)))
+
+            out_dir = version_dir(self.model_dir, job['version'])
+            metadata, timings = train_all(df, out_dir, job['version'], on_stage,
+                                          max_workers=self.max_workers, options=self.options)
+
+            self._update(job, stage='activate', stage_timings={**job['stage_timings'], **timings})
+            activate_version(self.model_dir, job['version'])
+            if self.on_activate:
+                self.on_activate()
+            prune_versions(self.model_dir)
+
+            self._update(
+                job, status='completed', stage=None, progress=100,
+                metrics={
+                    'budget_r2': round(metadata['budget_score'], 4),
+                    'equipment_acc': round(metadata['equipment_accuracy'], 4),
+                    'resources_acc': round(metadata['resources_accuracy'], 4),
+                    'total_ms': round((time.perf_counter() - started) * 1000, 2),
+                    'workers': metadata['training']['workers'],
+                    'speedup': metadata['training']['speedup'],
+                },
+                completed_at=_now()
+            )
+            print(f"[TRAINING JOB] {job['id']} activated version {job['version']} ({len(df)} samples)")
+        except Exception as e:
+            print(f"[TRAINING JOB] {job['id']} failed: {e}")
+            self._update(job, status='failed', error=str(e), completed_at=_now())
+            shutil.rmtree(version_dir(self.model_dir, job['version']), ignore_errors=True)
+        finally:
+            if locked and db.db_type == 'mysql':
+                self._release_db_lock(conn)
+            db.return_connection(conn)
+
+    def _acquire_db_lock(self, db, conn):
+        if db.db_type != 'mysql':
+            return True
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+            row = cursor.fetchone()
+            return bool(row and row[0] == 1)
+        finally:
+            cursor.close()
+
+    def _release_db_lock(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.fetchone()
+            cursor.close()
+        except Exception as e:
+            print(f"[TRAINING JOB] Failed to release training lock: {e}")
+
+    # ------------------------------------------------------------------
+    # training_jobs table (best effort: progress polling works without it)
+    # ------------------------------------------------------------------
+
+    def _persist(self, job):
+        try:
+            get_db().execute_update("""
+                INSERT INTO training_jobs
+                (id, status, stage, progress, stage_timings, metrics, model_version,
+                 samples, requested_by, error_message, created_at, started_at, completed_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    status = VALUES(status), stage = VALUES(stage), progress = VALUES(progress),
+                    stage_timings = VALUES(stage_timings), metrics = VALUES(metrics),
+                    samples = VALUES(samples), error_message = VALUES(error_message),
+                    started_at = VALUES(started_at), completed_at = VALUES(completed_at)
+            """, (
+                job['id'], job['status'], job['stage'], job['progress'],
+                json.dumps(job['stage_timings']), json.dumps(job['metrics']), job['version'],
+                job['samples'], job['requested_by'], job['error'],
+                job['created_at'], job['started_at'], job['completed_at']
+            ))
+            self._persist_failed = False
+        except Exception as e:
+            # Warn once per outage (e.g. migrations/add_training_jobs.sql not applied yet)
+            if not self._persist_failed:
+                print(f"[TRAINING JOB] Could not persist job {job['id']}: {e}")
+            self._persist_failed = True
+
+    def _load(self, job_id):
+        try:
+            row = get_db().execute_one("SELECT * FROM training_jobs WHERE id = %s", (job_id,))
+        except Exception as e:
+            print(f"[TRAINING JOB] Could not load job {job_id}: {e}")
+            return None
+        return self._from_row(row) if row else None
+
+    @staticmethod
+    def _from_row(row):
+        def parse(value):
+            if isinstance(value, (dict, list)) or value is None:
+                return value
+            try:
+                return json.loads(value)
+            except (TypeError, ValueError):
+                return None
+
+        def stamp(value):
+            return value.strftime('%Y-%m-%d %H:%M:%S') if hasattr(value, 'strftime') else value
+
+        return {
+            'id': row['id'],
+            'status': row['status'],
+            'stage': row.get('stage'),
+            'progress': row.get('progress') or 0,
+            'stage_timings': parse(row.get('stage_timings')) or {},
+            'metrics': parse(row.get('metrics')),
+            'version': row.get('model_version'),
+            'samples': row.get('samples') or 0,
+            'requested_by': row.get('requested_by'),
+            'error': row.get('error_message'),
+            'created_at': stamp(row.get('created_at')),
+            'started_at': stamp(row.get('started_at')),
+            'completed_at': stamp(row.get('completed_at')),
+        }
@@ -0,0 +1,402 @@
+"""
+ML Training Set Cache
+Keeps the parsed training rows (ai_training_data + completed events) in memory
+and refreshes them incrementally from updated_at watermarks, so predictions no
+longer re-query and re-parse both tables on every request.
+"""
+import json
+import threading
+import time
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+# orjson decodes the JSON columns several times faster; optional
+try:
+    from orjson import loads as _fast_loads
+except ImportError:
+    _fast_loads = json.loads
+
+_TRAINING_COLUMNS = """
+    id, event_name, event_type, attendees, total_budget,
+    equipment, activities, additional_resources,
+    budget_breakdown, venue, organizer, description, is_validated, created_at
+"""
+
+_EVENT_SELECT = """
+    SELECT
+        e.id,
+        e.name as event_name,
+        e.event_type,
+        e.expected_attendees as attendees,
+        COALESCE(b.total_budget, 0) as total_budget,
+        e.venue,
+        e.organizer,
+        e.description,
+        '' as equipment,
+        '' as activities,
+        '' as additional_resources,
+        '' as budget_breakdown,
+        e.status,
+        e.deleted_at,
+        e.created_at
+    FROM events e
+    LEFT JOIN budgets b ON e.id = b.event_id
+"""
+
+
+# Rows pulled from the server-side cursor and prepared per batch on full loads
+LOAD_CHUNK_SIZE = 2000
+
+# Marker for a JSON column that failed to decode
+_INVALID = object()
+
+
+def _names(items):
+    """Decoded JSON array as names (dict items collapse to their 'name')"""
+    if not isinstance(items, list): return []
+    # Handle both string items and dict items (with 'name' key)
+    return [item['name'] if isinstance(item, dict) and 'name' in item else item
+            for item in items if item]
+
+
+def _objects(data):
+    """Decoded JSON array as [{'name', 'quantity', ...}]"""
+    return [item if isinstance(item, dict) and 'name' in item else {'name': item, 'quantity': 1}
+            for item in (data if isinstance(data, list) else [])]
+
+
+def _decode(x):
+    """One JSON column value: [] if empty, decoded value, or _INVALID"""
+    if not x: return []
+    # Check if likely already parsed (e.g. Postgres + psycopg3 automatic adaptation)
+    if isinstance(x, (list, dict)): return x
+    try:
+        return _fast_loads(x)
+    except (TypeError, ValueError):
+        pass
+    try:
+        # orjson rejects NaN/Infinity literals; json has the final word
+        return json.loads(x)
+    except (TypeError, ValueError):
+        return _INVALID
+
+
+def decode_json_column(values):
+    """_decode() over one column of a batch"""
+    return [_decode(v) for v in values]
+
+
+def safe_parse_json_list(x):
+    """JSON array of names (dict items collapse to their 'name')"""
+    items = _decode(x)
+    return [] if items is _INVALID else _names(items)
+
+
+def parse_full_objects(x):
+    """JSON array as [{'name', 'quantity', ...}] to keep quantities"""
+    data = _decode(x)
+    return [] if data is _INVALID else _objects(data)
+
+
+def parse_generic_json(x):
+    data = _decode(x)
+    return [] if data is _INVALID else data
+
+
+def prepare_rows(rows):
+    """Parse the JSON columns of a batch of rows (done once, when rows are cached)"""
+    rows = [dict(row) for row in rows]
+    if not rows:
+        return rows
+    equipment = decode_json_column([row.get('equipment') for row in rows])
+    resources = decode_json_column([row.get('additional_resources') for row in rows])
+    activities = decode_json_column([row.get('activities') for row in rows])
+    breakdown = decode_json_column([row.get('budget_breakdown') for row in rows])
+    for row, eq, res, act, bd in zip(rows, equipment, resources, activities, breakdown):
+        row['equipment_list'] = [] if eq is _INVALID else _names(eq)
+        row['equipment_objects'] = [] if eq is _INVALID else _objects(eq)
+        row['additional_resources_list'] = [] if res is _INVALID else _names(res)
+        row['activities_list'] = [] if act is _INVALID else act
+        row['budget_breakdown_list'] = [] if bd is _INVALID else bd
+    return rows
+
+
+def iter_chunks(rows, size=LOAD_CHUNK_SIZE, key=None):
+    """
+    Lists of about size items from any row iterator (e.g. db.execute_stream).
+    With key, consecutive rows sharing key(row) never straddle two chunks.
+    """
+    chunk = []
+    for row in rows:
+        if len(chunk) >= size and (key is None or key(row) != key(chunk[-1])):
+            yield chunk
+            chunk = []
+        chunk.append(row)
+    if chunk:
+        yield chunk
+
+
+def _training_row_valid(row):
+    return bool(row.get('is_validated')) and float(row.get('total_budget') or 0) > 0
+
+
+def _event_row_valid(row):
+    return (row.get('status') == 'Completed' and row.get('deleted_at') is None
+            and float(row.get('total_budget') or 0) > 0)
+
+
+def _same_row(cached, row):
+    # Delta syncs re-read rows at the watermark; skip the rebuild if nothing moved
+    return all(cached.get(k) == v for k, v in row.items())
+
+
+def _newest_first(rows):
+    # Matches the old ORDER BY created_at DESC (ties: newest id first)
+    return sorted(rows, key=lambda r: (str(r.get('created_at') or ''), r['id']), reverse=True)
+
+
+class TrainingSetCache:
+    """
+    Process-wide cache of the training DataFrame.
+
+    A delta sync re-reads only rows whose updated_at moved past the watermark;
+    the DataFrame is rebuilt only when something actually changed. Hard deletes
+    made by other workers are picked up by the periodic full reload. The
+    returned DataFrame is shared between requests and must be treated as
+    read-only.
+    """
+
+    def __init__(self, sync_interval=5, reload_interval=600):
+        self.sync_interval = sync_interval      # seconds between delta syncs
+        self.reload_interval = reload_interval  # seconds between full reloads
+        self._lock = threading.Lock()
+        self._training = {}   # ai_training_data.id -> prepared row
+        self._events = {}     # events.id -> [prepared rows] (one per budget row)
+        self._training_mark = None
+        self._event_mark = None
+        self._training_stamp = 'updated_at'
+        self._df = None
+        self._version = 0      # bumped on every rebuild (i.e. whenever the rows changed)
+        self._dirty = True     # rows changed since the DataFrame was built
+        self._loaded = False
+        self._stale = False    # a local write asked for a sync on next use
+        self._pending_ids = set()  # ai_training_data ids edited locally, re-read by id
+        self._last_sync = 0.0
+        self._last_reload = 0.0
+        self._stats = {
+            'full_loads': 0,
+            'delta_syncs': 0,
+            'delta_rows': 0,
+            'rebuilds': 0,
+            'last_load_ms': None,
+            'last_rebuild_ms': None,
+        }
+
+    def configure(self, sync_interval=5, reload_interval=600):
+        self.sync_interval = sync_interval
+        self.reload_interval = reload_interval
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _apply_training(self, rows, training=None):
+        """Upsert/drop rows into training (default: the cached set); True if it changed"""
+        training = self._training if training is None else training
+        changed = False
+        fresh = []
+        for row in rows:
+            current = training.get(row['id'])
+            if _training_row_valid(row):
+                if current is None or not _same_row(current, row):
+                    fresh.append(row)
+            elif current is not None:
+                del training[row['id']]
+                changed = True
+        for row in prepare_rows(fresh):
+            training[row['id']] = row
+        return changed or bool(fresh)
+
+    def _apply_events(self, rows, events=None):
+        events = self._events if events is None else events
+        changed = False
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row['id'], []).append(row)
+        fresh = {}
+        for event_id, event_rows in grouped.items():
+            current = events.get(event_id)
+            kept = [r for r in event_rows if _event_row_valid(r)]
+            if current is not None and len(current) == len(kept) and all(
+                    _same_row(c, r) for c, r in zip(current, kept)):
+                continue
+            if kept:
+                fresh[event_id] = kept
+            elif current is not None:
+                del events[event_id]
+                changed = True
+        prepared = iter(prepare_rows([r for kept in fresh.values() for r in kept]))
+        for event_id, kept in fresh.items():
+            events[event_id] = [next(prepared) for _ in kept]
+        return changed or bool(fresh)
+
+    def _query_training(self, db, since=None):
+        if since is None:
+            return db.execute_query(f"SELECT {_TRAINING_COLUMNS} FROM ai_training_data")
+        try:
+            return db.execute_query(
+                f"SELECT {_TRAINING_COLUMNS} FROM ai_training_data WHERE {self._training_stamp} >= %s",
+                (since,)
+            )
+        except Exception as e:
+            if self._training_stamp == 'created_at':
+                raise
+            # Pre-migration schema without ai_training_data.updated_at: new rows are
+            # still found by created_at, edits rely on invalidate() / full reloads
+            print(f"[TRAINING CACHE] updated_at unavailable, falling back to created_at: {e}")
+            self._training_stamp = 'created_at'
+            return self._query_training(db, since)
+
+    def _watermarks(self, db):
+        try:
+            row = db.execute_one(f"SELECT MAX({self._training_stamp}) as mark FROM ai_training_data")
+        except Exception:
+            self._training_stamp = 'created_at'
+            row = db.execute_one("SELECT MAX(created_at) as mark FROM ai_training_data")
+        event_row = db.execute_one("""
+            SELECT GREATEST(
+                COALESCE((SELECT MAX(updated_at) FROM events), '1970-01-01'),
+                COALESCE((SELECT MAX(updated_at) FROM budgets), '1970-01-01')
+            ) as mark
+        """)
+        return (row['mark'] if row else None), (event_row['mark'] if event_row else None)
+
+    def _load(self, db):
+        started = time.perf_counter()
+        # Watermarks first: rows written during the load are re-read by the next delta sync
+        training_mark, event_mark = self._watermarks(db)
+        # Built aside and swapped in at the end, so a failed load keeps the old set
+        training = {}
+        events = {}
+        # Streamed and prepared in chunks: the raw result set is never held whole
+        for chunk in iter_chunks(db.execute_stream(f"SELECT {_TRAINING_COLUMNS} FROM ai_training_data")):
+            self._apply_training(chunk, training)
+        event_rows = db.execute_stream(_EVENT_SELECT + """
+            WHERE e.status = 'Completed'
+              AND e.deleted_at IS NULL
+              AND b.total_budget > 0
+            ORDER BY e.id
+        """)
+        # One event's budget rows must land in the same chunk
+        for chunk in iter_chunks(event_rows, key=lambda row: row['id']):
+            self._apply_events(chunk, events)
+        self._training = training
+        self._events = events
+        self._training_mark = training_mark
+        self._event_mark = event_mark
+        self._dirty = True
+        self._loaded = True
+        now = time.monotonic()
+        self._last_sync = now
+        self._last_reload = now
+        self._stats['full_loads'] += 1
+        self._stats['last_load_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _delta(self, db):
+        training_mark, event_mark = self._watermarks(db)
+        # >= so rows written in the same second as the watermark are re-read
+        training_rows = self._query_training(db, self._training_mark) if self._training_mark else self._query_training(db)
+        if self._pending_ids:
+            ids = list(self._pending_ids)
+            # Edits are not visible through created_at on pre-migration schemas
+            training_rows = training_rows + db.execute_query(
+                f"SELECT {_TRAINING_COLUMNS} FROM ai_training_data WHERE id IN ({', '.join(['%s'] * len(ids))})",
+                tuple(ids)
+            )
+            self._pending_ids.clear()
+        if self._event_mark:
+            event_rows = db.execute_query(_EVENT_SELECT + """
+                WHERE e.id IN (
+                    SELECT id FROM events WHERE updated_at >= %s
+                    UNION
+                    SELECT event_id FROM budgets WHERE updated_at >= %s
+                )
+            """, (self._event_mark, self._event_mark))
+        else:
+            event_rows = db.execute_query(_EVENT_SELECT)
+
+        if self._apply_training(training_rows) | self._apply_events(event_rows):
+            self._dirty = True
+        self._training_mark = training_mark
+        self._event_mark = event_mark
+        self._last_sync = time.monotonic()
+        self._stats['delta_syncs'] += 1
+        self._stats['delta_rows'] += len(training_rows) + len(event_rows)
+
+    def _build(self):
+        started = time.perf_counter()
+        rows = _newest_first(self._training.values()) + _newest_first(
+            [row for rows in self._events.values() for row in rows]
+        )
+        if not rows:
+            df = pd.DataFrame()
+        else:
+            df = pd.DataFrame(rows)
+            df['event_type_encoded'] = pd.Categorical(df['event_type']).codes
+            df['attendees_scaled'] = StandardScaler().fit_transform(df[['attendees']])
+        self._df = df
+        self._version += 1
+        self._dirty = False
+        self._stats['rebuilds'] += 1
+        self._stats['last_rebuild_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, db, full=False):
+        """Current training DataFrame (read-only), refreshed as needed"""
+        with self._lock:
+            now = time.monotonic()
+            if full or not self._loaded or now - self._last_reload >= self.reload_interval:
+                self._load(db)
+            elif self._stale or now - self._last_sync >= self.sync_interval:
+                self._delta(db)
+            self._stale = False
+            if self._dirty or self._df is None:
+                self._build()
+            return self._df
+
+    @property
+    def version(self):
+        """Changes whenever get() starts returning a different DataFrame"""
+        return self._version
+
+    def invalidate(self, training_id=None, deleted=False):
+        """
+        Called by the training-data endpoints after a write. A deleted row is
+        dropped immediately; anything else is re-read by a delta sync on the
+        next get().
+        """
+        with self._lock:
+            if deleted and training_id is not None:
+                if self._training.pop(training_id, None) is not None:
+                    self._dirty = True
+            elif training_id is not None and self._training_stamp != 'updated_at':
+                self._pending_ids.add(training_id)
+            self._stale = True
+
+    def stats(self):
+        stats = dict(self._stats)
+        stats.update({
+            'loaded': self._loaded,
+            'version': self._version,
+            'training_rows': len(self._training),
+            'event_rows': sum(len(rows) for rows in self._events.values()),
+            'watermark_column': self._training_stamp,
+        })
+        return stats
+
+
+# Process-wide instance (configured in app.create_app)
+training_set = TrainingSetCache()
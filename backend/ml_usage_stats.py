@@ -0,0 +1,109 @@
+"""
+Equipment / Additional Resource Usage Statistics
+Per-event-type frequency tables computed once at train time (persisted as
+models/usage_stats.pkl next to equipment_predictor.pkl) so predict_resources
+only does a lookup plus a threshold filter.
+
+Layout per table ('equipment', 'resources'):
+    labels       object array, label id -> item name (first-seen order)
+    counts       int32 array, label id -> number of events using the item
+    avg_quantity int32 array, label id -> rounded mean quantity (equipment only)
+    by_type      {event_type: (ids int32, counts int32)} in first-seen order
+    type_totals  {event_type: number of training events of that type}
+    total        number of training events
+"""
+import numpy as np
+
+
+def _build_table(df, list_column, objects_column=None):
+    label_ids = {}
+    labels = []
+    counts = []
+    by_type = {}
+
+    def label_id(name):
+        if name not in label_ids:
+            label_ids[name] = len(labels)
+            labels.append(name)
+            counts.append(0)
+        return label_ids[name]
+
+    event_types = df['event_type'].tolist()
+    for event_type, items in zip(event_types, df[list_column].tolist()):
+        type_counts = by_type.setdefault(event_type, {})
+        for item in items or []:
+            try:
+                i = label_id(item)
+            except TypeError:
+                continue  # unhashable junk in the JSON column
+            counts[i] += 1
+            type_counts[i] = type_counts.get(i, 0) + 1
+
+    table = {
+        'labels': np.array(labels, dtype=object),
+        'counts': np.array(counts, dtype=np.int32),
+        'by_type': {
+            t: (np.fromiter(c.keys(), dtype=np.int32, count=len(c)),
+                np.fromiter(c.values(), dtype=np.int32, count=len(c)))
+            for t, c in by_type.items()
+        },
+        'type_totals': {t: int(n) for t, n in df['event_type'].value_counts().items()},
+        'total': int(len(df)),
+    }
+
+    if objects_column is not None:
+        qty_sum = np.zeros(len(labels), dtype=np.int64)
+        qty_n = np.zeros(len(labels), dtype=np.int64)
+        for objects in df[objects_column].tolist():
+            for obj in objects or []:
+                i = label_ids.get(obj.get('name')) if isinstance(obj.get('name'), str) else None
+                if i is None:
+                    continue
+                try:
+                    qty = int(obj.get('quantity', 1))
+                except (TypeError, ValueError):
+                    qty = 1
+                qty_sum[i] += qty
+                qty_n[i] += 1
+        avg = np.ones(len(labels), dtype=np.int32)
+        used = qty_n > 0
+        avg[used] = np.maximum(1, np.round(qty_sum[used] / qty_n[used])).astype(np.int32)
+        table['avg_quantity'] = avg
+
+    return table
+
+
+def build_usage_stats(df):
+    """Frequency tables for equipment and additional resources"""
+    return {
+        'equipment': _build_table(df, 'equipment_list', 'equipment_objects'),
+        'resources': _build_table(df, 'additional_resources_list'),
+    }
+
+
+def select_items(table, event_type, type_threshold, global_threshold):
+    """
+    Label ids used by more than type_threshold of this type's events, followed
+    by ids used by more than global_threshold of all events.
+    Returns (ids, type_probabilities) with probabilities keyed by item name.
+    """
+    selected = []
+    probs = {}
+    type_ids, type_counts = table['by_type'].get(event_type, (None, None))
+    type_total = table['type_totals'].get(event_type, 0)
+    if type_ids is not None and type_total:
+        type_probs = type_counts / type_total
+        probs = dict(zip(table['labels'][type_ids].tolist(), type_probs.tolist()))
+        selected = type_ids[type_probs > type_threshold].tolist()
+
+    if table['total']:
+        chosen = set(selected)
+        frequent = np.flatnonzero(table['counts'] / table['total'] > global_threshold)
+        selected.extend(int(i) for i in frequent if i not in chosen)
+    return selected, probs
+
+
+def label_id(table, name):
+    """Label id for an item name, or None if it never appeared in training"""
+    hits = np.flatnonzero(table['labels'] == name)
+    return int(hits[0]) if len(hits) else None
@@ -0,0 +1,267 @@
+"""
+Response Cache
+Memo for the read-heavy event listings (GET /api/events, /api/events/approved,
+/api/venues/calendar) and the small lookups they repeat on every dashboard
+load (a Participant's course, a venue's name).
+
+Entries are keyed on whatever decides the result (role filter, department,
+query filters) and stamped with the version counters of the tables they were
+built from. Database reports every committed INSERT/UPDATE/DELETE to
+on_write(), which bumps the touched tables' counters in cache_versions
+(migrations/add_cache_versions.sql), so all workers see the same versions.
+A request reads the counters once; any entry built before a write to one of
+its tables is a miss. There is no TTL.
+
+The same versions give the polled endpoints strong ETags (version_etag):
+a request whose If-None-Match still matches is answered 304 before any
+listing query runs.
+
+Writes made through a connection that Database does not own (the one-off
+maintenance scripts) are not seen; bump cache_versions by hand after those.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+try:
+    from flask import g, has_app_context, jsonify, request, current_app
+except ImportError:
+    g = None
+    has_app_context = lambda: False
+
+logger = logging.getLogger(__name__)
+
+# Tables whose writes are counted (anything a cached result is built from).
+# event_details_synced is rewritten with every side-table sync
+# (backend/event_details.py), so it stands in for those tables.
+TRACKED_TABLES = frozenset(['events', 'users', 'students', 'budgets', 'venues', 'event_registrations',
+                            'event_details_synced'])
+
+# Bump when the JSON encoding of the ETagged endpoints changes, so clients
+# holding an old body don't keep it through a 304
+ETAG_FORMAT = 2
+
+_ER_NO_SUCH_TABLE = 1146
+
+_BUMP_SQL = """
+    INSERT INTO cache_versions (name, version) VALUES (%s, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1
+"""
+
+
+class ResponseCache:
+    """
+    Process-wide LRU of endpoint results stamped with table versions.
+
+    Keys are tuples whose first element names the kind (used for the per-kind
+    counters). Cached values are shared between requests and must be treated
+    as read-only. max_entries=0 disables the cache.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (stamp, value)
+        self._counters = {}             # kind -> {'hits', 'misses', 'stale'}
+        self._evictions = 0
+        self._bumps = 0
+        self._available = True          # False once cache_versions turns out to be missing
+
+    def configure(self, max_entries=1024):
+        with self._lock:
+            self.max_entries = max_entries
+            self._trim()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self._available
+
+    def _count(self, kind, field):
+        counters = self._counters.setdefault(kind, {'hits': 0, 'misses': 0, 'stale': 0})
+        counters[field] += 1
+
+    def _trim(self):
+        while len(self._entries) > max(self.max_entries, 0):
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _disable(self, error):
+        logger.warning(f"Response cache disabled, cache_versions unavailable ({error}); "
+                       f"apply migrations/add_cache_versions.sql to enable it")
+        self._available = False
+        self.clear()
+
+    # ------------------------------------------------------------------
+    # Table versions
+    # ------------------------------------------------------------------
+
+    def on_write(self, db, tables):
+        """Database write listener: bump the counters of tracked tables"""
+        tracked = sorted(TRACKED_TABLES.intersection(tables))
+        if not tracked or not self._available:
+            return
+        if has_app_context():
+            # Later reads in this request must see the new versions
+            g.pop('_response_cache_versions', None)
+        try:
+            db.execute_many(_BUMP_SQL, [(table,) for table in tracked])
+            self._bumps += 1
+        except Exception as e:
+            if getattr(e, 'errno', None) == _ER_NO_SUCH_TABLE:
+                self._disable(e)
+            else:
+                # Other workers may now serve stale entries; don't keep any here
+                logger.error(f"Response cache version bump failed for {tracked}: {e}")
+                self.clear()
+
+    def _versions(self, db):
+        """{table: version}, read once per request"""
+        if has_app_context():
+            versions = g.get('_response_cache_versions')
+            if versions is not None:
+                return versions
+        rows = db.execute_query("SELECT name, version FROM cache_versions")
+        versions = {row['name']: row['version'] for row in rows}
+        if has_app_context():
+            g._response_cache_versions = versions
+        return versions
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_or_build(self, db, key, tables, build):
+        """
+        Cached result for key, or build() when it is missing or any of tables
+        has been written since it was cached.
+        """
+        if not self.enabled:
+            return build()
+        stamp = self.stamp(db, tables)
+        if stamp is None:
+            return build()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self._count(key[0], 'hits')
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self._count(key[0], 'stale')
+            self._count(key[0], 'misses')
+
+        # Built outside the lock; versions were read first, so a write that
+        # lands meanwhile leaves this entry under an already-old stamp
+        value = build()
+        with self._lock:
+            self._entries[key] = (stamp, value)
+            self._entries.move_to_end(key)
+            self._trim()
+        return value
+
+    def stamp(self, db, tables):
+        """Current versions of tables, or None when they can't be read"""
+        if not self._available:
+            return None
+        try:
+            versions = self._versions(db)
+        except Exception as e:
+            if getattr(e, 'errno', None) == _ER_NO_SUCH_TABLE:
+                self._disable(e)
+            else:
+                logger.error(f"Response cache version read failed: {e}")
+            return None
+        return tuple(versions.get(table, 0) for table in tables)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            by_kind = {}
+            for kind, counters in self._counters.items():
+                lookups = counters['hits'] + counters['misses']
+                by_kind[kind] = dict(counters, hit_rate=round(counters['hits'] / lookups, 4) if lookups else None)
+            hits = sum(c['hits'] for c in self._counters.values())
+            lookups = hits + sum(c['misses'] for c in self._counters.values())
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'evictions': self._evictions,
+                'version_bumps': self._bumps,
+                'hits': hits,
+                'misses': lookups - hits,
+                'hit_rate': round(hits / lookups, 4) if lookups else None,
+                'by_kind': by_kind,
+            }
+
+
+def student_course(db, user_id):
+    """students.course for a user (None if there is no student row)"""
+    def build():
+        row = db.execute_one("SELECT course FROM students WHERE user_id = %s", (user_id,))
+        return row.get('course') if row else None
+    return response_cache.get_or_build(db, ('student-course', user_id), ('students',), build)
+
+
+def venue_name(db, venue_id):
+    """venues.name for an id (None if unknown)"""
+    def build():
+        row = db.execute_one("SELECT name FROM venues WHERE id = %s", (venue_id,))
+        return row['name'] if row else None
+    return response_cache.get_or_build(db, ('venue-name', str(venue_id)), ('venues',), build)
+
+
+# ----------------------------------------------------------------------
+# Conditional GET
+# ----------------------------------------------------------------------
+
+def version_etag(db, key, tables, token=None):
+    """
+    Strong ETag for the response identified by key (everything the body
+    depends on besides table contents) at the current versions of tables.
+    token adds a caller-computed change marker. None if versions are unavailable.
+    """
+    stamp = response_cache.stamp(db, tables)
+    if stamp is None:
+        return None
+    raw = repr((ETAG_FORMAT, key, stamp, token)).encode()
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _revalidate(response):
+    # Session-specific and must be checked on every poll
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def not_modified(etag):
+    """304 response if the request's If-None-Match holds etag, else None"""
+    if etag is None or not request.if_none_match.contains(etag):
+        return None
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    return _revalidate(response)
+
+
+def conditional_json(payload, etag=None, status=200):
+    """
+    jsonify(payload) with an ETag. Without a version ETag the body hash is
+    used, which still saves the transfer on a match.
+    """
+    response = jsonify(payload)
+    response.status_code = status
+    if etag is not None:
+        response.set_etag(etag)
+    else:
+        response.add_etag()
+    return _revalidate(response.make_conditional(request))
+
+
+# Process-wide instance (configured in app.create_app)
+response_cache = ResponseCache()
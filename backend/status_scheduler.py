@@ -0,0 +1,176 @@
+# ============================================================================
+# EVENT STATUS SCHEDULER
+# Background auto-completion of past events (replaces the per-request hook)
+# ============================================================================
+
+from backend.event_helpers import auto_complete_past_events
+from database.db import get_db
+from datetime import datetime
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# MySQL named lock so only one worker process runs a pass at a time
+LOCK_NAME = 'sems_event_status_scheduler'
+
+DEFAULT_INTERVAL = 60  # seconds
+
+
+class StatusScheduler:
+    """Runs auto_complete_past_events on a fixed interval in a daemon thread"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self._run_lock = threading.Lock()  # single-flight within this process
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {
+            'runs': 0,
+            'skipped': 0,
+            'errors': 0,
+            'events_completed': 0,
+            'last_run_at': None,
+            'last_duration_ms': None,
+            'max_duration_ms': 0.0,
+            'total_duration_ms': 0.0,
+            'last_error': None,
+        }
+
+    def run_once(self):
+        """
+        Run one transition pass if no other pass is in flight.
+        Returns the number of completed events, or None if skipped.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            self._stats['skipped'] += 1
+            return None
+        try:
+            db = get_db()
+            conn = db.get_connection()
+            locked = False
+            try:
+                locked = self._acquire_db_lock(db, conn)
+                if not locked:
+                    self._stats['skipped'] += 1
+                    return None
+
+                started = time.perf_counter()
+                try:
+                    count = auto_complete_past_events(db)
+                except Exception as e:
+                    self._stats['errors'] += 1
+                    self._stats['last_error'] = str(e)
+                    logger.error(f"Status scheduler pass failed: {e}")
+                    return 0
+                duration_ms = (time.perf_counter() - started) * 1000
+
+                self._stats['runs'] += 1
+                self._stats['events_completed'] += count
+                self._stats['last_run_at'] = datetime.now().isoformat()
+                self._stats['last_duration_ms'] = round(duration_ms, 2)
+                self._stats['max_duration_ms'] = round(max(self._stats['max_duration_ms'], duration_ms), 2)
+                self._stats['total_duration_ms'] = round(self._stats['total_duration_ms'] + duration_ms, 2)
+
+                if count:
+                    logger.info(f"Auto-completed {count} events in {duration_ms:.1f}ms")
+                return count
+            finally:
+                if locked:
+                    self._release_db_lock(conn)
+                db.return_connection(conn)
+        finally:
+            self._run_lock.release()
+
+    def _acquire_db_lock(self, db, conn):
+        if db.db_type != 'mysql':
+            return True
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+            row = cursor.fetchone()
+            return bool(row and row[0] == 1)
+        finally:
+            cursor.close()
+
+    def _release_db_lock(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.fetchone()
+            cursor.close()
+        except Exception as e:
+            logger.warning(f"Failed to release scheduler lock: {e}")
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                # Never let the thread die (e.g. DB briefly unavailable)
+                self._stats['errors'] += 1
+                self._stats['last_error'] = str(e)
+                logger.error(f"Status scheduler error: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the background thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='event-status-scheduler')
+        self._thread.daemon = True  # Don't block program exit
+        self._thread.start()
+        logger.info(f"Event status scheduler started (interval {self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        stats = dict(self._stats)
+        stats['interval'] = self.interval
+        stats['running'] = bool(self._thread and self._thread.is_alive())
+        stats['avg_duration_ms'] = round(stats['total_duration_ms'] / stats['runs'], 2) if stats['runs'] else None
+        return stats
+
+
+# Process-wide instance
+scheduler = None
+
+
+def start_scheduler(interval=DEFAULT_INTERVAL):
+    """Create (once) and start the process-wide scheduler"""
+    global scheduler
+    if scheduler is None:
+        scheduler = StatusScheduler(interval)
+    else:
+        scheduler.interval = interval
+    scheduler.start()
+    return scheduler
+
+
+def get_scheduler():
+    return scheduler
+
+
+if __name__ == '__main__':
+    # Standalone worker: python -m backend.status_scheduler [--once]
+    import sys
+    from config import config
+    from database.db import init_db
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    app_config = config['production']
+    init_db(app_config.DB_CONFIG)
+
+    worker = StatusScheduler(app_config.STATUS_SCHEDULER_INTERVAL)
+    if '--once' in sys.argv:
+        print(f"Completed {worker.run_once() or 0} events")
+    else:
+        worker.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            worker.stop()
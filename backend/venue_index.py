@@ -0,0 +1,315 @@
+# ============================================================================
+# VENUE INTERVAL INDEX
+# In-memory per-venue booking index for conflict detection
+# ============================================================================
+#
+# Each venue keeps its active bookings sorted by start time together with the
+# longest booking duration seen. An overlap query for [start, end) only has to
+# look at bookings whose start lies in (start - max_duration, end), found with
+# two bisects, so lookups are O(log n + k) instead of a table scan.
+#
+# Freshness: writes in this process call refresh_event(); changes made by other
+# workers are picked up by a background thread that delta-syncs on
+# events.updated_at (an ON UPDATE column) every sync_interval seconds and
+# fully reloads every reload_interval to catch hard deletes, so lookups never
+# wait on the database. sync_interval=0 instead delta-syncs before every
+# lookup. While the index is cold (not loaded yet) or the refresher has fallen
+# behind, callers fall back to SQL.
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Statuses that can occupy a venue
+ACTIVE_STATUSES = ('Pending', 'Under Review', 'Approved', 'Ongoing')
+
+_COLUMNS = """
+    id, name, venue, start_datetime, end_datetime, status,
+    requestor_id, organizing_department, created_at, updated_at, deleted_at
+"""
+
+
+def _venue_key(venue):
+    # MySQL's default collation compares case- and trailing-space-insensitively
+    return (venue or '').strip().lower()
+
+
+def _to_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).strip().replace('Z', ''))
+
+
+class _VenueBucket:
+    __slots__ = ('keys', 'entries', 'max_len')
+
+    def __init__(self):
+        self.keys = []      # sorted (start_datetime, id)
+        self.entries = {}   # id -> entry
+        self.max_len = timedelta(0)
+
+    def add(self, entry):
+        insort(self.keys, (entry['start_datetime'], entry['id']))
+        self.entries[entry['id']] = entry
+        length = entry['end_datetime'] - entry['start_datetime']
+        if length > self.max_len:
+            self.max_len = length
+
+    def remove(self, entry):
+        key = (entry['start_datetime'], entry['id'])
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+        self.entries.pop(entry['id'], None)
+        # max_len is left as an upper bound; the next full reload tightens it
+
+    def overlaps(self, start, end):
+        lo = bisect_right(self.keys, (start - self.max_len, float('inf')))
+        hi = bisect_left(self.keys, (end, -1))
+        for _, event_id in self.keys[lo:hi]:
+            entry = self.entries[event_id]
+            if entry['end_datetime'] > start:
+                yield entry
+
+
+class VenueIntervalIndex:
+    """Per-venue interval index of active bookings"""
+
+    def __init__(self, enabled=True, sync_interval=2, reload_interval=300):
+        self.enabled = enabled
+        self.sync_interval = sync_interval      # seconds between background delta syncs (0 = before every query)
+        self.reload_interval = reload_interval  # seconds between full reloads
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._buckets = {}
+        self._by_id = {}
+        self._loaded = False
+        self._refresher = None
+        self._watermark = None
+        self._last_sync = 0.0
+        self._last_reload = 0.0
+        self._stats = {
+            'index_queries': 0,
+            'sql_fallbacks': 0,
+            'delta_syncs': 0,
+            'delta_rows': 0,
+            'full_loads': 0,
+            'refresh_errors': 0,
+            'last_load_ms': None,
+        }
+
+    def configure(self, enabled=True, sync_interval=2, reload_interval=300):
+        self.enabled = enabled
+        self.sync_interval = sync_interval
+        self.reload_interval = reload_interval
+
+    # ------------------------------------------------------------------
+    # Loading / maintenance
+    # ------------------------------------------------------------------
+
+    def _apply(self, row):
+        """Insert, move or drop one event row (caller holds self._lock)"""
+        old = self._by_id.pop(row['id'], None)
+        if old is not None:
+            bucket = self._buckets.get(_venue_key(old['venue']))
+            if bucket:
+                bucket.remove(old)
+
+        if (row.get('deleted_at') is not None or row.get('status') not in ACTIVE_STATUSES
+                or not row.get('venue') or not row.get('start_datetime') or not row.get('end_datetime')):
+            return
+
+        entry = {k: row.get(k) for k in (
+            'id', 'name', 'venue', 'start_datetime', 'end_datetime', 'status',
+            'requestor_id', 'organizing_department', 'created_at'
+        )}
+        self._by_id[entry['id']] = entry
+        self._buckets.setdefault(_venue_key(entry['venue']), _VenueBucket()).add(entry)
+
+    def _advance_watermark(self, rows):
+        for row in rows:
+            stamp = row.get('updated_at')
+            if stamp is not None and (self._watermark is None or stamp > self._watermark):
+                self._watermark = stamp
+
+    def load(self, db):
+        """(Re)build the whole index from the events table"""
+        started = time.perf_counter()
+        # Read the watermark first: anything written during the load is re-read by the next delta sync
+        watermark_row = db.execute_one("SELECT MAX(updated_at) as max_updated FROM events")
+        rows = db.execute_query(f"""
+            SELECT {_COLUMNS}
+            FROM events
+            WHERE deleted_at IS NULL
+            AND status IN ({', '.join(['%s'] * len(ACTIVE_STATUSES))})
+        """, ACTIVE_STATUSES)
+
+        with self._lock:
+            self._buckets = {}
+            self._by_id = {}
+            for row in rows:
+                self._apply(row)
+            self._watermark = watermark_row['max_updated'] if watermark_row else None
+            self._loaded = True
+            now = time.monotonic()
+            self._last_sync = now
+            self._last_reload = now
+            self._stats['full_loads'] += 1
+            self._stats['last_load_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"Venue index loaded: {len(rows)} bookings in {self._stats['last_load_ms']}ms")
+
+    def warm_async(self, db):
+        """Start the background loader/refresher unless it is already running"""
+        with self._lock:
+            if not self.enabled or (self._refresher is not None and self._refresher.is_alive()):
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, args=(db,), name='venue-index-refresher')
+            self._refresher.daemon = True
+            self._refresher.start()
+
+    def _refresh_loop(self, db):
+        while self.enabled:
+            try:
+                if not self._loaded or time.monotonic() - self._last_reload >= self.reload_interval:
+                    with self._sync_lock:
+                        self.load(db)
+                elif self.sync_interval > 0 and time.monotonic() - self._last_sync >= self.sync_interval:
+                    self._sync(db)
+            except Exception as e:
+                self._stats['refresh_errors'] += 1
+                logger.error(f"Venue index refresh failed: {e}")
+            # With sync_interval=0 lookups sync themselves; only reloads are left here
+            time.sleep(self.sync_interval or 1)
+
+    def _stale(self):
+        # The refresher has missed several syncs (DB errors, thread gone)
+        return time.monotonic() - self._last_sync > max(self.sync_interval * 5, 30)
+
+    def _sync(self, db):
+        """Apply rows changed since the watermark"""
+        with self._sync_lock:
+            # >= so rows written in the same second as the watermark are re-read
+            if self._watermark is None:
+                rows = db.execute_query(f"SELECT {_COLUMNS} FROM events")
+            else:
+                rows = db.execute_query(
+                    f"SELECT {_COLUMNS} FROM events WHERE updated_at >= %s",
+                    (self._watermark,)
+                )
+            with self._lock:
+                for row in rows:
+                    self._apply(row)
+                self._advance_watermark(rows)
+                self._last_sync = time.monotonic()
+                self._stats['delta_syncs'] += 1
+                self._stats['delta_rows'] += len(rows)
+
+    def refresh_event(self, db, event_id):
+        """Re-read one event after a local write (create/update/status change/delete)"""
+        if not self._loaded:
+            return
+        try:
+            row = db.execute_one(f"SELECT {_COLUMNS} FROM events WHERE id = %s", (event_id,))
+            with self._lock:
+                if row:
+                    self._apply(row)
+                else:
+                    # Hard delete
+                    old = self._by_id.pop(event_id, None)
+                    if old is not None:
+                        bucket = self._buckets.get(_venue_key(old['venue']))
+                        if bucket:
+                            bucket.remove(old)
+        except Exception as e:
+            # Delta sync / full reload will repair the entry
+            logger.warning(f"Venue index refresh failed for event {event_id}: {e}")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def overlaps(self, db, venue, start, end, statuses=ACTIVE_STATUSES, exclude_id=None):
+        """
+        Bookings at venue overlapping [start, end) with status in statuses,
+        sorted by start. Returns None when the index can't answer (cold,
+        disabled or sync failure) so the caller can fall back to SQL.
+        """
+        if not self.enabled:
+            return None
+        if not self._loaded:
+            self.warm_async(db)
+            return None
+        try:
+            start = _to_datetime(start)
+            end = _to_datetime(end)
+            exclude_id = int(exclude_id) if exclude_id else None
+            if self.sync_interval <= 0:
+                self._sync(db)
+            elif self._stale():
+                self.warm_async(db)
+                return None
+        except Exception as e:
+            logger.warning(f"Venue index unavailable, using SQL: {e}")
+            return None
+
+        with self._lock:
+            bucket = self._buckets.get(_venue_key(venue))
+            self._stats['index_queries'] += 1
+            if not bucket:
+                return []
+            return [
+                dict(entry) for entry in bucket.overlaps(start, end)
+                if entry['status'] in statuses and entry['id'] != exclude_id
+            ]
+
+    def note_sql_fallback(self):
+        self._stats['sql_fallbacks'] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'enabled': self.enabled,
+                'loaded': self._loaded,
+                'venues': len(self._buckets),
+                'bookings': len(self._by_id),
+            })
+        return stats
+
+
+# Process-wide instance (configured in app.create_app)
+venue_index = VenueIntervalIndex()
+
+
+def find_overlapping_events(db, venue, start, end, statuses=ACTIVE_STATUSES, exclude_event_id=None):
+    """
+    Events at venue overlapping [start, end) with status in statuses.
+    Served from the interval index when warm, otherwise from SQL.
+    Rows carry id, name, start_datetime, end_datetime, status, requestor_id,
+    organizing_department and created_at.
+    """
+    rows = venue_index.overlaps(db, venue, start, end, statuses, exclude_event_id)
+    if rows is not None:
+        return rows
+
+    venue_index.note_sql_fallback()
+    if isinstance(start, datetime):
+        start = start.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(end, datetime):
+        end = end.strftime('%Y-%m-%d %H:%M:%S')
+    return db.execute_query(f"""
+        SELECT id, name, start_datetime, end_datetime, status,
+               requestor_id, organizing_department, created_at
+        FROM events
+        WHERE venue = %s
+        AND status IN ({', '.join(['%s'] * len(statuses))})
+        AND deleted_at IS NULL
+        AND start_datetime < %s
+        AND end_datetime > %s
+        AND id != %s
+        ORDER BY start_datetime
+    """, (venue, *statuses, end, start, exclude_event_id or 0))
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+JSON serialisation benchmark
+Times the two largest list payloads, the event list (GET /api/events) and
+the attendance list (GET /api/attendance/event/<id>/detailed-list), from
+DB-shaped rows to response bytes:
+
+    before  per-row isoformat()/float() loop + Flask's default provider
+            (stdlib json.dumps per attendee for the streamed list)
+    after   rows as returned by the DB + backend.json_provider.FastJSONProvider
+
+    python benchmark_json_serialization.py
+    python benchmark_json_serialization.py --sizes 100,1000,50000 --repeat 20 --json out.json
+
+Rows are synthetic (generated from --seed) and rebuilt before every timed
+run, so the "before" loop always starts from fresh Decimal/datetime values.
+No database is needed.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from backend.json_provider import FastJSONProvider, orjson
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_REPEAT = 10
+
+EVENT_TYPES = ['Academic', 'Sports', 'Cultural', 'Workshop', 'Seminar']
+VENUES = ['Gymnasium', 'Auditorium', 'Covered Court', 'AVR 1', 'Library Hall']
+DEPARTMENTS = ['BSIT', 'BSCS', 'BSBA', 'BSED', 'BSHM']
+
+
+def event_rows(n, seed):
+    """Rows as get_events has them after the JSON columns are decoded"""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 6, 8)
+    rows = []
+    for i in range(n):
+        start = base + timedelta(days=rng.randint(0, 365), hours=rng.randint(0, 10))
+        rows.append({
+            'id': i + 1,
+            'name': f"{rng.choice(EVENT_TYPES)} Event {i}",
+            'description': 'Synthetic event used by the serialisation benchmark. ' * 3,
+            'event_type': rng.choice(EVENT_TYPES),
+            'status': rng.choice(['Pending', 'Approved', 'Completed']),
+            'start_datetime': start,
+            'end_datetime': start + timedelta(hours=rng.randint(1, 8)),
+            'venue': rng.choice(VENUES),
+            'expected_attendees': rng.randint(20, 800),
+            'budget': Decimal(rng.randint(1000, 200000)) / 100,
+            'organizing_department': rng.choice(DEPARTMENTS),
+            'shared_with_departments': rng.sample(DEPARTMENTS, 2),
+            'requestor_name': 'Juan Dela Cruz',
+            'created_at': start - timedelta(days=14),
+            'updated_at': start - timedelta(days=2),
+            'equipment': [{'name': 'Projector', 'quantity': 2}, {'name': 'Microphone', 'quantity': 4}],
+            'activities': [{'phase': 'Opening', 'startTime': '08:00', 'endTime': '08:30'},
+                           {'phase': 'Program', 'startTime': '08:30', 'endTime': '11:00'}],
+            'budget_breakdown': {'Food': {'amount': 5000, 'percentage': 50},
+                                 'Venue': {'amount': 5000, 'percentage': 50}},
+            'additional_resources': [],
+        })
+    return rows
+
+
+def attendance_rows(n, seed):
+    """Formatted detailed-list attendees (what format_row returns)"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        present = rng.random() < 0.8
+        rows.append({
+            'id': 1000 + i,
+            'name': f"Student {i}",
+            'username': f"student{i}",
+            'section': f"{rng.randint(1, 4)}{rng.choice('ABCD')}",
+            'course': rng.choice(DEPARTMENTS),
+            'status': 'Present' if present else 'Absent',
+            'check_in_time': f"{rng.randint(7, 11):02d}:{rng.randint(0, 59):02d} AM" if present else None,
+            'check_in_method': rng.choice(['QR', 'Manual']) if present else None,
+        })
+    return rows
+
+
+def _legacy_event_loop(rows):
+    # What get_events / get_event / get_approved_events did per row
+    for e in rows:
+        if e.get('budget') is not None:
+            e['budget'] = float(e['budget'])
+        for key in ('start_datetime', 'end_datetime', 'created_at', 'updated_at'):
+            if e.get(key):
+                e[key] = e[key].isoformat()
+    return rows
+
+
+def _stream_body(dumps, rows):
+    # Mirrors api_attendance._stream_attendee_json (chunk joins included)
+    parts = ['{"success": true, "mode": %s, "event": %s, "attendees": [' % (
+        dumps('attendance'), dumps({'name': 'Bench', 'date': '2025-01-06', 'status': 'Completed'}))]
+    parts.append(','.join(dumps(item) for item in rows))
+    parts.append('], "stats": %s}' % dumps({'total': len(rows), 'present': 0, 'absent': 0}))
+    return ''.join(parts).encode()
+
+
+def _time(fn, build_rows, repeat):
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        rows = build_rows()
+        started = time.perf_counter()
+        size = fn(rows)
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3), size
+
+
+def run(sizes, repeat, seed):
+    before_app = Flask('before')
+    after_app = Flask('after')
+    after_app.json = FastJSONProvider(after_app)
+    results = []
+
+    for n in sizes:
+        cases = {
+            'event-list': (
+                lambda: event_rows(n, seed),
+                lambda rows: len(before_app.json.response({'success': True, 'events': _legacy_event_loop(rows), 'count': len(rows)}).get_data()),
+                lambda rows: len(after_app.json.response({'success': True, 'events': rows, 'count': len(rows)}).get_data()),
+            ),
+            'attendance-list': (
+                lambda: attendance_rows(n, seed),
+                lambda rows: len(_stream_body(json.dumps, rows)),
+                lambda rows: len(_stream_body(after_app.json.dumps, rows)),
+            ),
+        }
+        for payload, (build_rows, before, after) in cases.items():
+            with before_app.app_context():
+                before_ms, before_bytes = _time(before, build_rows, repeat)
+            with after_app.app_context():
+                after_ms, after_bytes = _time(after, build_rows, repeat)
+            results.append({
+                'payload': payload,
+                'rows': n,
+                'before_ms': before_ms,
+                'after_ms': after_ms,
+                'speedup': round(before_ms / after_ms, 2) if after_ms else None,
+                'before_bytes': before_bytes,
+                'after_bytes': after_bytes,
+            })
+    return results
+
+
+def print_results(results):
+    header = f"{'payload':<17}{'rows':>8}{'before ms':>11}{'after ms':>10}{'speedup':>9}{'before KB':>11}{'after KB':>10}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['payload']:<17}{r['rows']:>8}{r['before_ms']:>11}{r['after_ms']:>10}{r['speedup']:>8}x"
+              f"{r['before_bytes'] / 1024:>11,.1f}{r['after_bytes'] / 1024:>10,.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON serialisation benchmark')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES), help='comma-separated row counts')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='timed runs per case (median reported)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    print(f"Encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib json (orjson not installed)'}")
+    results = run(sizes, args.repeat, args.seed)
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'sizes': sizes, 'repeat': args.repeat, 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+ML inference latency benchmark
+Seeds a throw-away SQLite stand-in for MySQL with synthetic ai_training_data
+rows (plus events/budgets for suggest-reschedule), trains the models into a
+temporary model directory and drives each ML endpoint through the Flask test
+client, with the app's JSON provider installed. Reports p50/p95/p99 latency
+per endpoint and the peak RSS of the serving process, and exits non-zero when
+a regression threshold is exceeded or any request fails.
+
+    python benchmark_ml_inference.py                        # 100, 1k, 10k rows
+    python benchmark_ml_inference.py --sizes 100,1000,100000 --requests 300
+    python benchmark_ml_inference.py --thresholds my_limits.json --json out.json
+
+Every size is served from a fresh child process so peak RSS is not inflated
+by seeding, training or the previous size. Synthetic data is generated from
+--seed, so runs are reproducible. The prediction cache is disabled so every
+request is computed.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_REQUESTS = 200
+DEFAULT_WARMUP = 20
+
+# p95 latency budgets (ms) per endpoint and peak RSS budget (MB) of the
+# serving process; override with --thresholds <json file> of the same shape
+DEFAULT_THRESHOLDS = {
+    'p95_ms': {
+        'predict-resources': 250.0,
+        'classify-event-type': 25.0,
+        'quick-estimate': 25.0,
+        'suggest-reschedule': 50.0,
+    },
+    'peak_rss_mb': 1024.0,
+}
+
+EVENT_TYPES = ['Academic', 'Sports', 'Cultural', 'Workshop', 'Seminar']
+VENUES = ['Gymnasium', 'Auditorium', 'Covered Court', 'AVR 1', 'AVR 2', 'Library Hall', 'Open Field']
+NAME_WORDS = {
+    'Academic': ['Research', 'Colloquium', 'Thesis', 'Quiz Bee', 'Lecture', 'Symposium'],
+    'Sports': ['Basketball', 'Volleyball', 'Intramurals', 'Fun Run', 'Tournament', 'League'],
+    'Cultural': ['Dance', 'Festival', 'Concert', 'Theater', 'Art Exhibit', 'Heritage Night'],
+    'Workshop': ['Coding', 'Photography', 'Leadership', 'Hands-on', 'Design', 'Bootcamp'],
+    'Seminar': ['Career', 'Mental Health', 'Financial Literacy', 'Safety', 'Orientation', 'Forum'],
+}
+EQUIPMENT = {
+    'Academic': ['Projector', 'Microphone', 'Whiteboard', 'Chairs', 'Tables', 'Laptop'],
+    'Sports': ['Scoreboard', 'First Aid Kit', 'Sound System', 'Timer', 'Whistle', 'Chairs'],
+    'Cultural': ['Stage', 'Sound System', 'Microphone', 'Lighting', 'Decorations', 'Chairs'],
+    'Workshop': ['Projector', 'Laptop', 'Extension Cord', 'Tables', 'Chairs', 'Whiteboard'],
+    'Seminar': ['Projector', 'Microphone', 'Podium', 'Chairs', 'Sound System', 'Banner'],
+}
+RESOURCES = ['Security', 'Janitorial', 'Technical Support', 'Medical Team', 'Photographer', 'Ushers']
+BUDGET_ITEMS = ['Food', 'Venue', 'Equipment', 'Prizes', 'Printing', 'Transportation', 'Honorarium']
+RATES = {'Academic': 150, 'Sports': 200, 'Cultural': 300, 'Workshop': 180, 'Seminar': 160}
+
+SCHEMA = """
+CREATE TABLE ai_training_data (
+    id INTEGER PRIMARY KEY, event_name TEXT, event_type TEXT, attendees INTEGER,
+    total_budget REAL, equipment TEXT, activities TEXT, additional_resources TEXT,
+    budget_breakdown TEXT, venue TEXT, organizer TEXT, description TEXT,
+    is_validated INTEGER, created_at TIMESTAMP, updated_at TIMESTAMP
+);
+CREATE TABLE events (
+    id INTEGER PRIMARY KEY, name TEXT, event_type TEXT, expected_attendees INTEGER,
+    venue TEXT, organizer TEXT, description TEXT, status TEXT,
+    start_datetime TIMESTAMP, end_datetime TIMESTAMP, requestor_id INTEGER,
+    organizing_department TEXT, deleted_at TIMESTAMP, created_at TIMESTAMP, updated_at TIMESTAMP
+);
+CREATE TABLE budgets (
+    id INTEGER PRIMARY KEY, event_id INTEGER, total_budget REAL, updated_at TIMESTAMP
+);
+CREATE INDEX idx_events_venue ON events (venue, start_datetime);
+"""
+
+
+# ============================================================================
+# SQLITE STAND-IN FOR database.db.Database
+# ============================================================================
+
+def _parse_timestamp(value):
+    text = value.decode() if isinstance(value, bytes) else value
+    return datetime.fromisoformat(text)
+
+
+def _dayofweek(value):
+    """MySQL DAYOFWEEK: Sun=1 ... Sat=7"""
+    if not value:
+        return None
+    return datetime.fromisoformat(str(value)).isoweekday() % 7 + 1
+
+
+def _greatest(*values):
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+
+class SQLiteStandIn:
+    """The query methods of database.db.Database the ML endpoints use, over SQLite"""
+
+    db_type = 'sqlite'
+
+    def __init__(self, path):
+        sqlite3.register_converter('TIMESTAMP', _parse_timestamp)
+        self.conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.create_function('DAYOFWEEK', 1, _dayofweek)
+        self.conn.create_function('GREATEST', -1, _greatest)
+
+    @staticmethod
+    def _sql(query):
+        return query.replace('%s', '?')
+
+    @staticmethod
+    def _params(params):
+        return tuple(p.strftime('%Y-%m-%d %H:%M:%S') if isinstance(p, datetime) else p for p in (params or ()))
+
+    def execute_query(self, query, params=None):
+        return [dict(row) for row in self.conn.execute(self._sql(query), self._params(params)).fetchall()]
+
+    def execute_one(self, query, params=None):
+        row = self.conn.execute(self._sql(query), self._params(params)).fetchone()
+        return dict(row) if row else None
+
+    def execute_stream(self, query, params=None, batch_size=500):
+        cursor = self.conn.execute(self._sql(query), self._params(params))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+def _timeline(rng):
+    start = rng.choice([7, 8, 9, 13])
+    phases = ['Registration', 'Opening Program', 'Main Event', 'Closing Program']
+    timeline = []
+    for i, phase in enumerate(phases):
+        timeline.append({
+            'phase': phase,
+            'startTime': f"{start + i:02d}:00",
+            'endTime': f"{start + i + 1:02d}:00",
+        })
+    return timeline
+
+
+def training_row(rng, i, now):
+    event_type = rng.choice(EVENT_TYPES)
+    attendees = rng.randint(20, 800)
+    total_budget = round(attendees * RATES[event_type] * rng.uniform(0.7, 1.4), 2)
+    equipment = [{'name': name, 'quantity': rng.randint(1, 10)}
+                 for name in rng.sample(EQUIPMENT[event_type], rng.randint(2, 5))]
+    breakdown_items = rng.sample(BUDGET_ITEMS, rng.randint(2, 4))
+    shares = [rng.random() for _ in breakdown_items]
+    breakdown = [{'name': name, 'amount': round(total_budget * share / sum(shares), 2)}
+                 for name, share in zip(breakdown_items, shares)]
+    stamp = (now - timedelta(days=rng.randint(0, 900))).strftime('%Y-%m-%d %H:%M:%S')
+    return (
+        i, f"{rng.choice(NAME_WORDS[event_type])} {rng.choice(NAME_WORDS[event_type])} {i}",
+        event_type, attendees, total_budget, json.dumps(equipment), json.dumps(_timeline(rng)),
+        json.dumps(rng.sample(RESOURCES, rng.randint(1, 3))), json.dumps(breakdown),
+        rng.choice(VENUES), 'Student Council', f"Synthetic {event_type.lower()} event #{i}",
+        1, stamp, stamp,
+    )
+
+
+def seed(path, size, rng):
+    """size training rows plus min(size, 2000) scheduled events"""
+    now = datetime.now().replace(microsecond=0)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO ai_training_data VALUES (" + ', '.join(['?'] * 15) + ")",
+        (training_row(rng, i, now) for i in range(1, size + 1))
+    )
+
+    events = []
+    budgets = []
+    for i in range(1, min(size, 2000) + 1):
+        event_type = rng.choice(EVENT_TYPES)
+        start = (now + timedelta(days=rng.randint(-120, 120))).replace(hour=rng.choice([8, 9, 13]), minute=0, second=0)
+        end = start + timedelta(hours=rng.choice([2, 3, 4]))
+        status = 'Completed' if start < now and rng.random() < 0.7 else rng.choice(['Approved', 'Pending'])
+        stamp = now.strftime('%Y-%m-%d %H:%M:%S')
+        events.append((
+            i, f"{rng.choice(NAME_WORDS[event_type])} Event {i}", event_type, rng.randint(20, 500),
+            rng.choice(VENUES), 'Student Council', '', status,
+            start.strftime('%Y-%m-%d %H:%M:%S'), end.strftime('%Y-%m-%d %H:%M:%S'),
+            1, 'BSIT', None, stamp, stamp,
+        ))
+        budgets.append((i, i, rng.randint(5000, 90000), stamp))
+    conn.executemany("INSERT INTO events VALUES (" + ', '.join(['?'] * 15) + ")", events)
+    conn.executemany("INSERT INTO budgets VALUES (?, ?, ?, ?)", budgets)
+    conn.commit()
+    conn.close()
+
+
+def prepare(workdir, size, seed_value):
+    """Seed <workdir>/bench.db and train a model version into <workdir>/models"""
+    from backend.ml_registry import version_dir, activate_version
+    from backend.ml_training import train_all
+    from backend.ml_training_data import TrainingSetCache
+
+    os.makedirs(workdir, exist_ok=True)
+    db_path = os.path.join(workdir, 'bench.db')
+    seed(db_path, size, random.Random(seed_value))
+
+    db = SQLiteStandIn(db_path)
+    df = TrainingSetCache().get(db, full=True)
+    model_dir = os.path.join(workdir, 'models')
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        train_all(df, version_dir(model_dir, 'bench'), 'bench')
+    activate_version(model_dir, 'bench')
+    return db_path, model_dir, round(time.perf_counter() - started, 2)
+
+
+# ============================================================================
+# SERVING WORKER
+# ============================================================================
+
+def _payloads(rng, db, count):
+    """Request bodies per endpoint, generated up front"""
+    events = db.execute_query("SELECT id, venue, start_datetime FROM events ORDER BY id")
+
+    def event_name(event_type):
+        return f"{rng.choice(NAME_WORDS[event_type])} {rng.choice(NAME_WORDS[event_type])} {rng.randint(1, 10**6)}"
+
+    payloads = {'predict-resources': [], 'classify-event-type': [], 'quick-estimate': [], 'suggest-reschedule': []}
+    for _ in range(count):
+        event_type = rng.choice(EVENT_TYPES)
+        payloads['predict-resources'].append({
+            'eventType': event_type, 'attendees': rng.randint(20, 800),
+            'duration': rng.choice([2, 3, 4, 8]), 'eventName': event_name(event_type),
+        })
+        payloads['classify-event-type'].append({'text': event_name(event_type)})
+        payloads['quick-estimate'].append({'eventType': event_type, 'attendees': rng.randint(20, 800)})
+        event = rng.choice(events)
+        payloads['suggest-reschedule'].append({
+            'eventId': event['id'], 'venue': event['venue'],
+            'originalDate': event['start_datetime'].isoformat(),
+        })
+    return payloads
+
+
+def _percentile(sorted_ms, q):
+    if not sorted_ms:
+        return None
+    k = (len(sorted_ms) - 1) * q / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_ms) - 1)
+    return round(sorted_ms[lo] + (sorted_ms[hi] - sorted_ms[lo]) * (k - lo), 3)
+
+
+def serve(db_path, model_dir, requests_per_endpoint, warmup, seed_value):
+    """Benchmark every endpoint in this process; returns the result dict"""
+    from flask import Flask
+    import database.db
+    from backend import api_ml
+    from backend.json_provider import FastJSONProvider
+    from backend.ml_registry import ModelRegistry
+    from backend.ml_prediction_cache import prediction_cache
+    from backend.venue_index import venue_index
+
+    db = SQLiteStandIn(db_path)
+    database.db.db = db
+    api_ml.model_registry = ModelRegistry(model_dir)
+    prediction_cache.configure(max_entries=0)
+    venue_index.configure(enabled=False)  # suggest-reschedule takes the SQL path
+
+    app = Flask(__name__)
+    # The provider create_app installs, so responses are encoded as in production
+    app.json = FastJSONProvider(app)
+    app.register_blueprint(api_ml.ml_bp)
+    client = app.test_client()
+    payloads = _payloads(random.Random(seed_value + 1), db, warmup + requests_per_endpoint)
+
+    results = {}
+    for endpoint, bodies in payloads.items():
+        timings = []
+        failures = 0
+        first_ms = None
+        for n, body in enumerate(bodies):
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                response = client.post(f'/api/ml/{endpoint}', json=body)
+                elapsed = (time.perf_counter() - started) * 1000
+            if first_ms is None:
+                first_ms = round(elapsed, 3)
+            payload = response.get_json(silent=True) or {}
+            if response.status_code != 200 or payload.get('success') is False:
+                failures += 1
+            if n >= warmup:
+                timings.append(elapsed)
+        timings.sort()
+        results[endpoint] = {
+            'requests': len(timings),
+            'failures': failures,
+            'first_ms': first_ms,
+            'p50_ms': _percentile(timings, 50),
+            'p95_ms': _percentile(timings, 95),
+            'p99_ms': _percentile(timings, 99),
+            'max_ms': round(timings[-1], 3) if timings else None,
+        }
+
+    # ru_maxrss is in KB on Linux
+    peak_rss_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return {'endpoints': results, 'peak_rss_mb': peak_rss_mb}
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+def check_thresholds(size, result, thresholds):
+    """Human-readable violations for one size"""
+    violations = []
+    for endpoint, limit in thresholds.get('p95_ms', {}).items():
+        stats = result['endpoints'].get(endpoint)
+        if stats and stats['p95_ms'] is not None and stats['p95_ms'] > limit:
+            violations.append(f"{size} rows: {endpoint} p95 {stats['p95_ms']}ms > {limit}ms")
+        if stats and stats['failures']:
+            violations.append(f"{size} rows: {endpoint} had {stats['failures']} failed requests")
+    limit = thresholds.get('peak_rss_mb')
+    if limit is not None and result['peak_rss_mb'] > limit:
+        violations.append(f"{size} rows: peak RSS {result['peak_rss_mb']}MB > {limit}MB")
+    return violations
+
+
+def print_results(size, train_s, result):
+    print(f"\n{size:,} training rows (trained in {train_s}s, peak RSS {result['peak_rss_mb']} MB)")
+    print(f"  {'endpoint':<22}{'first':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'fail':>6}")
+    for endpoint, stats in result['endpoints'].items():
+        print(f"  {endpoint:<22}{stats['first_ms']:>9.2f}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}"
+              f"{stats['p99_ms']:>9.2f}{stats['max_ms']:>9.2f}{stats['failures']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ML inference latency benchmark')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='comma-separated training-set sizes (100 to 100000)')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='timed requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP, help='untimed requests per endpoint')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--thresholds', help='JSON file overriding DEFAULT_THRESHOLDS')
+    parser.add_argument('--json', help='write the full results to this file')
+    parser.add_argument('--workdir', help='keep seeded databases and models here instead of a temp dir')
+    parser.add_argument('--serve', nargs=2, metavar=('DB', 'MODEL_DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        # Child process: benchmark one prepared size and print JSON
+        result = serve(args.serve[0], args.serve[1], args.requests, args.warmup, args.seed)
+        print(json.dumps(result))
+        return 0
+
+    thresholds = DEFAULT_THRESHOLDS
+    if args.thresholds:
+        with open(args.thresholds) as f:
+            thresholds = {**DEFAULT_THRESHOLDS, **json.load(f)}
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    workdir = args.workdir or tempfile.mkdtemp(prefix='ml_bench_')
+    report = {'requests': args.requests, 'warmup': args.warmup, 'seed': args.seed,
+              'thresholds': thresholds, 'sizes': {}}
+    violations = []
+    try:
+        for size in sizes:
+            print(f"Preparing {size:,} rows...", flush=True)
+            db_path, model_dir, train_s = prepare(os.path.join(workdir, str(size)), size, args.seed)
+            child = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--serve', db_path, model_dir,
+                 '--requests', str(args.requests), '--warmup', str(args.warmup), '--seed', str(args.seed)],
+                capture_output=True, text=True
+            )
+            if child.returncode != 0:
+                print(child.stderr[-2000:])
+                violations.append(f"{size} rows: benchmark worker failed")
+                continue
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+            result['train_s'] = train_s
+            report['sizes'][size] = result
+            print_results(size, train_s, result)
+            violations.extend(check_thresholds(size, result, thresholds))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report['violations'] = violations
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print()
+    if violations:
+        print("❌ Regression thresholds exceeded:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+    print("✅ All endpoints within thresholds")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
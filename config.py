@@ -37,7 +37,18 @@ class Config:
         'database': os.environ.get('DB_NAME') or 'school_event_management',
         'port': int(os.environ.get('DB_PORT') or 3306),
         'autocommit': True,
-        'type': 'mysql'
+        'type': 'mysql',
+        # fix_sql translation cache (DB_SQL_CACHE=0 disables it)
+        'sql_cache': os.environ.get('DB_SQL_CACHE', '1') != '0',
+        'sql_cache_size': int(os.environ.get('DB_SQL_CACHE_SIZE') or 512),
+        # Connection pool
+        'pool_min_size': int(os.environ.get('DB_POOL_MIN') or 2),
+        'pool_max_size': int(os.environ.get('DB_POOL_MAX') or 10),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT') or 10),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE') or 3600),
+        'pool_ping_interval': int(os.environ.get('DB_POOL_PING_INTERVAL') or 30),
+        # Reuse one connection per request for all views (DB_REQUEST_SCOPED=1)
+        'request_scoped': os.environ.get('DB_REQUEST_SCOPED', '0') == '1'
     }
     
     # CORS configuration
@@ -61,6 +72,31 @@ class Config:
     RATELIMIT_ENABLED = True
     RATELIMIT_DEFAULT = "100 per minute"
     
+    # Background event status scheduler (auto-completes past events)
+    STATUS_SCHEDULER_ENABLED = os.environ.get('STATUS_SCHEDULER_ENABLED', '1') != '0'
+    STATUS_SCHEDULER_INTERVAL = int(os.environ.get('STATUS_SCHEDULER_INTERVAL') or 60)  # seconds
+    
+    # In-memory venue conflict index (backend/venue_index.py)
+    VENUE_INDEX_ENABLED = os.environ.get('VENUE_INDEX_ENABLED', '1') != '0'
+    VENUE_INDEX_SYNC_INTERVAL = float(os.environ.get('VENUE_INDEX_SYNC_INTERVAL') or 2)  # background delta syncs; 0 = before every lookup
+    VENUE_INDEX_RELOAD_INTERVAL = int(os.environ.get('VENUE_INDEX_RELOAD_INTERVAL') or 300)
+    
+    # In-memory ML training set (backend/ml_training_data.py)
+    ML_TRAINING_SYNC_INTERVAL = float(os.environ.get('ML_TRAINING_SYNC_INTERVAL') or 5)  # seconds between delta syncs
+    ML_TRAINING_RELOAD_INTERVAL = int(os.environ.get('ML_TRAINING_RELOAD_INTERVAL') or 600)
+    
+    # Model training jobs (backend/ml_training.py)
+    ML_TRAINING_WORKERS = int(os.environ.get('ML_TRAINING_WORKERS') or 0)  # 0 = by CPUs and free memory
+    ML_FOREST_ESTIMATORS = int(os.environ.get('ML_FOREST_ESTIMATORS') or 10)
+    ML_FOREST_MAX_DEPTH = int(os.environ.get('ML_FOREST_MAX_DEPTH') or 5)
+    
+    # Prediction result cache (backend/ml_prediction_cache.py)
+    ML_PREDICTION_CACHE_SIZE = int(os.environ.get('ML_PREDICTION_CACHE_SIZE') or 2048)  # 0 = disabled
+    ML_PREDICTION_CACHE_TTL = int(os.environ.get('ML_PREDICTION_CACHE_TTL') or 300)  # seconds
+    
+    # Event listing cache, invalidated by table version (backend/response_cache.py)
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE') or 1024)  # 0 = disabled
+    
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
     LOG_FILE = 'logs/app.log'
@@ -86,6 +122,7 @@ class TestingConfig(Config):
     """Testing configuration"""
     DEBUG = True
     TESTING = True
+    STATUS_SCHEDULER_ENABLED = False
     DB_CONFIG = {
         'host': 'localhost',
         'user': 'root',
@@ -8,13 +8,101 @@ import mysql.connector
 import sqlite3
     
 from contextlib import contextmanager
+from functools import wraps
 import logging
 import threading
-from queue import Queue, Empty, Full
+from collections import OrderedDict, deque
 import os
+import re
+import time
+
+# Flask is optional here so standalone scripts can still use Database
+try:
+    from flask import g, has_app_context
+except ImportError:
+    g = None
+    has_app_context = lambda: False
 
 logger = logging.getLogger(__name__)
 
+# Precompiled dialect-translation patterns (used by Database._translate_sql)
+_RE_TO_CHAR_DATE = re.compile(r"TO_CHAR\(([^,]+),\s*'YYYY-MM-DD'\)", re.IGNORECASE)
+_RE_TO_CHAR_MONTH = re.compile(r"TO_CHAR\(([^,]+),\s*'YYYY-MM'\)", re.IGNORECASE)
+_RE_COUNT_STAR_FILTER = re.compile(r"COUNT\(\*\)\s+FILTER\s+\(WHERE\s+([^)]+)\)", re.IGNORECASE)
+_RE_COUNT_COL_FILTER = re.compile(r"COUNT\(([^)]+)\)\s+FILTER\s+\(WHERE\s+([^)]+)\)", re.IGNORECASE)
+_RE_STRING_AGG = re.compile(r"STRING_AGG\(([^,]+),\s*'([^']+)'\)", re.IGNORECASE)
+
+# Target table of a write statement (reported to write listeners)
+_RE_WRITE_TABLE = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE(?:\s+IGNORE)?|DELETE\s+FROM)\s+`?(\w+)",
+    re.IGNORECASE)
+
+# Default number of distinct statements kept in the fix_sql cache
+DEFAULT_SQL_CACHE_SIZE = 512
+
+# Rows fetched per round trip by execute_stream
+DEFAULT_STREAM_BATCH_SIZE = 500
+
+# Rows per statement for execute_insert_many
+DEFAULT_INSERT_CHUNK_SIZE = 500
+
+# Connection pool defaults (overridable via DB_CONFIG)
+DEFAULT_POOL_MIN_SIZE = 2
+DEFAULT_POOL_MAX_SIZE = 10
+DEFAULT_POOL_TIMEOUT = 10        # seconds to wait for a free connection
+DEFAULT_POOL_RECYCLE = 3600      # close connections older than this (seconds)
+DEFAULT_POOL_PING_INTERVAL = 30  # ping only if idle longer than this (seconds)
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no pooled connection becomes available in time"""
+
+
+def build_multi_insert(table, columns, rows):
+    """
+    Build "INSERT INTO table (cols) VALUES (%s, ...), (%s, ...)" and its flat
+    parameter tuple. table/columns are trusted identifiers, never user input.
+    """
+    placeholders = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    query = "INSERT INTO {} ({}) VALUES {}".format(
+        table, ', '.join(columns), ', '.join([placeholders] * len(rows))
+    )
+    params = tuple(value for row in rows for value in row)
+    return query, params
+
+
+class _WriteTrackingCursor:
+    """Cursor proxy that records which tables its statements wrote to"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.tables = set()
+
+    def _note(self, query):
+        match = _RE_WRITE_TABLE.match(query) if isinstance(query, str) else None
+        if match:
+            self.tables.add(match.group(1).lower())
+
+    def execute(self, query, *args, **kwargs):
+        self._note(query)
+        return self._cursor.execute(query, *args, **kwargs)
+
+    def executemany(self, query, *args, **kwargs):
+        self._note(query)
+        return self._cursor.executemany(query, *args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _is_connection_error(exc):
+    """True if exc means the underlying connection is unusable"""
+    return isinstance(exc, (mysql.connector.errors.InterfaceError,
+                            mysql.connector.errors.OperationalError))
+
 
 class Database:
     """Database connection manager (MySQL Optimized)"""
@@ -22,12 +110,47 @@ class Database:
     def __init__(self, config):
         """Initialize database connection pool"""
         self.config = config
-        self.pool_size = 10
-        self._pool = Queue(maxsize=self.pool_size)
+        self.pool_max_size = int(config.get('pool_max_size', DEFAULT_POOL_MAX_SIZE))
+        self.pool_min_size = min(int(config.get('pool_min_size', DEFAULT_POOL_MIN_SIZE)), self.pool_max_size)
+        self.pool_timeout = float(config.get('pool_timeout', DEFAULT_POOL_TIMEOUT))
+        self.pool_recycle = float(config.get('pool_recycle', DEFAULT_POOL_RECYCLE))
+        self.pool_ping_interval = float(config.get('pool_ping_interval', DEFAULT_POOL_PING_INTERVAL))
+        self.pool_size = self.pool_max_size
+
+        # Idle connections as (conn, last_used); LIFO so hot connections stay warm
+        self._idle = deque()
+        self._conn_created = {}  # id(conn) -> creation time, for every live pooled connection
+        self._total = 0
+        self._in_use = 0
+        self._closed = False     # set by close(); returned connections are then closed, not pooled
         self._lock = threading.Lock()
+        self._pool_cond = threading.Condition(self._lock)
+        self._stats = {
+            'creates': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'timeouts': 0,
+            'recycled': 0,
+            'ping_failures': 0,
+        }
         
         # Determine DB type
         self.db_type = 'mysql'
+
+        # fix_sql translation cache (set 'sql_cache': False in DB_CONFIG to opt out)
+        self._sql_cache = OrderedDict()
+        self._sql_cache_lock = threading.Lock()
+        self._sql_cache_size = int(config.get('sql_cache_size', DEFAULT_SQL_CACHE_SIZE))
+        self._sql_cache_enabled = bool(config.get('sql_cache', True)) and self._sql_cache_size > 0
+        self._sql_cache_hits = 0
+        self._sql_cache_misses = 0
+
+        # Bind one connection per Flask request for every view (see request_scoped)
+        self.request_scoped = bool(config.get('request_scoped', False))
+
+        # Called with (db, tables) after each committed write (see add_write_listener)
+        self._write_listeners = []
+
         logger.info(f"Database initialized. Type: {self.db_type}")
         
     def _create_connection(self):
@@ -56,72 +179,305 @@ class Database:
             logger.error(f"Database connection error: {e}")
             raise
     
-    def get_connection(self):
-        """Get connection from pool or create new one"""
+    def _ping(self, conn):
+        """Cheap liveness check (single COM_PING, no reconnect)"""
         try:
-            conn = self._pool.get_nowait()
-            # Verify connection
-            is_valid = False
-            try:
-                if self.db_type == 'mysql':
-                    if conn.is_connected(): is_valid = True
-                else:
-                    conn.execute("SELECT 1")
-                    is_valid = True
-            except:
-                pass
-            
-            if is_valid:
-                return conn
+            if self.db_type == 'mysql':
+                conn.ping(reconnect=False)
             else:
-                try: conn.close()
-                except: pass
-        except Empty:
-            pass
-        
-        return self._create_connection()
-    
-    def return_connection(self, conn):
-        """Return connection to pool"""
-        is_open = False
-        if conn:
+                conn.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        """Close a pooled connection and release its slot"""
+        try: conn.close()
+        except: pass
+        with self._pool_cond:
+            if self._conn_created.pop(id(conn), None) is not None:
+                self._total -= 1
+            self._pool_cond.notify()
+
+    def prewarm(self):
+        """Open connections until the pool holds pool_min_size idle ones"""
+        opened = 0
+        while True:
+            with self._pool_cond:
+                if self._closed or self._total >= self.pool_min_size or self._total >= self.pool_max_size:
+                    break
+                self._total += 1
             try:
-                if self.db_type == 'mysql':
-                    if conn.is_connected(): is_open = True
-                    # Consume any unread results to prevent "Unread result found"
-                    try: 
-                        while conn.next_result(): pass
-                    except: pass
-                else:
-                    is_open = True
-            except:
-                pass
+                conn = self._create_connection()
+            except Exception:
+                with self._pool_cond:
+                    self._total -= 1
+                    self._pool_cond.notify()
+                raise
+            now = time.monotonic()
+            with self._pool_cond:
+                self._conn_created[id(conn)] = now
+                self._idle.append((conn, now))
+                self._stats['creates'] += 1
+                self._pool_cond.notify()
+            opened += 1
+        if opened:
+            logger.info(f"Connection pool pre-warmed with {opened} connections")
+        return opened
+
+    def get_connection(self):
+        """
+        Check a connection out of the pool.
+        Reuses an idle connection when possible, opens a new one while below
+        pool_max_size, otherwise blocks up to pool_timeout seconds.
+        """
+        deadline = None
+        waited = False
+        wait_started = None
+
+        while True:
+            conn = None
+            create = False
+            with self._pool_cond:
+                while True:
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._total < self.pool_max_size:
+                        self._total += 1
+                        create = True
+                        break
+
+                    # Pool exhausted: wait for a connection to be returned
+                    now = time.monotonic()
+                    if deadline is None:
+                        deadline = now + self.pool_timeout
+                        wait_started = now
+                        waited = True
+                        self._stats['waits'] += 1
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        self._stats['wait_time'] += now - wait_started
+                        raise PoolTimeoutError(
+                            f"No database connection available within {self.pool_timeout}s "
+                            f"(max {self.pool_max_size} in use)"
+                        )
+                    self._pool_cond.wait(remaining)
+
+                if waited:
+                    self._stats['wait_time'] += time.monotonic() - wait_started
+                    waited = False
+
+            if create:
+                try:
+                    conn = self._create_connection()
+                except Exception:
+                    with self._pool_cond:
+                        self._total -= 1
+                        self._pool_cond.notify()
+                    raise
+                with self._pool_cond:
+                    self._conn_created[id(conn)] = time.monotonic()
+                    self._stats['creates'] += 1
+                    self._in_use += 1
+                return conn
+
+            # Recycle connections older than pool_recycle
+            now = time.monotonic()
+            created = self._conn_created.get(id(conn), now)
+            if self.pool_recycle and now - created > self.pool_recycle:
+                with self._pool_cond:
+                    self._stats['recycled'] += 1
+                self._discard(conn)
+                continue
+
+            # Only ping connections that sat idle long enough to have been dropped
+            if now - last_used > self.pool_ping_interval and not self._ping(conn):
+                with self._pool_cond:
+                    self._stats['ping_failures'] += 1
+                self._discard(conn)
+                continue
+
+            with self._pool_cond:
+                self._in_use += 1
+            return conn
 
-        if is_open:
+    def return_connection(self, conn, discard=False):
+        """Return connection to pool (or close it if broken / discard=True)"""
+        if not conn:
+            return
+
+        if not discard and self.db_type == 'mysql':
+            # Consume any unread results to prevent "Unread result found"
             try:
-                self._pool.put_nowait(conn)
-            except Full:
-                try: conn.close()
-                except: pass
-        elif conn:
+                while conn.next_result(): pass
+            except: pass
+
+        with self._pool_cond:
+            pooled = id(conn) in self._conn_created
+            if pooled:
+                self._in_use -= 1
+
+        if not pooled:
+            # Not created by this pool (e.g. pool was closed meanwhile)
             try: conn.close()
             except: pass
-    
+            return
+
+        if not discard:
+            with self._pool_cond:
+                if not self._closed:
+                    self._idle.append((conn, time.monotonic()))
+                    self._pool_cond.notify()
+                    return
+        # Broken, discarded, or checked out when the pool was closed
+        self._discard(conn)
+
+    def pool_stats(self):
+        """Return connection pool statistics"""
+        with self._pool_cond:
+            stats = dict(self._stats)
+            stats.update({
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'total': self._total,
+                'min_size': self.pool_min_size,
+                'max_size': self.pool_max_size,
+            })
+        stats['wait_time'] = round(stats['wait_time'], 4)
+        return stats
+
     def close(self):
-        """Close all connections"""
-        while True:
-            try:
-                conn = self._pool.get_nowait()
-                try: conn.close()
-                except: pass
-            except Empty:
-                break
+        """
+        Close all idle connections and mark the pool closed: connections
+        checked out now are closed when they are returned instead of pooled.
+        """
+        with self._pool_cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            for conn, _ in idle:
+                if self._conn_created.pop(id(conn), None) is not None:
+                    self._total -= 1
+            self._pool_cond.notify_all()
+        for conn, _ in idle:
+            try: conn.close()
+            except: pass
         logger.info("All database connections closed")
 
+    # ------------------------------------------------------------------
+    # Request-scoped connections
+    # One pooled connection per Flask request, checked out lazily on the
+    # first query and returned on teardown. Enabled per view with
+    # @request_scoped or app-wide with 'request_scoped': True in DB_CONFIG.
+    # ------------------------------------------------------------------
+
+    def _request_scope_active(self):
+        if not has_app_context():
+            return False
+        return bool(self.request_scoped or g.get('_db_request_scoped'))
+
+    def _acquire(self):
+        """Return (connection, is_request_scoped) for a single query"""
+        if self._request_scope_active():
+            conn = g.get('_db_conn')
+            if conn is None:
+                conn = self.get_connection()
+                g._db_conn = conn
+            return conn, True
+        return self.get_connection(), False
+
+    def _release(self, conn, scoped, broken=False):
+        """Counterpart of _acquire"""
+        if not scoped:
+            self.return_connection(conn, discard=broken)
+        elif broken:
+            # Drop the bad connection; the next query checks out a fresh one
+            g.pop('_db_conn', None)
+            self.return_connection(conn, discard=True)
+
+    def release_request_connection(self, exc=None):
+        """Teardown hook: return the request-bound connection to the pool"""
+        if not has_app_context():
+            return
+        conn = g.pop('_db_conn', None)
+        if conn is not None:
+            self.return_connection(conn)
+
+    def init_app(self, app):
+        """Register the request-scope teardown on a Flask app"""
+        app.teardown_appcontext(self.release_request_connection)
+
+    # ------------------------------------------------------------------
+    # Write listeners
+    # Statements run through get_cursor / get_transaction (and so every
+    # execute_* helper) are matched against INSERT/REPLACE/UPDATE/DELETE;
+    # once the write is committed each listener gets the set of target
+    # tables. Connections opened outside Database are not seen.
+    # ------------------------------------------------------------------
+
+    def add_write_listener(self, listener):
+        """Register listener(db, tables), called after each committed write"""
+        if listener not in self._write_listeners:
+            self._write_listeners.append(listener)
+
+    def _notify_write(self, tables):
+        for listener in list(self._write_listeners):
+            try:
+                listener(self, tables)
+            except Exception as e:
+                # The write itself already succeeded
+                logger.error(f"Write listener error: {e}")
+
     def fix_sql(self, query):
         """
-        Adapt SQL query for the target database dialect (MySQL/PostgreSQL)
+        Adapt SQL query for the target database dialect (MySQL/PostgreSQL).
+        Translations are memoised per (query, dialect) in a bounded LRU cache.
         """
+        if not self._sql_cache_enabled:
+            return self._translate_sql(query)
+
+        key = (query, self.db_type)
+        with self._sql_cache_lock:
+            cached = self._sql_cache.get(key)
+            if cached is not None:
+                self._sql_cache.move_to_end(key)
+                self._sql_cache_hits += 1
+                return cached
+            self._sql_cache_misses += 1
+
+        translated = self._translate_sql(query)
+
+        with self._sql_cache_lock:
+            self._sql_cache[key] = translated
+            self._sql_cache.move_to_end(key)
+            while len(self._sql_cache) > self._sql_cache_size:
+                self._sql_cache.popitem(last=False)
+        return translated
+
+    def sql_cache_stats(self):
+        """Return hit/miss counters for the fix_sql translation cache"""
+        with self._sql_cache_lock:
+            total = self._sql_cache_hits + self._sql_cache_misses
+            return {
+                'enabled': self._sql_cache_enabled,
+                'size': len(self._sql_cache),
+                'max_size': self._sql_cache_size,
+                'hits': self._sql_cache_hits,
+                'misses': self._sql_cache_misses,
+                'hit_rate': round(self._sql_cache_hits / total, 4) if total else 0.0
+            }
+
+    def clear_sql_cache(self):
+        """Drop all cached translations and reset counters"""
+        with self._sql_cache_lock:
+            self._sql_cache.clear()
+            self._sql_cache_hits = 0
+            self._sql_cache_misses = 0
+
+    def _translate_sql(self, query):
+        """Uncached dialect translation used by fix_sql"""
         if self.db_type == 'mysql':
             # 1. Remove RETURNING clause (MySQL doesn't support it for INSERT/UPDATE)
             if 'RETURNING' in query:
@@ -144,9 +500,8 @@ class Database:
                 query = query.replace("TO_CHAR(e.start_datetime, 'YYYY-MM')", "DATE_FORMAT(e.start_datetime, '%Y-%m')")
                 
                 # Manual regex fallback for generic usage (basic)
-                import re
-                query = re.sub(r"TO_CHAR\(([^,]+),\s*'YYYY-MM-DD'\)", r"DATE_FORMAT(\1, '%Y-%m-%d')", query, flags=re.IGNORECASE)
-                query = re.sub(r"TO_CHAR\(([^,]+),\s*'YYYY-MM'\)", r"DATE_FORMAT(\1, '%Y-%m')", query, flags=re.IGNORECASE)
+                query = _RE_TO_CHAR_DATE.sub(r"DATE_FORMAT(\1, '%Y-%m-%d')", query)
+                query = _RE_TO_CHAR_MONTH.sub(r"DATE_FORMAT(\1, '%Y-%m')", query)
 
             # 4. Replace ILIKE with LIKE (MySQL is case-insensitive by default)
             query = query.replace('ILIKE', 'LIKE')
@@ -168,18 +523,16 @@ class Database:
             # 6. Replace FILTER (WHERE ...) with CASE WHEN
             # e.g. COUNT(*) FILTER (WHERE status = 'Completed')
             if 'FILTER' in query:
-                import re
                 # Pattern: COUNT(*) FILTER (WHERE condition) -> SUM(CASE WHEN condition THEN 1 ELSE 0 END)
                 # Note: This regex is fragile. Best effort.
-                query = re.sub(r"COUNT\(\*\)\s+FILTER\s+\(WHERE\s+([^)]+)\)", r"SUM(CASE WHEN \1 THEN 1 ELSE 0 END)", query, flags=re.IGNORECASE)
+                query = _RE_COUNT_STAR_FILTER.sub(r"SUM(CASE WHEN \1 THEN 1 ELSE 0 END)", query)
                 # Pattern: COUNT(col) FILTER (WHERE condition)
-                query = re.sub(r"COUNT\(([^)]+)\)\s+FILTER\s+\(WHERE\s+([^)]+)\)", r"COUNT(CASE WHEN \2 THEN \1 END)", query, flags=re.IGNORECASE)
+                query = _RE_COUNT_COL_FILTER.sub(r"COUNT(CASE WHEN \2 THEN \1 END)", query)
                 
             # 7. Replace STRING_AGG with GROUP_CONCAT
             if 'STRING_AGG' in query:
                 # Approx replacement: STRING_AGG(name, ',') -> GROUP_CONCAT(name SEPARATOR ',')
-                import re
-                query = re.sub(r"STRING_AGG\(([^,]+),\s*'([^']+)'\)", r"GROUP_CONCAT(\1 SEPARATOR '\2')", query, flags=re.IGNORECASE)
+                query = _RE_STRING_AGG.sub(r"GROUP_CONCAT(\1 SEPARATOR '\2')", query)
 
         return query
 
@@ -188,20 +541,25 @@ class Database:
         """Context manager for database cursor"""
         conn = None
         cursor = None
+        tracker = None
+        broken = False
+        scoped = False
         try:
-            conn = self.get_connection()
+            conn, scoped = self._acquire()
             # create cursor
             if self.db_type == 'mysql':
                 cursor = conn.cursor(dictionary=True, buffered=True)
             else:
                 cursor = conn.cursor()
-            yield cursor
+            tracker = _WriteTrackingCursor(cursor) if self._write_listeners else None
+            yield tracker or cursor
             
             # Commit logic
             if not self.config.get('autocommit', True):
                 conn.commit()
                 
         except Exception as e:
+            broken = _is_connection_error(e)
             if conn and not self.config.get('autocommit', True):
                 try: conn.rollback()
                 except: pass
@@ -212,20 +570,27 @@ class Database:
                 try: cursor.close()
                 except: pass
             if conn:
-                self.return_connection(conn)
+                self._release(conn, scoped, broken)
+        if tracker is not None and tracker.tables:
+            self._notify_write(tracker.tables)
     
     @contextmanager
     def get_transaction(self):
         """Context manager for manual transaction"""
         conn = None
         cursor = None
+        tracker = None
+        broken = False
+        scoped = False
         try:
-            conn = self.get_connection()
+            conn, scoped = self._acquire()
             cursor = conn.cursor(dictionary=True) if self.db_type == 'mysql' else conn.cursor()
+            tracker = _WriteTrackingCursor(cursor) if self._write_listeners else None
             conn.autocommit = False
-            yield cursor
+            yield tracker or cursor
             conn.commit()
         except Exception as e:
+            broken = _is_connection_error(e)
             if conn:
                 try: conn.rollback()
                 except: pass
@@ -238,7 +603,9 @@ class Database:
             if conn:
                 try: conn.autocommit = self.config.get('autocommit', True)
                 except: pass
-                self.return_connection(conn)
+                self._release(conn, scoped, broken)
+        if tracker is not None and tracker.tables:
+            self._notify_write(tracker.tables)
     
     def execute_query(self, query, params=None):
         query = self.fix_sql(query)
@@ -273,6 +640,75 @@ class Database:
             # Fallback
             return getattr(cursor, 'lastrowid', None)
             
+    def execute_many(self, query, seq_of_params):
+        """
+        Run one statement for many parameter tuples inside a single transaction.
+        mysql-connector rewrites INSERT ... VALUES into one multi-row INSERT, so
+        bulk inserts cost one round trip. Returns total affected rows.
+        """
+        seq_of_params = list(seq_of_params)
+        if not seq_of_params:
+            return 0
+        query = self.fix_sql(query)
+        with self.get_transaction() as cursor:
+            cursor.executemany(query, seq_of_params)
+            return cursor.rowcount
+
+    def execute_insert_many(self, table, columns, rows, chunk_size=DEFAULT_INSERT_CHUNK_SIZE):
+        """
+        Insert rows with explicit multi-row VALUES statements (chunk_size rows
+        per statement), all inside one transaction. Returns inserted row count.
+        """
+        rows = [tuple(row) for row in rows]
+        if not rows:
+            return 0
+        inserted = 0
+        with self.get_transaction() as cursor:
+            for i in range(0, len(rows), chunk_size):
+                query, params = build_multi_insert(table, columns, rows[i:i + chunk_size])
+                cursor.execute(self.fix_sql(query), params)
+                inserted += cursor.rowcount
+        return inserted
+
+    def execute_stream(self, query, params=None, batch_size=DEFAULT_STREAM_BATCH_SIZE):
+        """
+        Generator over result rows using an unbuffered (server-side) cursor.
+        Rows are pulled with fetchmany(batch_size), so memory stays flat no
+        matter how large the result set is. The connection is held until the
+        generator is exhausted or closed and is never the request-scoped one.
+        """
+        query = self.fix_sql(query)
+        conn = self.get_connection()
+        cursor = None
+        broken = False
+        exhausted = False
+        try:
+            if self.db_type == 'mysql':
+                cursor = conn.cursor(dictionary=True, buffered=False)
+            else:
+                cursor = conn.cursor()
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+            exhausted = True
+        except Exception as e:
+            broken = _is_connection_error(e)
+            logger.error(f"Database stream error: {e}")
+            raise
+        finally:
+            if cursor is not None and not exhausted and not broken and self.db_type == 'mysql':
+                # Stopped early: drain the unread result so the connection can be reused
+                try: conn.consume_results()
+                except Exception: broken = True
+            if cursor:
+                try: cursor.close()
+                except: pass
+            self.return_connection(conn, discard=broken)
+
     def execute_update(self, query, params=None):
         query = self.fix_sql(query)
         with self.get_cursor() as cursor:
@@ -285,9 +721,14 @@ db = None
 
 
 def init_db(config):
-    """Initialize global database instance"""
+    """Initialize global database instance and pre-warm its pool"""
     global db
     db = Database(config)
+    try:
+        db.prewarm()
+    except Exception as e:
+        # Don't block app startup; connections will be opened on demand
+        logger.warning(f"Connection pool pre-warm failed: {e}")
     return db
 
 
@@ -296,3 +737,16 @@ def get_db():
     if db is None:
         raise RuntimeError("Database not initialized. Call init_db() first.")
     return db
+
+
+def request_scoped(f):
+    """
+    View decorator: reuse one pooled connection for every query in the request.
+    The connection is returned by Database.release_request_connection on teardown.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if has_app_context():
+            g._db_request_scoped = True
+        return f(*args, **kwargs)
+    return decorated_function
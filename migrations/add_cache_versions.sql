@@ -0,0 +1,5 @@
+-- Per-table write counters for the event listing cache (backend/response_cache.py)
+CREATE TABLE IF NOT EXISTS cache_versions (
+    name VARCHAR(64) PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0
+) ENGINE=InnoDB;
@@ -0,0 +1,2 @@
+-- Keyset pagination for GET /api/events (ORDER BY start_datetime DESC, id DESC)
+CREATE INDEX idx_events_start_id ON events (start_datetime, id);
@@ -0,0 +1,3 @@
+-- Indexes backing venue conflict checks and the in-memory venue index delta sync
+CREATE INDEX idx_events_venue_time ON events (venue, start_datetime, end_datetime);
+CREATE INDEX idx_events_updated_at ON events (updated_at);
@@ -0,0 +1,2 @@
+-- Covers the per-user count/unread/MAX(id) lookup behind the GET /api/notifications ETag
+CREATE INDEX idx_notifications_user_read ON notifications (user_id, is_read);
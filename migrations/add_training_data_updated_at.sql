@@ -0,0 +1,5 @@
+-- Change tracking for the in-memory ML training set (delta sync on updated_at)
+ALTER TABLE ai_training_data
+    ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP;
+CREATE INDEX idx_ai_training_data_updated_at ON ai_training_data (updated_at);
+CREATE INDEX idx_budgets_updated_at ON budgets (updated_at);
@@ -0,0 +1,18 @@
+-- Background model training jobs (backend/ml_training.py)
+CREATE TABLE IF NOT EXISTS training_jobs (
+    id VARCHAR(32) PRIMARY KEY,
+    status ENUM('queued', 'running', 'completed', 'failed') NOT NULL DEFAULT 'queued',
+    stage VARCHAR(50) DEFAULT NULL,
+    progress TINYINT UNSIGNED NOT NULL DEFAULT 0,
+    stage_timings JSON DEFAULT NULL,
+    metrics JSON DEFAULT NULL,
+    model_version VARCHAR(32) NOT NULL,
+    samples INT NOT NULL DEFAULT 0,
+    requested_by INT DEFAULT NULL,
+    error_message TEXT,
+    created_at DATETIME NOT NULL,
+    started_at DATETIME DEFAULT NULL,
+    completed_at DATETIME DEFAULT NULL,
+    INDEX idx_training_jobs_status (status),
+    INDEX idx_training_jobs_created_at (created_at)
+) ENGINE=InnoDB;
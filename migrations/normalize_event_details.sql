@@ -0,0 +1,32 @@
+-- Indexed side tables for the events JSON columns (backend/event_details.py)
+-- Requires database/add_event_details_tables.sql. After applying, run
+-- `flask backfill-event-details` once; events not backfilled yet are read
+-- from their JSON columns in the meantime.
+
+-- events.equipment items, including the per-item approval fields
+ALTER TABLE event_equipment
+    ADD COLUMN approved_quantity INT NULL AFTER quantity,
+    ADD COLUMN item_status VARCHAR(30) NULL AFTER approved_quantity,
+    ADD COLUMN sequence_order INT NOT NULL DEFAULT 0 AFTER item_status,
+    ADD INDEX idx_event_equipment_name (equipment_name, event_id);
+
+-- events.timeline phases
+ALTER TABLE event_activities
+    ADD COLUMN start_time VARCHAR(20) NULL AFTER activity_name,
+    ADD COLUMN end_time VARCHAR(20) NULL AFTER start_time;
+
+-- events.shared_with_departments
+CREATE TABLE IF NOT EXISTS event_shared_departments (
+    event_id INT NOT NULL,
+    department VARCHAR(100) NOT NULL,
+    PRIMARY KEY (event_id, department),
+    INDEX idx_shared_department (department, event_id),
+    FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- Events whose side tables match their JSON columns
+CREATE TABLE IF NOT EXISTS event_details_synced (
+    event_id INT PRIMARY KEY,
+    synced_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
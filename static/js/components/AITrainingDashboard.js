@@ -55,10 +55,38 @@ window.AITrainingDashboard = function AITrainingDashboard() {
       const data = await response.json();
 
       if (data.success) {
-        alert('AI models retrained successfully! Predictions will be even better now.');
-        loadStats();
+        // Training runs in the background; wait for the job to finish.
+        // A poll that can't find the job (404, another worker without the
+        // training_jobs table, network error) is retried, never read as success.
+        const MAX_MISSED_POLLS = 10;
+        let job = data.job;
+        let missed = 0;
+        while (job && (job.status === 'queued' || job.status === 'running') && missed < MAX_MISSED_POLLS) {
+          await new Promise(resolve => setTimeout(resolve, 1000));
+          try {
+            const jobResponse = await fetch(data.status_url, { credentials: 'include' });
+            const jobData = await jobResponse.json();
+            if (jobResponse.ok && jobData.success && jobData.job) {
+              job = jobData.job;
+              missed = 0;
+            } else {
+              missed++;
+            }
+          } catch (pollError) {
+            missed++;
+          }
+        }
+
+        if (job && job.status === 'completed') {
+          alert('AI models retrained successfully! Predictions will be even better now.');
+          loadStats();
+        } else if (job && job.status === 'failed') {
+          alert('Training failed: ' + (job.error || 'unknown error'));
+        } else {
+          alert('Could not confirm the training result. The models may still be training; check again in a few minutes.');
+        }
       } else {
-        alert('Training failed: ' + data.message);
+        alert('Training failed: ' + (data.message || data.error));
       }
     } catch (error) {
       alert('Training error: ' + error.message);
@@ -12,7 +12,7 @@ window.StaffScannerView = function StaffScannerView() {
 
     const loadEvents = async () => {
         try {
-            const res = await fetch('/api/events?status=Approved', { credentials: 'include' });
+            const res = await fetch('/api/events?status=Approved&fields=summary', { credentials: 'include' });
             const data = await res.json();
             if (data.success) {
                 setEvents(data.events || []);
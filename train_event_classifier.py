@@ -5,6 +5,7 @@ Trains a text classifier to automatically categorize events by name/description
 """
 
 import os
+import sys
 import joblib
 from collections import Counter
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -13,50 +14,84 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 import mysql.connector
 from config import Config
+from backend.ml_registry import read_active_version
+from backend.ml_streaming import fit_streaming_classifier
 DB_CONFIG = Config.DB_CONFIG
 
-def get_training_data():
-    """Fetch training data from database + use base samples for stable foundation"""
+# Rows per fetchmany() round trip
+CHUNK_SIZE = 2000
+# Above this many samples the classifier is fitted out-of-core
+# (HashingVectorizer + SGDClassifier.partial_fit) instead of TF-IDF in memory
+STREAMING_THRESHOLD = 50000
+
+TRAINING_QUERY = """
+    SELECT 
+        event_name as name,
+        description,
+        event_type
+    FROM ai_training_data
+    WHERE is_validated = 1 
+    AND total_budget > 0
+    AND event_type IS NOT NULL
+"""
+
+EVENTS_QUERY = """
+    SELECT 
+        name,
+        description,
+        event_type
+    FROM events
+    WHERE status = 'Completed'
+    AND budget > 0
+    AND deleted_at IS NULL
+    AND event_type IS NOT NULL
+    AND name IS NOT NULL
+"""
+
+def iter_training_rows(chunk_size=CHUNK_SIZE):
+    """
+    Validated training samples, then completed events, chunk_size rows at a
+    time from an unbuffered cursor (the result set is never held whole)
+    """
+    conn = mysql.connector.connect(**DB_CONFIG)
+    try:
+        for query in (TRAINING_QUERY, EVENTS_QUERY):
+            cursor = conn.cursor(dictionary=True, buffered=False)
+            try:
+                # Ordered so every streaming epoch sees the rows in the same order
+                cursor.execute(query + " ORDER BY id")
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+    finally:
+        conn.close()
+
+def count_labels():
+    """Samples per event type across both sources (without fetching the rows)"""
     try:
         conn = mysql.connector.connect(**DB_CONFIG)
         cursor = conn.cursor(dictionary=True)
-
-        # Get validated training data from ai_training_data table
-        cursor.execute("""
-            SELECT 
-                event_name as name,
-                description,
-                event_type
-            FROM ai_training_data
-            WHERE is_validated = 1 
-            AND total_budget > 0
-            AND event_type IS NOT NULL
-        """)
-        training_data = cursor.fetchall()
-        
-        # Get completed events from events table
-        cursor.execute("""
-            SELECT 
-                name,
-                description,
-                event_type
-            FROM events
-            WHERE status = 'Completed'
-            AND budget > 0
-            AND deleted_at IS NULL
-            AND event_type IS NOT NULL
-            AND name IS NOT NULL
-        """)
-        completed_events = cursor.fetchall()
-        
+        counts = Counter()
+        for query in (TRAINING_QUERY, EVENTS_QUERY):
+            cursor.execute(f"SELECT event_type, COUNT(*) as total FROM ({query}) t GROUP BY event_type")
+            for row in cursor.fetchall():
+                counts[row['event_type']] += row['total']
         cursor.close()
         conn.close()
+        return counts
+    except Exception as e:
+        print(f"Database error: {e}")
+        return Counter()
 
+def get_training_data():
+    """Fetch training data from database + use base samples for stable foundation"""
+    try:
         # Combine database training + completed events
-        all_events = training_data + completed_events
-        
-        print(f"📚 Loaded {len(training_data)} validated training samples from database")
-        print(f"✅ Loaded {len(completed_events)} completed events")
+        all_events = [row for rows in iter_training_rows() for row in rows]
         print(f"📊 Total: {len(all_events)} training samples")
 
         return all_events
@@ -78,8 +113,58 @@ def prepare_features(events):
 
     return texts, labels
 
-def train_classifier():
+def save_models(classifier, vectorizer):
+    model_dir = os.path.join(os.path.dirname(__file__), 'models')
+    os.makedirs(model_dir, exist_ok=True)
+
+    model_path = os.path.join(model_dir, 'event_classifier.pkl')
+    vectorizer_path = os.path.join(model_dir, 'event_vectorizer.pkl')
+
+    joblib.dump(classifier, model_path)
+    joblib.dump(vectorizer, vectorizer_path)
+
+    print(f"💾 Model saved to: {model_path}")
+    print(f"💾 Vectorizer saved to: {vectorizer_path}")
+    active = read_active_version(model_dir)
+    if active:
+        print(f"⚠️  models/ACTIVE points at version {active}; the app serves that version, "
+              f"not these files (retrain via /api/ml/train-models to publish)")
+
+def train_classifier_streaming(label_counts=None):
+    """Out-of-core variant: memory stays flat however many samples there are"""
+    label_counts = label_counts if label_counts is not None else count_labels()
+    print(f"🏷️  Label distribution:\n{label_counts}")
+    valid_labels = {label for label, count in label_counts.items() if count >= 2}
+    if len(valid_labels) < 2:
+        print("❌ Need at least 2 different event types for classification!")
+        return False
+
+    def chunks():
+        for rows in iter_training_rows():
+            texts, labels = prepare_features([row for row in rows if row['event_type'] in valid_labels])
+            yield texts, labels
+
+    print(f"🚀 Streaming {sum(label_counts[l] for l in valid_labels)} samples in chunks of {CHUNK_SIZE}...")
+    vectorizer, classifier, accuracy = fit_streaming_classifier(chunks, valid_labels)
+    if classifier is None:
+        print("❌ No training data found!")
+        return False
+    if accuracy is not None:
+        print(f"✅ Hold-out accuracy: {accuracy:.1%}")
+
+    save_models(classifier, vectorizer)
+    return True
+
+def train_classifier(streaming=None):
     """Train and save the event type classifier"""
+    if streaming is None:
+        label_counts = count_labels()
+        streaming = sum(label_counts.values()) > STREAMING_THRESHOLD
+        if streaming:
+            return train_classifier_streaming(label_counts)
+    elif streaming:
+        return train_classifier_streaming()
+
     print("🔍 Fetching training data...")
 
     events = get_training_data()
@@ -147,22 +232,18 @@ def train_classifier():
     print(classification_report(y_test, y_pred))
 
     # Save model and vectorizer
-    model_dir = os.path.join(os.path.dirname(__file__), 'models')
-    os.makedirs(model_dir, exist_ok=True)
-
-    model_path = os.path.join(model_dir, 'event_classifier.pkl')
-    vectorizer_path = os.path.join(model_dir, 'event_vectorizer.pkl')
-
-    joblib.dump(classifier, model_path)
-    joblib.dump(vectorizer, vectorizer_path)
-
-    print(f"💾 Model saved to: {model_path}")
-    print(f"💾 Vectorizer saved to: {vectorizer_path}")
+    save_models(classifier, vectorizer)
 
     return True
 
 if __name__ == "__main__":
-    success = train_classifier()
+    # --streaming / --in-memory force a mode; default picks by table size
+    mode = None
+    if '--streaming' in sys.argv:
+        mode = True
+    elif '--in-memory' in sys.argv:
+        mode = False
+    success = train_classifier(mode)
     if success:
         print("✅ Event type classifier training completed!")
     else:
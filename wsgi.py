@@ -0,0 +1,10 @@
+# ============================================================================
+# WSGI ENTRY POINT
+# Production app instance: gunicorn wsgi:app
+# ============================================================================
+
+import os
+
+from app import create_app
+
+app = create_app(os.environ.get('FLASK_ENV') or 'production')